@@ -0,0 +1,70 @@
+# coding: utf-8
+
+"""
+micro-benchmark for the per token cost of the scanner
+
+run on the revision before and after a change to the scanner, e.g. with the
+package checked out in two places:
+
+    PYTHONPATH=/path/to/old python _test/benchmark_scanner.py
+    PYTHONPATH=/path/to/new python _test/benchmark_scanner.py
+
+the scanners are the pure Python ones, the time is the best of --repeat runs
+"""
+
+import argparse
+import sys
+import time
+
+from typing import Any, List
+
+
+def document(entries: int) -> str:
+    res: List[str] = ['%YAML 1.2\n---\n']
+    for idx in range(entries):
+        res.append(f'key{idx}:  # comment {idx}\n')
+        res.append(f'  name: item number {idx}\n')
+        res.append(f'  id: {idx}\n')
+        res.append(f"  quoted: 'single {idx}'\n")
+        res.append(f'  double: "double {idx}"\n')
+        res.append('  flow: [a, b, {c: d, e: 1.5}]\n')
+        res.append(f'  ? complex key {idx}\n  : &anchor{idx} value\n')
+        res.append(f'  alias: *anchor{idx}\n')
+        res.append('  tagged: !!str 42\n')
+        res.append('  literal: |\n    some text\n    more text\n')
+        res.append('  seq:\n  - one\n  - two\n')
+    res.append('...\n')
+    return ''.join(res)
+
+
+def scan(typ: str, text: str) -> int:
+    import ruamel.yaml
+
+    yaml = ruamel.yaml.YAML(typ=typ, pure=True)
+    count = 0
+    for _token in yaml.scan(text):
+        count += 1
+    return count
+
+
+def main(args: Any) -> None:
+    text = document(args.entries)
+    print(f'{len(text)} characters, python {sys.version.split()[0]}')
+    for typ in args.typ:
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            count = scan(typ, text)
+            duration = time.perf_counter() - start
+            if best is None or duration < best:
+                best = duration
+        assert best is not None
+        print(f'{typ:>5}: {count} tokens, {best * 1e6 / count:.2f} us/token')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--typ', nargs='+', default=['safe', 'rt'])
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+# coding: utf-8
+
+import io
+import re
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any
+
+from roundtrip import dedent  # type: ignore
+
+
+class Dumper:
+    typ = ['safe']
+
+    def __init__(self, version: Any) -> None:
+        self.serializer = self
+        self.use_version = version
+
+
+def emitter(version: Any = None, **kw: Any) -> Any:
+    from ruamel.yaml.emitter import Emitter
+
+    return Emitter(io.StringIO(), dumper=Dumper(version), **kw)
+
+
+class TestAnalyzeScalar:
+    @pytest.mark.parametrize(
+        'scalar',
+        ['abc', 'a b c', '-1.5e+3', 'a/b.c', '.5', '-', '- a', '--- a', '...', 'a  b', 'a #b',
+         'a: b', 'a:b', '?a', 'a ', ' a', '_', 'x,y', 'é', ''],
+    )
+    def test_fast_path(self, scalar: str) -> None:
+        fast = emitter()
+        slow = emitter()
+        slow._simple_scalar = re.compile('(?!)')
+        assert repr(fast.analyze_scalar(scalar)) == repr(slow.analyze_scalar(scalar))
+
+    def test_cached(self) -> None:
+        e = emitter()
+        analysis = e.analyze_scalar('a: b')
+        assert e.analyze_scalar('a: b') is analysis
+        assert e.analyze_scalar('a: b' * 100) is not e.analyze_scalar('a: b' * 100)
+        e = emitter()
+        e.analyze_scalar_cache_size = 0
+        assert e.analyze_scalar('a: b') is not e.analyze_scalar('a: b')
+
+    def test_settings(self) -> None:
+        e = emitter()
+        assert e.analyze_scalar('a?b').allow_flow_plain
+        e = emitter(version=(1, 1))
+        assert not e.analyze_scalar('a?b').allow_flow_plain
+        e = emitter(allow_unicode=False)
+        assert not e.analyze_scalar('é').allow_block_plain
+
+    def test_dump(self) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.scalarstring import LiteralScalarString
+
+        yaml = ruamel.yaml.YAML()
+        buf = io.StringIO()
+        yaml.dump(
+            [{'a': 'x y', 'b': 'x y '}, {'a': 'x y', 'b': LiteralScalarString('x y ')}], buf,
+        )
+        assert buf.getvalue() == dedent("""\
+        - a: x y
+          b: 'x y '
+        - a: x y
+          b: |-
+            x y\x20
+        """)
@@ -440,6 +440,23 @@ class TestMergeKeysValues:
         data = yaml.load(dedent(self.yaml_str))
         assert list(data[2].values()) == [1, 6, 'x2', 'x3', 'y4']
 
+    def test_own_keys(self) -> None:
+        from ruamel.yaml import YAML
+
+        data = YAML().load(self.yaml_str)
+        # own keys are only kept apart from the keys once some are merged in
+        assert data[0]._own is None and data[0]._referents == [data[2]]
+        assert data[1]._referents is None or data[1]._referents == [data[2]]
+        assert set(data[0]._ok) == {'a', 'b', 'c'}
+        assert data[2]._own == {'a', 'm'}
+        assert list(data[2].non_merged_items()) == [('a', 1), ('m', 6)]
+        data[2]['d'] = 4
+        assert 'd' in data[2]._ok
+        del data[2]['a']
+        assert set(data[2]._ok) == {'d', 'm'}
+        data[2].update(abc=3)
+        assert set(data[2]._ok) == {'abc', 'd', 'm'}
+
     def test_issue_213_copy_of_merge(self) -> None:
         from ruamel.yaml import YAML
 
@@ -538,3 +555,96 @@ class TestFullCharSetAnchors:
         """
         data = load(yaml_str)  # NOQA
         compare(data, yaml_str.replace('[', ' ['))  # an extra space is inserted
+
+
+class TestNoAliases:
+    def dump(self, data: Any, typ: str = 'rt', no_aliases: bool = False) -> Any:
+        from io import StringIO
+        import ruamel.yaml
+
+        class Serializer(ruamel.yaml.serializer.Serializer):
+            anchored = 0
+
+            def anchor_node(self, node: Any) -> None:
+                Serializer.anchored += 1
+                super().anchor_node(node)
+
+        yaml = ruamel.yaml.YAML(typ=typ, pure=True)
+        yaml.Serializer = Serializer
+        yaml.no_aliases = no_aliases
+        buf = StringIO()
+        yaml.dump(data, buf)
+        return buf.getvalue(), Serializer.anchored
+
+    def test_anchor_pass_skipped(self) -> None:
+        shared = [1]
+        assert self.dump({'a': [2], 'b': [2]}, 'safe') == ('a: [2]\nb: [2]\n', 0)
+        assert self.dump({'a': shared, 'b': shared}, 'safe') == (
+            'a: &id001 [1]\nb: *id001\n', 1,
+        )
+        data = load("""\
+        a: &x 1
+        b: 2
+        """)
+        assert self.dump(data) == ('a: &x 1\nb: 2\n', 1)
+
+    def test_no_aliases(self) -> None:
+        data = load("""\
+        a: &x [1, 2]
+        b: *x
+        c:
+        """)
+        assert self.dump(data, no_aliases=True) == ('a: [1, 2]\nb: [1, 2]\nc:\n', 0)
+        assert self.dump(None, no_aliases=True)[0] == 'null\n...\n'
+        shared = {'x': 1}
+        out, _ = self.dump([shared, [shared]], 'safe', no_aliases=True)
+        assert out == '- {x: 1}\n- - {x: 1}\n'
+
+    def test_recursive(self) -> None:
+        from ruamel.yaml.representer import RepresenterError
+
+        data: Any = []
+        data.append(data)
+        assert self.dump(data, 'safe')[0] == '&id001\n- *id001\n'
+        with pytest.raises(RepresenterError):
+            self.dump(data, 'safe', no_aliases=True)
+
+    def test_node_shared_by_representer(self) -> None:
+        from io import StringIO
+        import ruamel.yaml
+        from ruamel.yaml.nodes import SequenceNode
+
+        class Shared:
+            pass
+
+        class Recursive:
+            pass
+
+        def represent_shared(representer: Any, data: Any) -> Any:
+            node = representer.represent_scalar('tag:yaml.org,2002:str', 'vxxx')
+            return SequenceNode('tag:yaml.org,2002:seq', [node, node])
+
+        def represent_recursive(representer: Any, data: Any) -> Any:
+            node = SequenceNode('tag:yaml.org,2002:seq', [])
+            node.value.append(node)
+            return node
+
+        class Representer(ruamel.yaml.representer.RoundTripRepresenter):
+            pass
+
+        class ListRepresenter(ruamel.yaml.representer.RoundTripRepresenter):
+            def represent_sequence(self, tag: Any, data: Any, flow_style: Any = None) -> Any:
+                return represent_shared(self, data)
+
+        Representer.add_representer(Shared, represent_shared)
+        Representer.add_representer(Recursive, represent_recursive)
+        for representer, data, expected in [
+            (Representer, Shared(), '- &id001 vxxx\n- *id001\n'),
+            (Representer, Recursive(), '&id001\n- *id001\n'),
+            (ListRepresenter, [1], '- &id001 vxxx\n- *id001\n'),
+        ]:
+            yaml = ruamel.yaml.YAML()
+            yaml.Representer = representer
+            buf = StringIO()
+            yaml.dump(data, buf)
+            assert buf.getvalue() == expected
@@ -0,0 +1,44 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any
+
+
+class TestConstructorDispatch:
+    def test_multi_constructor_cached(self) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.constructor import SafeConstructor
+
+        class MyConstructor(SafeConstructor):
+            pass
+
+        def construct_ref(constructor: Any, suffix: str, node: Any) -> Any:
+            return (suffix, constructor.construct_scalar(node))
+
+        MyConstructor.add_multi_constructor('!ref:', construct_ref)
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.Constructor = MyConstructor
+        data = yaml.load('[!ref:a x, !ref:b y, !ref:a z]')
+        assert data == [('a', 'x'), ('b', 'y'), ('a', 'z')]
+        dispatch = MyConstructor.get_constructor_dispatch()
+        assert dispatch['!ref:a', ruamel.yaml.ScalarNode] == (construct_ref, 'a')
+
+    def test_add_constructor_after_use(self) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.constructor import RoundTripConstructor
+
+        class MyConstructor(RoundTripConstructor):
+            pass
+
+        class MySubConstructor(MyConstructor):
+            pass
+
+        yaml = ruamel.yaml.YAML()
+        yaml.Constructor = MySubConstructor
+        data = yaml.load('- !xyz 1\n- !xyz 2\n')
+        assert str(data[0].tag) == '!xyz'
+        # added on the base class after the subclass cached the lookup
+        MyConstructor.add_constructor('!xyz', lambda c, n: int(n.value) * 10)
+        data = yaml.load('- !xyz 1\n- !xyz 2\n')
+        assert data == [10, 20]
@@ -0,0 +1,96 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+from typing import Any
+
+
+def load(s: str, direct: bool = True, **kw: Any) -> Any:
+    import ruamel.yaml
+
+    yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+    yaml.direct_construction = direct
+    for k, v in kw.items():
+        setattr(yaml, k, v)
+    return yaml.load(s)
+
+
+class TestDirectConstruction:
+    def test_plain(self) -> None:
+        inp = dedent("""\
+        a: [1, 2.5, true, null, 2001-12-14]
+        b:
+          c: !!str 3
+          ? [d, e]
+          : {f: g}
+        """)
+        assert load(inp) == load(inp, direct=False)
+
+    def test_anchor_alias(self) -> None:
+        inp = dedent("""\
+        - &a [1, 2]
+        - *a
+        - &b x
+        - *b
+        """)
+        data = load(inp)
+        assert data == [[1, 2], [1, 2], 'x', 'x']
+        assert data[0] is data[1]
+
+    def test_recursive(self) -> None:
+        data = load('&a [1, *a]')
+        assert data[1] is data
+
+    def test_merge(self) -> None:
+        inp = dedent("""\
+        - &a {x: 1, y: 2}
+        - &b {y: 3, z: 4}
+        - {w: 0, <<: [*a, *b], x: 5}
+        - {<<: {p: 1}, q: 2}
+        """)
+        data = load(inp)
+        assert data == load(inp, direct=False)
+        assert list(data[2].items()) == [('y', 2), ('z', 4), ('x', 5), ('w', 0)]
+        assert data[3] == {'p': 1, 'q': 2}
+
+    def test_merge_error(self) -> None:
+        import ruamel.yaml
+
+        with pytest.raises(ruamel.yaml.constructor.ConstructorError):
+            load('{<<: 1}')
+
+    def test_duplicate_key(self) -> None:
+        import ruamel.yaml
+
+        with pytest.raises(ruamel.yaml.constructor.DuplicateKeyError):
+            load('{a: 1, a: 2}')
+        assert load('{a: 1, a: 2}', allow_duplicate_keys=True) == {'a': 1}
+
+    def test_max_depth(self) -> None:
+        import ruamel.yaml
+
+        assert load('[[[1]]]', max_depth=4) == [[[1]]]
+        with pytest.raises(ruamel.yaml.composer.MaxDepthExceededError):
+            load('[[[1]]]', max_depth=3)
+        with pytest.raises(ruamel.yaml.composer.MaxDepthExceededError):
+            load('[[!!set {1}]]', max_depth=3)
+
+    def test_other_tags(self) -> None:
+        import ruamel.yaml
+
+        inp = dedent("""\
+        a: !!set {x, y}
+        b: !!omap [c: 1, d: 2]
+        """)
+        data = load(inp)
+        assert data == load(inp, direct=False)
+        with pytest.raises(ruamel.yaml.constructor.ConstructorError):
+            load('- !custom 1')
+
+    def test_load_all(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.direct_construction = True
+        assert list(yaml.load_all('a: 1\n---\n- 2\n--- 3\n')) == [{'a': 1}, [2], 3]
@@ -0,0 +1,69 @@
+# coding: utf-8
+
+import io
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any, List
+
+DATA = {f'key{idx}': {'a': [idx, 'text'], 'b': 'x "y"', 'c': None} for idx in range(500)}
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: List[bytes] = []
+
+    def write(self, data: Any) -> int:
+        self.writes.append(data)
+        return super().write(data)
+
+
+def dump(**kw: Any) -> CountingStream:
+    import ruamel.yaml
+
+    yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+    for k, v in kw.items():
+        setattr(yaml, k, v)
+    stream = CountingStream()
+    yaml.dump_all([DATA, [1, 2]], stream)
+    return stream
+
+
+class TestWriteBatching:
+    def test_batched(self) -> None:
+        batched = dump()
+        unbatched = dump(write_buffer_size=1)
+        assert batched.getvalue() == unbatched.getvalue()
+        assert len(unbatched.writes) > 10000
+        # written at the end of each document
+        assert len(batched.writes) == 2
+        assert batched.writes[1] == b'--- [1, 2]\n'
+
+    def test_buffer_size(self) -> None:
+        stream = dump(write_buffer_size=1000)
+        assert len(stream.writes) > 10
+        assert all(1000 <= len(data) < 1100 for data in stream.writes[:-2])
+
+    def test_encoding(self) -> None:
+        stream = dump(encoding='utf-16-le')
+        assert stream.getvalue().startswith('\uFEFFkey0:'.encode('utf-16-le'))
+        text = stream.getvalue().decode('utf-16-le')
+        assert text.lstrip('\uFEFF') == dump().getvalue().decode()
+
+    def test_direct_write(self) -> None:
+        # writes to emitter.stream come after the output so far
+        import ruamel.yaml
+
+        class Emitter(ruamel.yaml.emitter.Emitter):
+            def write_plain(self, text: Any, split: Any = True) -> None:
+                if text == 'b':
+                    self.stream.write(b'# before b\n')
+                super().write_plain(text, split)
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.Emitter = Emitter
+        yaml.default_flow_style = False
+        stream = CountingStream()
+        yaml.dump({'a': 1, 'b': 2}, stream)
+        assert stream.getvalue() == b'a: 1\n# before b\nb: 2\n'
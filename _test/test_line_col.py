@@ -90,3 +90,21 @@ class TestLineCol:
         - d
         """)
         assert data.lc.item(3) == (4, 2)
+
+    def test_no_key_line_col(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML()
+        yaml.key_line_col = False
+        data = yaml.load(dedent("""
+        a: 1
+        b:
+        - c
+        - {d: 2}
+        """))
+        assert data.lc.key('b') is None
+        assert data['b'].lc.item(1) is None
+        assert (data['b'].lc.line, data['b'].lc.col) == (2, 0)
+        assert (data['b'][1].lc.line, data['b'][1].lc.col) == (3, 2)
+        yaml.key_line_col = True
+        assert yaml.load('a: 1\n').lc.value('a') == (0, 3)
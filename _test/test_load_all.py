@@ -0,0 +1,60 @@
+# coding: utf-8
+
+import io
+
+import pytest  # type: ignore  # NOQA
+
+MULTI_DOC = 'a: 1\n---\n- 2\n--- !x 3\n...\n%YAML 1.1\n---\nb: yes\n'
+
+
+def load_all(**kw: object) -> list:
+    import ruamel.yaml
+
+    yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+    yaml.constructor.add_constructor('!x', lambda constructor, node: 'X')
+    return list(yaml.load_all(MULTI_DOC, **kw))
+
+
+class TestLoadAll:
+    def test_all(self) -> None:
+        assert load_all() == [{'a': 1}, [2], 'X', {'b': True}]
+
+    def test_skip(self) -> None:
+        assert load_all(skip=1) == [{'a': 1}, 'X', {'b': True}]
+        assert load_all(skip=[0, 3]) == [[2], 'X']
+
+    def test_select(self) -> None:
+        assert load_all(select=2) == ['X']
+        assert load_all(select=[0, 3], skip=0) == [{'b': True}]
+
+    def test_predicate(self) -> None:
+        assert load_all(skip=lambda index, event: event.version is not None) == [
+            {'a': 1},
+            [2],
+            'X',
+        ]
+
+    def test_skipped_not_composed(self) -> None:
+        # the undefined alias would be an error if the document was composed
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        assert list(yaml.load_all('- *x\n---\n- 1\n', skip=0)) == [[1]]
+
+    def test_doc_infos(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        assert len(list(yaml.load_all('1\n---\n2\n---\n3\n'))) == 3
+        assert len(yaml.doc_infos) == 1
+
+    def test_line_numbers_file(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML()
+        inp = ''.join(f'---\n# {idx}\nkey{idx}: [{idx}]\n' for idx in range(2000))
+        for idx, data in enumerate(yaml.load_all(io.StringIO(inp))):
+            assert data.lc.key(f'key{idx}') == (idx * 3 + 2, 0)
+            assert data[f'key{idx}'].lc.line == idx * 3 + 2
+            # the line starts of the preceding documents are not kept
+            assert len(yaml.reader.line_index.starts) < 2000
@@ -0,0 +1,72 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+
+
+def slices(text: str) -> list:
+    from ruamel.yaml.main import document_slices
+
+    starts = document_slices(text)
+    return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+
+
+class TestDocumentSlices:
+    def test_markers(self) -> None:
+        inp = dedent("""\
+        %YAML 1.1
+        ---
+        a: 1
+        --- |
+          ---
+        ---
+        - 2
+        ...
+        # comment
+        %YAML 1.1
+        --- 3
+        """)
+        assert slices(inp) == [
+            '%YAML 1.1\n---\na: 1\n',
+            '--- |\n  ---\n',
+            '---\n- 2\n...\n',
+            '# comment\n%YAML 1.1\n--- 3\n',
+        ]
+
+    def test_not_a_marker(self) -> None:
+        assert slices('a: ---\nb: "\n  ---"\n----\n') == ['a: ---\nb: "\n  ---"\n----\n']
+
+    def test_content_after_end(self) -> None:
+        # not split, so this gives the same error as loading the stream as a whole
+        assert slices('a\n...\nb\n---\nc\n') == ['a\n...\nb\n', '---\nc\n']
+
+
+class TestLoadAllParallel:
+    def test_safe(self) -> None:
+        import ruamel.yaml
+
+        inp = ''.join(f'---\nkey{idx}: [{idx}, yes]\n' for idx in range(200))
+        inp += '...\n%YAML 1.1\n---\nlast: yes\n'
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        data = list(yaml.load_all_parallel(inp, workers=2))
+        assert data == list(yaml.load_all(inp))
+        assert data[-1] == {'last': True}
+
+    def test_round_trip_lines(self, tmp_path: object) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.compat import StringIO
+
+        inp = ''.join(f'# doc {idx}\nkey{idx}: [{idx}]  # eol\n---\n' for idx in range(300))
+        path = tmp_path / 'multi.yaml'  # type: ignore
+        path.write_text(inp)
+        yaml = ruamel.yaml.YAML()
+        data = list(yaml.load_all_parallel(path, workers=3))
+        assert data[-1] is None  # the trailing document start
+        for idx, doc in enumerate(data[:-1]):
+            assert doc.lc.key(f'key{idx}') == (idx * 3 + 1, 0)
+        buf = StringIO()
+        yaml.dump_all(data, buf)
+        expected = StringIO()
+        yaml.dump_all(yaml.load_all(inp), expected)
+        assert buf.getvalue() == expected.getvalue()
@@ -0,0 +1,142 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any
+
+
+class TestLoadCache:
+    def test_round_trip(self, tmp_path: Any) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.cache import LoadCache
+        from ruamel.yaml.compat import StringIO
+        from roundtrip import dedent  # type: ignore
+
+        inp = dedent("""\
+        %YAML 1.1
+        ---
+        # top comment
+        a: &anchor
+          b: 2001-12-15T02:59:43.1Z  # eol comment
+          c: 0o17
+        d: *anchor
+        e: yes
+        """)
+        path = tmp_path / 'test.yaml'  # type: ignore
+        path.write_text(inp)
+        results = []
+        for _ in range(2):
+            yaml = ruamel.yaml.YAML()
+            yaml.load_cache = LoadCache(tmp_path / 'cache')  # type: ignore
+            data = yaml.load(path)
+            buf = StringIO()
+            yaml.dump(data, buf)
+            results.append((buf.getvalue(), data.lc.key('d'), data['a'].lc.key('c')))
+            assert data['d'] is data['a']
+        assert len(list((tmp_path / 'cache').iterdir())) == 1  # type: ignore
+        assert results[0] == results[1]
+        assert '%YAML 1.1' in results[0][0]
+        assert '2001-12-15T02:59:43.100000Z # eol comment' in results[0][0]
+        assert results[0][1:] == ((6, 0), (5, 2))
+
+    def test_load_all(self, tmp_path: Any) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.cache import LoadCache
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.load_cache = LoadCache(tmp_path)
+        inp = '1\n---\n[2]\n---\n{3: 4}\n'
+        assert list(yaml.load_all(inp)) == [1, [2], {3: 4}]
+        assert list(yaml.load_all(inp)) == [1, [2], {3: 4}]
+        assert list(yaml.load_all(inp, skip=1)) == [1, {3: 4}]
+        assert len(list(tmp_path.iterdir())) == 2  # type: ignore
+        # not completely loaded, so not stored
+        next(iter(yaml.load_all('5\n---\n6\n')))
+        assert len(list(tmp_path.iterdir())) == 2  # type: ignore
+        # a function is not stored, as it cannot be part of the key
+        assert list(yaml.load_all(inp, select=lambda idx, event: idx == 2)) == [{3: 4}]
+        assert len(list(tmp_path.iterdir())) == 2  # type: ignore
+
+    def test_eviction(self, tmp_path: Any) -> None:
+        import os
+        import ruamel.yaml
+        from ruamel.yaml.cache import LoadCache
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        cache = yaml.load_cache = LoadCache(tmp_path, max_size=2000)
+        for idx in range(10):
+            assert yaml.load(f'[{idx}, {"x" * 300}]')[0] == idx
+            for entry_idx, (_, _, path) in enumerate(sorted(cache.entries())):
+                # make the modification times distinct
+                os.utime(path, (entry_idx, entry_idx))
+        assert 0 < cache.size() <= 2000
+        assert len(cache.entries()) < 10
+        # replacing an entry does not add to the size
+        cache.clear()
+        for _ in range(10):
+            assert cache.put('a', 'x' * 300)
+        assert len(cache.entries()) == 1
+        assert cache._size == cache.size()
+        cache.clear()
+        assert cache.entries() == []
+
+    def test_configuration(self, tmp_path: Any) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.cache import LoadCache
+
+        def yaml(constructor: Any = None) -> Any:
+            class Constructor(ruamel.yaml.constructor.SafeConstructor):
+                pass
+
+            res = ruamel.yaml.YAML(typ='safe', pure=True)
+            res.load_cache = LoadCache(tmp_path)
+            if constructor is not None:
+                res.Constructor = Constructor
+                Constructor.add_constructor('!x', constructor)
+            return res
+
+        # closures that only differ in the value they refer to
+        for value in [1, 2]:
+            assert yaml(lambda c, n, value=value: value).load('!x a') == value
+        text = '[' * 20 + ']' * 20
+        assert len(yaml().load(text)) == 1
+        y = yaml()
+        y.max_depth = 10
+        with pytest.raises(ruamel.yaml.composer.MaxDepthExceededError):
+            y.load(text)
+        for key_line_col in [False, True]:
+            y = ruamel.yaml.YAML()
+            y.load_cache = LoadCache(tmp_path)
+            y.key_line_col = key_line_col
+            data = y.load('a: 1\nb: 2\n')
+            assert (data.lc.key('b') is not None) == key_line_col
+
+    def test_signed(self, tmp_path: Any) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.cache import LoadCache
+
+        cache = LoadCache(tmp_path, secret=b'secret')
+        assert cache.put('a', [1]) and cache.put('b', [2])
+        assert cache.get('a') == [1]
+        # the entry of another key, an unsigned entry, or one signed with another secret
+        # is not used
+        cache.path('a').write_bytes(cache.path('b').read_bytes())
+        LoadCache(tmp_path).put('b', [3])
+        LoadCache(tmp_path, secret=b'other').put('c', [4])
+        for key in 'abc':
+            with pytest.raises(KeyError):
+                cache.get(key)
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.load_cache = cache
+        assert yaml.load('[1, 2]') == yaml.load('[1, 2]') == [1, 2]
+
+    def test_not_writable(self, tmp_path: Any) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.cache import LoadCache
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.load_cache = LoadCache(tmp_path / 'cache')
+        (tmp_path / 'cache').rmdir()
+        (tmp_path / 'cache').write_text('not a directory')
+        assert yaml.load('[1, 2]') == [1, 2]
+        assert not yaml.load_cache.put('key', [1, 2])
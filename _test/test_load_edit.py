@@ -0,0 +1,128 @@
+# coding: utf-8
+
+import io
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+
+TEXT = ''.join(
+    f'# pre {i}\nkey{i}:  # c{i}\n  a: [{i}, x]\n  b:\n  - {i}.5\n\n' for i in range(5)
+)
+
+
+def dump(data: object) -> str:
+    import ruamel.yaml
+
+    buf = io.StringIO()
+    ruamel.yaml.YAML().dump(data, buf)
+    return buf.getvalue()
+
+
+def edit(text: str, old: str, new: str) -> tuple:
+    import ruamel.yaml
+
+    yaml = ruamel.yaml.YAML()
+    data = yaml.load(text)
+    start = text.index(old)
+    res = yaml.load_edit(data, text, start, start + len(old), new)
+    new_text = text.replace(old, new, 1)
+    assert dump(res) == dump(yaml.load(new_text))
+    return res, data, yaml.load(new_text)
+
+
+class TestLoadEdit:
+    def test_value_changed(self) -> None:
+        res, data, expected = edit(TEXT, '[2, x]', '[2, y, z]')
+        assert res is data
+        assert res['key2']['a'] == [2, 'y', 'z']
+        assert res['key2']['a'].lc.line == expected['key2']['a'].lc.line
+
+    def test_lines_inserted(self) -> None:
+        res, data, expected = edit(TEXT, '  b:\n  - 1.5\n', '  b:\n  - 1.5\n  - 1.6\n  c: 3\n')
+        assert res is data
+        assert res['key1']['c'] == 3
+        for key in expected:
+            assert res.lc.key(key) == expected.lc.key(key)
+            assert res[key].lc.line == expected[key].lc.line
+            assert res[key]['b'].lc.data == expected[key]['b'].lc.data
+        assert res.ca.items['key4'][2].start_mark.line == 27
+
+    def test_key_inserted(self) -> None:
+        res, data, expected = edit(TEXT, 'key3:', 'new: 1\nkey3:')
+        assert res is data
+        assert list(res) == ['key0', 'key1', 'key2', 'new', 'key3', 'key4']
+        assert res.lc.key('key4') == expected.lc.key('key4') == (26, 0)
+
+    def test_lines_removed_last(self) -> None:
+        res, data, expected = edit(TEXT, '  b:\n  - 4.5\n', '')
+        assert res is data
+        assert list(res['key4']) == ['a']
+
+    def test_full_load(self) -> None:
+        # spanning more than one entry
+        res, data, _ = edit(TEXT, '1.5\n\n# pre 2\nkey2', '1.6\n\n# pre 2\nkey9')
+        assert res is not data
+        # anchor in the edited entry
+        res, data, _ = edit(TEXT, '[2, x]', '&a [2, x]')
+        assert res is not data
+        res, data, _ = edit('- 1\n- 2\n', '2', '3')
+        assert res is not data
+        res, data, _ = edit(dedent("""\
+        %YAML 1.2
+        ---
+        a: 1
+        b: 2
+        """), 'b: 2', 'b: 3')
+        assert res is not data
+
+    @pytest.mark.parametrize('new', ['', 'q', 'zz', ' '])
+    def test_comment_moved(self, new: str) -> None:
+        import ruamel.yaml
+
+        # the key after the comment becomes part of it, the comment is attached to what
+        # follows the edited entries
+        text = 'e: [1]\n# before f\nf: text\ng: x\nh: y\n'
+        yaml = ruamel.yaml.YAML()
+        data = yaml.load(text)
+        start = text.index('\nf:')
+        res = yaml.load_edit(data, text, start, start + 1, new)
+        assert res is not data
+        assert dump(res) == 'e: [1]\n# before f' + new + 'f: text\ng: x\nh: y\n'
+
+    def test_comment_at_end(self) -> None:
+        res, data, _ = edit('a: 1\ni: q\n', 'i: q', 'i: [1,\n  2]\n')
+        assert res is data
+        assert dump(res).endswith(']\n\n')
+        res, data, _ = edit('a: 1\n# before f\nf: text\ng: 2\n', ' 2', '\n')
+        assert res is not data
+
+    def test_edit_after_dump(self) -> None:
+        import ruamel.yaml
+
+        # dumping appends the comments at the end to the comment of the mapping
+        text = '# head\n\na: 1\nb: [2]\n\n# tail\n'
+        yaml = ruamel.yaml.YAML()
+        data = yaml.load(text)
+        assert dump(data) == text
+        edits = [('[2]', '[2, 3]'), ('# tail', '# new tail'), ('\n\n# new', '\n# new')]
+        for old, new in edits:
+            start = text.index(old)
+            res = yaml.load_edit(data, text, start, start + len(old), new)
+            assert res is data
+            text = text.replace(old, new, 1)
+            assert dump(res) == dump(yaml.load(text))
+        assert dump(res) == '# head\n\na: 1\nb: [2, 3]\n# new tail\n'
+
+
+def test_shift_line_col() -> None:
+    import ruamel.yaml
+    from ruamel.yaml.comments import shift_line_col
+
+    data = ruamel.yaml.YAML().load('a:  # x\n  b: [1, {c: 2}]\n')
+    shift_line_col(data, 3)
+    assert data.lc.line == 3
+    assert data.lc.key('a') == (3, 0)
+    assert data['a'].lc.key('b') == (4, 2)
+    assert data['a']['b'][1].lc.key('c') == (4, 10)
+    assert data.ca.items['a'][2].start_mark.line == 3
@@ -0,0 +1,55 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+
+def write_files(directory: object, count: int) -> list:
+    paths = []
+    for idx in range(count):
+        path = directory / f'file{idx:03d}.yaml'  # type: ignore
+        path.write_text(f'index: {idx}\nvalues: [a, b]  # comment\n')
+        paths.append(path)
+    return paths
+
+
+class TestLoadMany:
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_order_and_errors(self, tmp_path: object, workers: int) -> None:
+        import ruamel.yaml
+
+        paths = write_files(tmp_path, 20)
+        paths[5].write_text('a: [1\n')
+        paths[7].write_text('- *undefined\n')
+        paths.insert(9, tmp_path / 'missing.yaml')  # type: ignore
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        results = yaml.load_many(paths, workers=workers)
+        assert [result.path for result in results] == paths
+        for idx, result in enumerate(results):
+            if idx in (5, 7, 9):
+                assert result.data is None
+                assert isinstance(result.error, (ruamel.yaml.YAMLError, OSError))
+                continue
+            assert result.error is None
+            assert result.data == {'index': idx - (idx > 9), 'values': ['a', 'b']}
+
+    def test_cache(self, tmp_path: object) -> None:
+        import ruamel.yaml
+
+        (tmp_path / 'data').mkdir()  # type: ignore
+        paths = write_files(tmp_path / 'data', 4)  # type: ignore
+        cache = ruamel.yaml.cache.LoadCache(tmp_path / 'cache')  # type: ignore
+        yaml = ruamel.yaml.YAML()
+        first = yaml.load_many(paths, workers=1, cache=cache)
+        assert len(list(cache.directory.iterdir())) == 4
+        assert first[0].data.lc.key('values') == (1, 0)
+        # served from the cache, comments and line info included
+        cached = yaml.load_many(paths, workers=1, cache=str(cache.directory))
+        assert cached[0].data.lc.key('values') == (1, 0)
+        assert cached[0].data.ca.items['values'] is not None
+        # a changed file, or another configuration, is loaded again
+        paths[1].write_text('index: changed\n')
+        assert yaml.load_many(paths, workers=1, cache=cache)[1].data == {'index': 'changed'}
+        safe = ruamel.yaml.YAML(typ='safe', pure=True)
+        data = safe.load_many(paths, workers=1, cache=cache)[0].data
+        assert type(data) is dict
+        assert len(list(cache.directory.iterdir())) == 9
@@ -0,0 +1,72 @@
+# coding: utf-8
+
+import mmap
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any
+
+INP = '# comment\na: [1, ä]\nb: {c: d}\n'
+
+
+class TestBufferStream:
+    @pytest.mark.parametrize(
+        'source', [memoryview(INP.encode('utf-8')), bytearray(INP.encode('utf-16'))],
+    )
+    def test_buffer(self, source: Any) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        assert yaml.load(source) == {'a': [1, 'ä'], 'b': {'c': 'd'}}
+
+    def test_read(self) -> None:
+        from ruamel.yaml.reader import BufferStream
+
+        stream = BufferStream(memoryview(b'abcdefg'))
+        assert stream.read(3) == b'abc'
+        assert stream.read(10) == b'defg'
+        assert stream.read(10) == b''
+
+    def test_mmap_pages_released(self, tmpdir: Any) -> None:
+        from ruamel.yaml.reader import BufferStream
+
+        path = tmpdir.join('x.yaml')
+        path.write_binary(b'x' * (mmap.PAGESIZE * 3 + 10))
+        with open(str(path), 'rb') as fp:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                stream = BufferStream(buffer)
+                assert len(stream.read(mmap.PAGESIZE + 5)) == mmap.PAGESIZE + 5
+                assert len(stream.read()) == mmap.PAGESIZE * 2 + 5
+                if hasattr(mmap, 'MADV_DONTNEED'):
+                    assert stream._released == mmap.PAGESIZE * 3
+
+
+class TestLoadPath:
+    def test_load(self, tmpdir: Any) -> None:
+        from pathlib import Path
+        import ruamel.yaml
+
+        path = Path(str(tmpdir)) / 'x.yaml'
+        path.write_text(INP * 1000 + 'e: [\n', encoding='utf-8')
+        yaml = ruamel.yaml.YAML()
+        yaml.mmap_threshold = 1000
+        with pytest.raises(ruamel.yaml.parser.ParserError) as exc:
+            yaml.load(path)
+        assert f'in "{path}", line 3002' in str(exc.value)
+        path.write_text('---\n'.join(['a: 1\n'] * 1000))
+        assert list(yaml.load_all(path)) == [{'a': 1}] * 1000
+
+    def test_below_threshold(self, tmpdir: Any) -> None:
+        from pathlib import Path
+        import ruamel.yaml
+
+        path = Path(str(tmpdir)) / 'x.yaml'
+        path.write_text(INP, encoding='utf-8')
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        with yaml.open_path(path) as fp:
+            assert not isinstance(fp, ruamel.yaml.reader.BufferStream)
+        yaml.mmap_threshold = 1
+        with yaml.open_path(path) as fp:
+            assert isinstance(fp, ruamel.yaml.reader.BufferStream)
+            assert fp.name == str(path)
+        assert yaml.load(path) == {'a': [1, 'ä'], 'b': {'c': 'd'}}
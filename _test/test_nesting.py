@@ -0,0 +1,106 @@
+# coding: utf-8
+
+import io
+import sys
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any
+
+DEPTH = 3000
+
+
+def nested(depth: int) -> Any:
+    data = inner = []  # type: Any
+    for idx in range(depth):
+        value: Any = {'a': [idx]} if idx % 2 else []
+        inner.append(value)
+        inner = value['a'] if idx % 2 else value
+    return data
+
+
+def yaml(typ: str) -> Any:
+    import ruamel.yaml
+
+    res = ruamel.yaml.YAML(typ=typ, pure=True)
+    res.default_flow_style = True
+    return res
+
+
+class TestDeepNesting:
+    @pytest.mark.parametrize('typ', ['safe', 'rt'])
+    def test_load_dump(self, typ: str) -> None:
+        assert DEPTH > sys.getrecursionlimit()
+        buf = io.StringIO()
+        yaml(typ).dump(nested(DEPTH), buf)
+        assert buf.getvalue().startswith('[[a: [1, [a: [3, [')
+        data = yaml(typ).load(buf.getvalue())
+        assert len(data[0]) == 1
+        out = io.StringIO()
+        yaml(typ).dump(data, out)
+        assert out.getvalue() == buf.getvalue()
+
+    def test_compose_serialize(self) -> None:
+        import ruamel.yaml
+
+        text = '{a: ' * DEPTH + '1' + '}' * DEPTH + '\n'
+        node = yaml('rt').compose(text)
+        assert node.value[0][0].value == 'a'
+        buf = io.StringIO()
+        yaml('rt').serialize(node, buf)
+        # long lines are wrapped
+        assert ''.join(buf.getvalue().split()) == ''.join(text.split())
+        with pytest.raises(ruamel.yaml.composer.MaxDepthExceededError):
+            y = yaml('rt')
+            y.max_depth = 100
+            y.compose(text)
+
+    def test_anchors_shared(self) -> None:
+        # anchors are numbered in the order the nodes are dumped
+        data = nested(200)
+        shared = [1]
+        data.append(shared)
+        data[0][0]['a'].append(shared)
+        buf = io.StringIO()
+        yaml('safe').dump(data, buf)
+        assert buf.getvalue().count('&id001') == buf.getvalue().count('*id001') == 1
+        assert buf.getvalue().index('&id001') < buf.getvalue().index('*id001')
+
+    def test_compose_hook(self) -> None:
+        import ruamel.yaml
+
+        class Composer(ruamel.yaml.composer.Composer):
+            def compose_sequence_node(self, anchor: Any) -> Any:
+                node = super().compose_sequence_node(anchor)
+                node.value.reverse()
+                return node
+
+        y = yaml('safe')
+        y.Composer = Composer
+        assert y.load('a: [1, [2, 3]]') == {'a': [[3, 2], 1]}
+
+    def test_node_hooks(self) -> None:
+        import ruamel.yaml
+
+        calls = []
+
+        class Composer(ruamel.yaml.composer.Composer):
+            def compose_node(self, parent: Any, index: Any) -> Any:
+                node = super().compose_node(parent, index)
+                calls.append(node.value if isinstance(node.value, str) else node.tag)
+                return node
+
+        class Serializer(ruamel.yaml.serializer.Serializer):
+            def serialize_node(self, node: Any, parent: Any, index: Any) -> None:
+                calls.append(node.value if isinstance(node.value, str) else node.tag)
+                super().serialize_node(node, parent, index)
+
+        y = yaml('safe')
+        y.Composer = Composer
+        assert y.load('a: [1, {b: 2}]\nc: 3') == {'a': [1, {'b': 2}], 'c': 3}
+        assert len(calls) == 9 and calls[-1] == 'tag:yaml.org,2002:map'
+        calls.clear()
+        y = yaml('safe')
+        y.Serializer = Serializer
+        y.dump({'a': [1, 2]}, io.StringIO())
+        assert calls == ['tag:yaml.org,2002:map', 'a', 'tag:yaml.org,2002:seq', '1', '2']
@@ -0,0 +1,172 @@
+# coding: utf-8
+
+import io
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any, List, Tuple
+
+
+def marks(inp: Any) -> List[Tuple[int, int, int]]:
+    from ruamel.yaml.reader import Reader
+
+    reader = Reader(inp)
+    res = []
+    while reader.peek() != '\0':
+        mark = reader.get_mark()
+        assert mark.line == reader.line and mark.column == reader.column
+        res.append((mark.index, mark.line, mark.column))
+        reader.forward()
+    return res
+
+
+def expected(s: str) -> List[Tuple[int, int, int]]:
+    # straightforward per character implementation of line/column counting
+    res = []
+    line = column = 0
+    for index, ch in enumerate(s):
+        res.append((index, line, column))
+        if ch == '\n' or (ch == '\r' and s[index + 1 : index + 2] != '\n'):
+            line += 1
+            column = 0
+        elif ch != '\uFEFF':
+            column += 1
+    return res
+
+
+class TestReaderMarks:
+    @pytest.mark.parametrize(
+        'inp',
+        ['a: 1\nb: 2\n', 'a: 1\r\nb: 2\r\n', 'a\rb\r\rc\n\n', '\uFEFFa: 1\nb: \uFEFF2\n', 'x'],
+    )
+    def test_string(self, inp: str) -> None:
+        assert marks(inp) == expected(inp)
+
+    def test_bytes(self) -> None:
+        inp = 'k: ü\r\n- ä\n'
+        assert marks(inp.encode('utf-8')) == expected(inp)
+
+    def test_file_chunked(self) -> None:
+        # line breaks and a BOM straddling the 4096 byte read boundaries
+        inp = ('x' * 4095 + '\r\n' + 'y' * 4093 + '\uFEFF' + 'z\r') * 3
+        assert marks(io.BytesIO(inp.encode('utf-8'))) == expected(inp)
+
+    def test_forward_multiple(self) -> None:
+        from ruamel.yaml.reader import Reader
+
+        reader = Reader('abc\ndef\r\nghi')
+        reader.forward(6)
+        assert (reader.index, reader.line, reader.column) == (6, 1, 2)
+        reader.forward(4)
+        assert (reader.index, reader.line, reader.column) == (10, 2, 1)
+        assert reader.peek() == 'h'
+        mark = reader.get_mark()
+        assert '^ (line: 3)' in str(mark)
+
+    def test_lazy_after_reading(self) -> None:
+        from ruamel.yaml.reader import Reader
+
+        inp = ('x' * 4095 + '\r\n' + 'y' * 4093 + '\uFEFF' + 'z\r') * 3
+        reader = Reader(io.BytesIO(inp.encode('utf-8')))
+        mark_list = []
+        while reader.peek() != '\0':
+            mark_list.append(reader.get_mark())
+            reader.forward()
+        # resolved only now, after the buffer has been refilled
+        res = [(mark.index, mark.line, mark.column) for mark in reversed(mark_list)]
+        assert res[::-1] == expected(inp)
+        assert mark_list[0].buffer is None
+
+    def test_lazy_mark_copy(self) -> None:
+        import copy
+        from ruamel.yaml.reader import Reader
+
+        reader = Reader('abc\ndef')
+        reader.forward(5)
+        mark = reader.get_mark()
+        mark2 = copy.deepcopy(mark)
+        assert mark2 == mark
+        assert mark2.lines is mark.lines
+        mark2.column = 7
+        assert (mark2.line, mark2.column, mark.column) == (1, 7, 1)
+
+
+class TestReaderChunks:
+    @pytest.mark.parametrize('encoding', ['utf-8', 'utf-16-le', 'utf-16-be'])
+    def test_split_characters(self, encoding: str) -> None:
+        # multi-byte characters straddling the (odd sized) read boundaries
+        from ruamel.yaml.reader import Reader
+
+        inp = '\uFEFF' + 'ä€\U0001D11E x\n' * 50
+        reader = Reader(None)
+        reader.read_size = 7
+        reader.stream = io.BytesIO(inp.encode(encoding))
+        res = []
+        while reader.peek() != '\0':
+            res.append(reader.peek())
+            reader.forward()
+        assert ''.join(res) == inp
+        assert reader.encoding == encoding
+
+    def test_read_size(self) -> None:
+        import ruamel.yaml
+
+        class Stream(io.BytesIO):
+            sizes: List[int] = []
+
+            def read(self, size: Any = -1) -> bytes:
+                self.sizes.append(size)
+                return super().read(size)
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.read_size = 1 << 20
+        stream = Stream(b'a: [1, 2]\nb: "' + b'x' * 3_000_000 + b'"\n')
+        data = yaml.load(stream)
+        assert data['a'] == [1, 2] and len(data['b']) == 3_000_000
+        # the reads grow with the unconsumed text for a long scalar
+        assert Stream.sizes[0] == 1 << 20 and max(Stream.sizes) > 1 << 20
+        assert len(Stream.sizes) < 6
+
+    def test_decode_error_position(self) -> None:
+        from ruamel.yaml.reader import Reader, ReaderError
+
+        reader = Reader(None)
+        reader.read_size = 5
+        with pytest.raises(ReaderError) as exc:
+            reader.stream = io.BytesIO(b'abc: \xc3\xa4\xc3 12\n')
+            while reader.peek() != '\0':
+                reader.forward()
+        assert exc.value.position == 7
+        assert exc.value.encoding == 'utf-8'
+
+
+class TestPrintable:
+    @pytest.mark.parametrize('char', ['\x07', '\x7F', '\x80', '\x9F', '\uFFFE', '\uFFFF'])
+    def test_not_allowed(self, char: str) -> None:
+        from ruamel.yaml.reader import Reader, ReaderError
+
+        # a multi-byte char is split over the first two reads
+        inp = 'ä: ' + 'x' * 4091 + char + 'ä\n'
+        with pytest.raises(ReaderError) as exc:
+            reader = Reader(io.BytesIO(inp.encode('utf-8')))
+            while reader.peek() != '\0':
+                reader.forward()
+        assert exc.value.position == 4094
+        assert exc.value.character == ord(char)
+        assert not Reader.is_printable_utf8(char.encode('utf-8'))
+
+    def test_allowed(self) -> None:
+        from ruamel.yaml.reader import Reader
+
+        inp = '\t\r\n \x85\xA0\uFEFF\uFFFD\U0001F600 ~ äé°'
+        assert Reader.is_printable_utf8(inp.encode('utf-8'))
+
+    def test_allow_non_printable(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        with pytest.raises(ruamel.yaml.reader.ReaderError):
+            yaml.load(io.BytesIO(b'a: \x80\x01'))
+        yaml.allow_non_printable = True
+        assert yaml.load(io.BytesIO('a: \x81b\n'.encode('utf-8'))) == {'a': '\x81b'}
+        assert yaml.load('a: \x01') == {'a': '\x01'}
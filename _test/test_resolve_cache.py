@@ -0,0 +1,81 @@
+# coding: utf-8
+
+import re
+
+import pytest  # type: ignore  # NOQA
+
+from ruamel.yaml.nodes import ScalarNode
+from ruamel.yaml.resolver import VersionedResolver, implicit_matcher, resolve_shared_implicit
+
+
+class TestResolveImplicit:
+    def test_shared_tags(self) -> None:
+        resolve_shared_implicit.cache_clear()
+        resolver = VersionedResolver()
+        tag = resolver.resolve(ScalarNode, 'true', (True, False))
+        assert tag == 'tag:yaml.org,2002:bool'
+        assert resolver.resolve(ScalarNode, 'false', (True, False)) is tag
+        assert resolver.resolve(ScalarNode, '42', (True, False)) == 'tag:yaml.org,2002:int'
+        assert resolver.resolve(ScalarNode, 'text', (True, False)) == 'tag:yaml.org,2002:str'
+        assert resolve_shared_implicit.cache_info().hits == 0
+        VersionedResolver().resolve(ScalarNode, 'true', (True, False))
+        assert resolve_shared_implicit.cache_info().hits == 1
+
+    def test_version(self) -> None:
+        resolver = VersionedResolver(version=(1, 1))
+        assert resolver.resolve(ScalarNode, 'yes', (True, False)) == 'tag:yaml.org,2002:bool'
+        assert resolver.resolve_implicit((1, 2), 'yes') is None
+        assert resolver.resolve_implicit((1, 1), '0o17') is None
+        assert resolver.resolve_implicit((1, 2), '0o17') == 'tag:yaml.org,2002:int'
+        assert resolver.resolve_implicit('1.1', 'yes') == 'tag:yaml.org,2002:bool'
+        assert resolver.resolve_implicit([1, 2], 'yes') is None
+
+    def test_add_version_implicit_resolver(self) -> None:
+        resolver = VersionedResolver()
+        assert resolver.resolve_implicit((1, 2), 'abc') is None
+        resolver.versioned_resolver_for((1, 2))
+        resolver.add_version_implicit_resolver((1, 2), '!abc', re.compile('^abc$'), ['a'])
+        assert resolver.resolve_implicit((1, 2), 'abc') == '!abc'
+        assert VersionedResolver().resolve_implicit((1, 2), 'abc') is None
+
+    def test_add_implicit_resolver(self) -> None:
+        class Resolver(VersionedResolver):
+            pass
+
+        values = ['cache_foo', 'cache_bar']
+        assert Resolver().resolve_implicit((1, 2), values[0]) is None
+        Resolver.add_implicit_resolver('!cached', re.compile('^cache_(?:foo|bar)$'), ['c'])
+        resolver = Resolver()
+        for value in values:
+            assert resolver.resolve_implicit((1, 2), value) == '!cached'
+
+    def test_no_reference_cycle(self) -> None:
+        import gc
+        import weakref
+
+        resolver = VersionedResolver()
+        resolver.resolve_implicit((1, 2), 'true')
+        ref = weakref.ref(resolver)
+        gc.disable()
+        try:
+            del resolver
+            assert ref() is None
+        finally:
+            gc.enable()
+
+    def test_matcher_order(self) -> None:
+        resolvers = [('!x', re.compile('^a.*$')), ('!y', re.compile('^ab$', re.I))]
+        match = implicit_matcher(resolvers)
+        assert match.__name__ == 'match_combined'
+        assert match('ab') == '!x'
+        assert match('AB') == '!y'
+        assert match('b') is None
+
+    def test_matcher_groups(self) -> None:
+        # backreferences cannot be combined, each regexp is tried in turn
+        resolvers = [('!x', re.compile(r'^(a)\1$')), ('!y', re.compile('^b$'))]
+        match = implicit_matcher(resolvers)
+        assert match.__name__ == 'match_each'
+        assert match('aa') == '!x'
+        assert match('b') == '!y'
+        assert match('ab') is None
@@ -0,0 +1,52 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+
+from typing import Any
+
+
+def load(s: str, version: Any = None) -> Any:
+    import ruamel.yaml  # NOQA
+
+    yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+    yaml.version = version
+    return yaml.load(dedent(s))
+
+
+class TestScanPlain:
+    def test_block_colon(self) -> None:
+        data = load("""
+        a:b: c:d
+        http://x.org/y: e::f
+        g?: h?
+        """)
+        assert data == {'a:b': 'c:d', 'http://x.org/y': 'e::f', 'g?': 'h?'}
+
+    def test_flow(self) -> None:
+        data = load("""
+        [a:b, c?d, e:, {f: g:h}, i j, k:,l]
+        """)
+        assert data == ['a:b', 'c?d', 'e:', {'f': 'g:h'}, 'i j', 'k:', 'l']
+
+    def test_question_mark_1_1(self) -> None:
+        import ruamel.yaml  # NOQA
+
+        assert load('a?b: c?\n', version='1.1') == {'a?b': 'c?'}
+        with pytest.raises(ruamel.yaml.parser.ParserError):
+            load('[a?b, c]\n', version='1.1')
+
+    def test_multi_line(self) -> None:
+        data = load("""
+        a: x
+          y:z  # comment
+        b: [p
+           q, r]
+        """)
+        assert data == {'a': 'x y:z', 'b': ['p q', 'r']}
+
+    def test_long(self) -> None:
+        value = 'abc:def-' * 2000
+        assert load(f'k: {value}x\n') == {'k': value + 'x'}
+        assert load(f'[{value}x]\n') == [value + 'x']
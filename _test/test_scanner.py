@@ -0,0 +1,58 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any
+
+from ruamel.yaml.scanner import Scanner, RoundTripScanner
+
+
+class TestFetchDispatch:
+    def test_per_class(self) -> None:
+        dispatch, default = Scanner.get_fetch_dispatch()
+        assert dispatch['['][0] == (None, Scanner.fetch_flow_sequence_start)
+        assert 'a' not in dispatch
+        assert default == ((None, Scanner.fetch_plain),)
+        assert RoundTripScanner.get_fetch_dispatch()[0] is not dispatch
+        assert Scanner.get_fetch_dispatch()[0] is dispatch
+
+    def test_override_in_subclass(self) -> None:
+        import ruamel.yaml  # NOQA
+
+        class MyScanner(Scanner):
+            def fetch_alias(self) -> None:
+                self.reader.forward()
+                self.fetch_alias_called = True
+                self.fetch_plain()
+
+            def check_plain(self) -> Any:
+                self.check_plain_called = True
+                return Scanner.check_plain(self)
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.Scanner = MyScanner
+        assert yaml.load('- *abc\n- d\n') == ['abc', 'd']
+        assert yaml.scanner.fetch_alias_called
+        assert yaml.scanner.check_plain_called
+
+    def test_method_set_after_use(self) -> None:
+        import ruamel.yaml  # NOQA
+
+        class MyScanner(Scanner):
+            pass
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.Scanner = MyScanner
+        assert yaml.load('[a, b]') == ['a', 'b']
+        dispatch = MyScanner.get_fetch_dispatch()
+
+        def fetch_flow_entry(self: Any) -> None:
+            self.flow_entries = getattr(self, 'flow_entries', 0) + 1
+            Scanner.fetch_flow_entry(self)
+
+        MyScanner.fetch_flow_entry = fetch_flow_entry  # type: ignore
+        assert MyScanner.get_fetch_dispatch() is not dispatch
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.Scanner = MyScanner
+        assert yaml.load('[a, b, c]') == ['a', 'b', 'c']
+        assert yaml.scanner.flow_entries == 2
@@ -0,0 +1,69 @@
+# coding: utf-8
+
+import io
+
+import pytest  # type: ignore  # NOQA
+
+from typing import Any, List
+
+DATA = [{'a': idx, 'b': idx % 2 == 0, 'c': None, 'd': str(idx)} for idx in range(100)]
+
+
+def dump(yaml: Any, data: Any) -> str:
+    buf = io.StringIO()
+    yaml.dump(data, buf)
+    return buf.getvalue()
+
+
+def counting_yaml(typ: str) -> Any:
+    import ruamel.yaml
+
+    class Resolver(ruamel.yaml.resolver.VersionedResolver):
+        values: List[Any] = []
+
+        def resolve(self, kind: Any, value: Any, implicit: Any) -> Any:
+            if kind is ruamel.yaml.nodes.ScalarNode and implicit[0]:
+                self.values.append(value)
+            return super().resolve(kind, value, implicit)
+
+    yaml = ruamel.yaml.YAML(typ=typ, pure=True)
+    yaml.Resolver = Resolver
+    yaml.default_flow_style = False
+    return yaml
+
+
+class TestResolvedHint:
+    @pytest.mark.parametrize('typ', ['safe', 'rt'])
+    def test_resolve_skipped(self, typ: str) -> None:
+        import ruamel.yaml
+
+        yaml = counting_yaml(typ)
+        out = dump(yaml, DATA)
+        plain = ruamel.yaml.YAML(typ=typ, pure=True)
+        plain.default_flow_style = False
+        assert out == dump(plain, DATA)
+        assert out.startswith('- a: 0\n  b: true\n  c:')
+        # keys, strings and the first int, bool and null of the document
+        values = yaml.Resolver.values
+        assert len(values) == 4 * 100 + 100 + 3
+        assert values.count('1') == 1  # the string '1', not the int 1
+
+    def test_resolver_changed(self) -> None:
+        import ruamel.yaml
+
+        class Resolver(ruamel.yaml.resolver.VersionedResolver):
+            def resolve_implicit(self, version: Any, value: Any) -> Any:
+                tag = super().resolve_implicit(version, value)
+                return None if str(tag) == 'tag:yaml.org,2002:int' else tag
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.Resolver = Resolver
+        assert dump(yaml, [1, 2, True]) == "[!!int '1', !!int '2', true]\n"
+
+    def test_bool_representation(self) -> None:
+        import ruamel.yaml
+
+        # boolean_representation is not declared by YAML, the representer uses it if set
+        yaml: Any = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml.boolean_representation = ['no', 'yes']
+        assert dump(yaml, [True, False]) == "[!!bool 'yes', !!bool 'no']\n"
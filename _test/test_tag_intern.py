@@ -0,0 +1,90 @@
+# coding: utf-8
+
+import copy
+import pickle
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+
+
+class TestTagIntern:
+    def test_standard_tags_shared(self) -> None:
+        from ruamel.yaml.tag import Tag
+
+        t = Tag.intern('tag:yaml.org,2002:int')
+        assert Tag.intern('tag:yaml.org,2002:int') is t
+        assert Tag.intern(Tag(suffix='tag:yaml.org,2002:int')) is t
+        assert str(t) == 'tag:yaml.org,2002:int'
+
+    def test_immutable(self) -> None:
+        from ruamel.yaml.tag import Tag
+
+        t = Tag.intern('tag:yaml.org,2002:str')
+        with pytest.raises(AttributeError):
+            t.extra = 1  # type: ignore
+
+    def test_equal_not_interned(self) -> None:
+        from ruamel.yaml.tag import Tag
+
+        t = Tag(suffix='!xyz')
+        assert t == Tag.intern('!xyz')
+        assert t == '!xyz'
+        assert hash(t) == hash(Tag.intern('!xyz'))
+        assert str(Tag()) == 'None'
+
+    def test_copy_pickle(self) -> None:
+        from ruamel.yaml.tag import Tag
+
+        t = Tag.intern('!abc')
+        assert copy.copy(t) == t
+        assert copy.deepcopy(t) == t
+        assert pickle.loads(pickle.dumps(t)) == t
+
+    def test_loaded_nodes_share_tags(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        node = yaml.compose('[1, 2, !!int 3, a, b]')
+        tags = [n.ctag for n in node.value]
+        assert tags[0] is tags[1]
+        assert tags[2] == tags[0]  # has a handle, so it is a different instance
+        assert tags[3] is tags[4]
+
+    def test_handle_round_trip(self) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.compat import StringIO
+
+        inp = dedent("""\
+        %TAG !e! tag:example.com,2000:
+        ---
+        - !e!a 1
+        - !e!a 2
+        - !<tag:example.com,2000:a> 3
+        """)
+        yaml = ruamel.yaml.YAML()
+        data = yaml.load(inp)
+        assert data[0].tag is data[1].tag
+        assert data[0].tag == data[2].tag
+        assert data[0].tag.handle == '!e!'
+        assert data[2].tag.handle is None
+        buf = StringIO()
+        yaml.dump(data, buf)
+        assert '!e!a 1' in buf.getvalue()
+
+    def test_node_without_tag(self) -> None:
+        import io
+        import ruamel.yaml
+        from ruamel.yaml.nodes import MappingNode, ScalarNode
+
+        assert ScalarNode(None, 'x').tag == 'None'
+        assert MappingNode(None, []).ctag is not MappingNode(None, []).ctag
+
+        class Unregistered:
+            def __str__(self) -> str:
+                return 'unregistered'
+
+        # the BaseRepresenter falls back to a scalar node without tag
+        buf = io.StringIO()
+        ruamel.yaml.YAML(typ='base').dump(Unregistered(), buf)
+        assert buf.getvalue() == '!<None> unregistered\n...\n'
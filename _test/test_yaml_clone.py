@@ -0,0 +1,66 @@
+# coding: utf-8
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+
+
+class TestClone:
+    def test_configuration_copied(self) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.compat import StringIO
+
+        template = ruamel.yaml.YAML()
+        template.indent(mapping=4, sequence=4, offset=2)
+        template.preserve_quotes = True
+        data = template.load('a: [1, 2]\n')
+        yaml = template.clone()
+        assert yaml.preserve_quotes is True
+        assert yaml.map_indent == 4
+        assert '_constructor' not in yaml.__dict__
+        buf = StringIO()
+        yaml.dump(yaml.load('b:\n- "x"\n'), buf)
+        assert buf.getvalue() == dedent("""\
+        b:
+          - "x"
+        """)
+        assert data == {'a': [1, 2]}
+
+    def test_independent(self) -> None:
+        import ruamel.yaml
+
+        template = ruamel.yaml.YAML(typ='safe', pure=True)
+        yaml = template.clone()
+        yaml.constructor.add_constructor('!x', lambda constructor, node: 'X')
+        yaml.version = (1, 1)
+        assert yaml.load('!x 1') == 'X'
+        assert template.version is None
+        assert yaml.load('a: yes') == {'a': True}
+        assert template.load('a: yes') == {'a': 'yes'}
+
+    def test_plug_ins_cached(self) -> None:
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML()
+        assert ruamel.yaml.YAML._official_plug_ins is not None
+        plug_ins = yaml.official_plug_ins()
+        plug_ins.append('xyz')
+        assert 'xyz' not in yaml.official_plug_ins()
+        ruamel.yaml.YAML.refresh_plug_ins()
+        assert ruamel.yaml.YAML._official_plug_ins is None
+        assert yaml.official_plug_ins() == plug_ins[:-1]
+
+
+class TestSharedMatchers:
+    def test_version_resolver_added(self) -> None:
+        import re
+        import ruamel.yaml
+
+        yaml = ruamel.yaml.YAML(typ='safe', pure=True)
+        assert yaml.load('[1, none]') == [1, 'none']
+        yaml.resolver.add_version_implicit_resolver(
+            (1, 2), 'tag:yaml.org,2002:null', re.compile('^none$'), ['n'],
+        )
+        assert yaml.load('[1, none]') == [1, None]
+        # the other instances still use the default resolvers
+        assert ruamel.yaml.YAML(typ='safe', pure=True).load('[1, none]') == [1, 'none']
@@ -0,0 +1,91 @@
+# coding: utf-8
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore  # NOQA
+
+from roundtrip import dedent  # type: ignore
+
+
+def document(idx: int) -> str:
+    return dedent(f"""\
+    index: {idx}
+    values: [{', '.join(str(x) for x in range(idx % 50))}]
+    nested:
+      name: n{idx}  # comment
+    """)
+
+
+class TestYAMLPool:
+    def test_load_concurrent(self) -> None:
+        import ruamel.yaml
+
+        pool = ruamel.yaml.YAML(typ='safe', pure=True).pool(4)
+        with ThreadPoolExecutor(8) as executor:
+            res = list(executor.map(pool.load, (document(idx) for idx in range(200))))
+        for idx, data in enumerate(res):
+            assert data == {
+                'index': idx, 'values': list(range(idx % 50)), 'nested': {'name': f'n{idx}'},
+            }
+        assert pool._count <= 4
+        assert len(pool._idle) == pool._count
+
+    def test_dump_concurrent(self) -> None:
+        import ruamel.yaml
+        from ruamel.yaml.compat import StringIO
+
+        yaml = ruamel.yaml.YAML()
+        yaml.indent(mapping=4, sequence=4, offset=2)
+        pool = yaml.pool(3)
+
+        def round_trip(idx: int) -> str:
+            buf = StringIO()
+            pool.dump(pool.load(document(idx)), buf)
+            return buf.getvalue()
+
+        with ThreadPoolExecutor(6) as executor:
+            res = list(executor.map(round_trip, range(100)))
+        for idx, val in enumerate(res):
+            buf = StringIO()
+            yaml.dump(yaml.load(document(idx)), buf)
+            assert val == buf.getvalue()
+            assert '    name: n' in val
+
+    def test_error_drops_instance(self) -> None:
+        import ruamel.yaml
+
+        pool = ruamel.yaml.YAML(typ='safe', pure=True).pool(1)
+        with pytest.raises(ruamel.yaml.YAMLError):
+            pool.load('[1, {a: *x}]')
+        assert pool._count == 0
+        assert pool.load('[1, {a: 2}]') == [1, {'a': 2}]
+        assert pool.load_all('1\n---\n2\n') == [1, 2]
+
+    def test_wait_for_instance(self) -> None:
+        import ruamel.yaml
+
+        pool = ruamel.yaml.YAML(typ='safe', pure=True).pool(1)
+        res = []
+        with pool.instance() as yaml:
+            thread = threading.Thread(target=lambda: res.append(pool.load('a: 1')))
+            thread.start()
+            thread.join(0.1)
+            assert res == []
+            assert yaml.load('b: 2') == {'b': 2}
+        thread.join()
+        assert res == [{'a': 1}]
+        with pytest.raises(ValueError):
+            ruamel.yaml.YAMLPool(ruamel.yaml.YAML(), size=0)
+
+    def test_state_reset(self) -> None:
+        import ruamel.yaml
+
+        pool = ruamel.yaml.YAML(typ='safe', pure=True).pool(1)
+        for idx in range(100):
+            assert pool.load(document(idx))['index'] == idx
+        assert pool.load_all('%YAML 1.1\n%TAG !e! tag:example.com,2000:\n--- yes\n') == [True]
+        with pool.instance() as yaml:
+            assert yaml.doc_infos == [] and yaml.tags is None and yaml.version is None
+            assert yaml.load('yes') == 'yes'
+            assert len(yaml.doc_infos) == 1
@@ -0,0 +1,266 @@
+"""
+LoadCache
+
+An on-disk cache of loaded data, stored as one pickle per key, so that unchanged
+files do not have to be loaded again. The key is computed by the caller from what
+determines the loaded data (the text loaded, or the path, modification time and size
+of a file) together with configuration_key() of the YAML instance used for loading.
+
+    yaml = YAML()
+    yaml.load_cache = LoadCache('.yaml_cache', max_size=100_000_000, secret=b'...')
+    data = yaml.load(path)  # loaded from the cache if the content was loaded before
+
+Round-trip data is pickled including its comments, anchors and line/column info.
+
+WARNING: the entries are unpickled, and unpickling data can execute arbitrary code,
+also when loading with typ='safe'. Without a secret, anyone who can write to the cache
+directory can run code in the processes using the cache. Only use a cache directory
+that is writable by you alone, or provide a secret (kept outside of that directory),
+with which the entries are signed and entries without a valid signature are ignored.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import hashlib
+import hmac
+import marshal
+import pickle
+import threading
+from pathlib import Path
+
+if False:  # MYPY
+    from typing import Any, Dict, List, Optional, Tuple, Union  # NOQA
+
+# a component of the configuration that cannot be found again by its name is keyed by
+# its id() in this process, the components are kept alive so that their ids are not
+# reused, and the token keeps the keys from matching entries stored by other processes
+_unnamed_components: Dict[int, Any] = {}
+_process_token = os.urandom(8).hex()
+_code_digests: Dict[Any, str] = {}
+
+
+def component_key(obj: Any) -> Tuple[Any, ...]:
+    """
+    the key for a class or function (e.g. a constructor) that is part of the
+    configuration: its name and, for a function, a digest of its code
+    """
+    name = f'{getattr(obj, "__module__", "")}.{getattr(obj, "__qualname__", obj)}'
+    code = getattr(getattr(obj, '__func__', obj), '__code__', None)
+    digest = None
+    if code is not None:
+        try:
+            digest = _code_digests[code]
+        except KeyError:
+            digest = _code_digests[code] = hashlib.sha256(marshal.dumps(code)).hexdigest()
+    found: Any = sys.modules.get(getattr(obj, '__module__', None))  # type: ignore
+    for part in getattr(obj, '__qualname__', '<>').split('.'):
+        found = getattr(found, part, None)
+    if found is not None and found == obj:
+        return name, digest
+    # e.g. a lambda, closure or a class defined in a function
+    _unnamed_components[id(obj)] = obj
+    return name, digest, id(obj), _process_token
+
+
+def configuration_key(yaml: Any) -> Tuple[Any, ...]:
+    """
+    the settings of a YAML instance that influence the data loaded, including its
+    components and the constructors and resolvers registered on them
+    """
+    from ruamel.yaml.parser import Parser
+    from ruamel.yaml.reader import Reader
+    from ruamel.yaml.scanner import Scanner
+
+    reader, scanner = yaml.Reader, yaml.Scanner
+    if isinstance(yaml.Parser, type) and issubclass(yaml.Parser, Parser):
+        # the defaults that are set on first use
+        reader = reader or Reader
+        scanner = scanner or Scanner
+    res: Tuple[Any, ...] = (
+        tuple(yaml.typ),
+        yaml.pure,
+        str(yaml.version),
+        yaml.preserve_quotes,
+        yaml.allow_duplicate_keys,
+        yaml.direct_construction,
+        getattr(yaml, 'allow_non_printable', False),
+        yaml.max_depth,
+        yaml.comment_handling,
+        getattr(yaml, 'key_line_col', True),
+        getattr(yaml, 'top_level_block_style_scalar_no_indent_error_1_1', False),
+    )
+    for component in (reader, scanner, yaml.Parser, yaml.Composer, yaml.Constructor):
+        res += (None if component is None else component_key(component),)
+    constructor = yaml.Constructor
+    if constructor is not None:
+        for attr in ('yaml_constructors', 'yaml_multi_constructors'):
+            registered = getattr(constructor, attr)
+            res += tuple(
+                sorted((str(tag), component_key(fun)) for tag, fun in registered.items()),
+            )
+    resolver = yaml.Resolver
+    res += (component_key(resolver),)
+    for attr in ('yaml_implicit_resolvers', 'yaml_path_resolvers'):
+        res += (repr(sorted(getattr(resolver, attr, {}).items(), key=repr)),)
+    # implicit resolvers added to the resolver instance, i.e. for versions for which it
+    # does not use the shared matchers
+    instance = getattr(yaml, '_resolver', None)
+    instance_resolvers = getattr(instance, '_version_implicit_resolver', None)
+    if instance_resolvers:
+        from ruamel.yaml.resolver import shared_implicit_matchers
+
+        own = []
+        for version, resolvers in instance_resolvers.items():
+            matchers = instance._version_implicit_matchers.get(version)  # type: ignore
+            shared = shared_implicit_matchers.get((instance.__class__, version))
+            if matchers is None or matchers is not shared:
+                own.append((version, resolvers))
+        if own:
+            res += (repr(sorted(own, key=repr)),)
+    return res
+
+
+class LoadCache:
+    """
+    max_size: the maximum total size in bytes of the stored files, when exceeded the
+        least recently used entries are removed. None for no maximum
+    secret: if provided, the entries are signed with an HMAC using this key, and
+        entries without a valid signature are not used
+
+    WARNING: unpickling the entries can execute arbitrary code. Without a secret only
+    use a directory that nobody else can write to (see the module docstring).
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_size: Optional[int] = None,
+        secret: Optional[bytes] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.secret = secret
+        # the total size of the stored files, determined when first needed
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """
+        the key for parts, str and bytes parts (e.g. the text to load) are hashed as
+        is, other parts by their repr()
+        """
+        res = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8', 'surrogatepass')
+            elif not isinstance(part, bytes):
+                part = repr(part).encode('utf-8')
+            res.update(len(part).to_bytes(8, 'little'))
+            res.update(part)
+        return res.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / (key + '.pickle')
+
+    def signature(self, key: str, data: bytes) -> bytes:
+        assert self.secret is not None
+        return hmac.new(self.secret, key.encode('ascii') + data, hashlib.sha256).digest()
+
+    def get(self, key: str) -> Any:
+        """the data stored for key, raises KeyError if there is none (or it is unusable)"""
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            if self.secret is not None:
+                size = hashlib.sha256().digest_size
+                if not hmac.compare_digest(data[:size], self.signature(key, data[size:])):
+                    raise KeyError(key)
+                data = data[size:]
+            res = pickle.loads(data)
+        except Exception:
+            # not there, truncated, not signed, or written by an incompatible version
+            raise KeyError(key) from None
+        if self.max_size is not None:
+            # the modification time is used as time of last use
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return res
+
+    def put(self, key: str, data: Any) -> bool:
+        """
+        store data for key, returns False if data cannot be pickled or the file
+        cannot be written (e.g. because the directory is read-only or full)
+        """
+        path = self.path(key)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            pickled = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+        if self.secret is not None:
+            pickled = self.signature(key, pickled) + pickled
+        replaced = 0
+        if self.max_size is not None and self._size is not None:
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                pass
+        try:
+            tmp_path.write_bytes(pickled)
+            # atomic, concurrent readers either see the old or the new file
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+        if self.max_size is not None:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(pickled) - replaced
+            if self._size > self.max_size:
+                self.evict()
+        return True
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """the modification time, size and path of the stored files"""
+        res = []
+        for path in self.directory.glob('*.pickle'):
+            try:
+                stat = path.stat()
+            except OSError:  # removed by another process
+                continue
+            res.append((stat.st_mtime, stat.st_size, path))
+        return res
+
+    def size(self) -> int:
+        return sum(entry[1] for entry in self.entries())
+
+    def evict(self) -> None:
+        """remove the least recently used entries until at most max_size is in use"""
+        entries = sorted(self.entries())
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:  # type: ignore
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        for _, _, path in self.entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._size = None
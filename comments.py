@@ -232,6 +232,7 @@ class LineCol:
     line and column information wrt document, values start at zero (0)
     """
 
+    __slots__ = 'line', 'col', 'data'
     attrib = line_col_attrib
 
     def __init__(self) -> None:
@@ -704,13 +705,32 @@ class CommentedMapValuesView(CommentedMapView):
 
 
 class CommentedMap(ordereddict, CommentedBase):
-    __slots__ = (Comment.attrib, '_ok', '_ref')
+    __slots__ = (Comment.attrib, '_own', '_referents')
 
     def __init__(self, *args: Any, **kw: Any) -> None:
-        self._ok: MutableSet[Any] = set()  # own keys
-        self._ref: List[CommentedMap] = []
+        # own keys, only kept apart from the keys once some are merged in
+        self._own: Optional[set] = None
+        self._referents: Optional[List[CommentedMap]] = None
         ordereddict.__init__(self, *args, **kw)
 
+    @property
+    def _ok(self) -> Any:
+        """the keys that are not merged in"""
+        if self._own is None:
+            return ordereddict.keys(self)
+        return self._own
+
+    @property
+    def _ref(self) -> List[Any]:
+        """the mappings that merge in this mapping"""
+        if self._referents is None:
+            self._referents = []
+        return self._referents
+
+    def _add_own(self, key: Any) -> None:
+        if self._own is not None:
+            self._own.add(key)
+
     def _yaml_add_comment(
         self, comment: Any, key: Optional[Any] = NotNone, value: Optional[Any] = NotNone,
     ) -> None:
@@ -780,15 +800,17 @@ class CommentedMap(ordereddict, CommentedBase):
             # probably a dict that is used
             for x in vals[0]:
                 self[x] = vals[0][x]
+        if self._own is None:
+            return
         if vals:
             try:
-                self._ok.update(vals[0].keys())  # type: ignore
+                self._own.update(vals[0].keys())
             except AttributeError:
                 # assume one argument that is a list/tuple of two element lists/tuples
                 for x in vals[0]:
-                    self._ok.add(x[0])
+                    self._own.add(x[0])
         if kw:
-            self._ok.update(*kw.keys())  # type: ignore
+            self._own.update(kw.keys())
 
     def insert(self, pos: Any, key: Any, value: Any, comment: Optional[Any] = None) -> None:
         """insert key value into given position, as defined by source YAML
@@ -818,7 +840,7 @@ class CommentedMap(ordereddict, CommentedBase):
         # print(f'{idx_min=} {idx_max=}')
         for idx in range(idx_min, idx_max):
             self.move_to_end(keys[idx])
-        self._ok.add(key)
+        self._add_own(key)
         # for referer in self._ref:
         #     for keytmp in keys:
         #         referer.update_key_value(keytmp)
@@ -873,7 +895,7 @@ class CommentedMap(ordereddict, CommentedBase):
             ):
                 value = type(self[key])(value)
         ordereddict.__setitem__(self, key, value)
-        self._ok.add(key)
+        self._add_own(key)
 
     def _unmerged_contains(self, key: Any) -> Any:
         if key in self._ok:
@@ -932,9 +954,10 @@ class CommentedMap(ordereddict, CommentedBase):
                     merge_value.merge_pos -= 1
             except ValueError:
                 pass  # let the removal of the key throw a "normal" error
-        self._ok.discard(key)
+        if self._own is not None:
+            self._own.discard(key)
         ordereddict.__delitem__(self, key)
-        for referer in self._ref:
+        for referer in self._referents or ():
             referer.update_key_value(key)
 
     def __iter__(self) -> Any:
@@ -993,6 +1016,8 @@ class CommentedMap(ordereddict, CommentedBase):
 
     def add_yaml_merge(self, value: Any) -> None:
         assert not hasattr(self, merge_attrib)
+        if self._own is None:
+            self._own = set(ordereddict.keys(self))
         setattr(self, merge_attrib, value)
         for v in value:
             # if isinstance(v, tuple):
@@ -1171,7 +1196,7 @@ class TaggedScalar(CommentedBase):
         self.style = style
         if tag is not None:
             if isinstance(tag, str):
-                tag = Tag(suffix=tag)
+                tag = Tag.intern(tag)
             self.yaml_set_ctag(tag)
 
     def __str__(self) -> Any:
@@ -1206,3 +1231,62 @@ def dump_comments(d: Any, name: str = "", sep: str = '.', out: Any = sys.stdout)
             dump_comments(
                 k, name=(name + sep + str(idx)) if name else str(idx), sep=sep, out=out,
             )
+
+
+def comment_tokens(comment: Any) -> Iterator[Any]:
+    """the comment tokens in comment, a token or a (nested) list of tokens and None"""
+    if isinstance(comment, list):
+        for elem in comment:
+            yield from comment_tokens(elem)
+    elif comment is not None:
+        yield comment
+
+
+def shift_comment_lines(
+    comment: Any, delta: int, seen: Optional[MutableSet[int]] = None,
+) -> None:
+    """
+    add delta to the line of the marks of the comment tokens in comment, marks can be
+    shared, the ids of those shifted are added to seen
+    """
+    if seen is None:
+        seen = set()
+    for token in comment_tokens(comment):
+        for mark in (token.start_mark, token.end_mark):
+            if mark is not None and hasattr(mark, 'line') and id(mark) not in seen:
+                seen.add(id(mark))
+                mark.line += delta
+
+
+def shift_line_col(d: Any, delta: int, seen: Optional[MutableSet[int]] = None) -> None:
+    """
+    add delta to the line numbers in the line/column info, and in the comments, of d
+    and of the collections in it, e.g. after lines have been inserted in the text that
+    d was loaded from. seen holds the ids of the collections and marks already shifted
+    """
+    if seen is None:
+        seen = set()
+    todo = [d]
+    while todo:
+        obj = todo.pop()
+        if not isinstance(obj, CommentedBase) or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        lc = getattr(obj, LineCol.attrib, None)
+        if lc is not None:
+            if lc.line is not None:
+                lc.line += delta
+            for data in (lc.data or {}).values():
+                data[0] += delta
+                if len(data) > 2:  # key and value of a mapping
+                    data[2] += delta
+        ca = getattr(obj, Comment.attrib, None)
+        if ca is not None:
+            shift_comment_lines(
+                [ca.comment, list(ca.items.values()), ca.end, ca.pre], delta, seen,
+            )
+        if isinstance(obj, dict):
+            todo.extend(obj.keys())
+            todo.extend(obj.values())
+        elif isinstance(obj, (list, tuple, CommentedSet)):
+            todo.extend(obj)
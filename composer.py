@@ -101,6 +101,8 @@ class Composer:
 
         # Drop the DOCUMENT-END event.
         self.parser.get_event()
+        # don't keep the nodes of the document alive
+        self.anchors = {}
 
         return node
 
@@ -108,43 +110,102 @@ class Composer:
         return a
 
     def compose_node(self, parent: Any, index: Any) -> Any:
-        if self.parser.check_event(AliasEvent):
-            event = self.parser.get_event()
-            alias = event.anchor
-            if alias not in self.anchors:
-                raise ComposerError(
-                    None, None, f'found undefined alias {alias!r}', event.start_mark,
-                )
-            return self.return_alias(self.anchors[alias])
-        self.depth += 1
-        event = self.parser.peek_event()
-        if self.loader.max_depth and self.depth > self.loader.max_depth:
-            raise MaxDepthExceededError(
-                None,
-                None,
-                f'maximum depth of data structure exceeded ({self.depth}), '
-                'if necessary increase YAML().max_depth',
-                event.start_mark,
-            )
-        anchor = event.anchor
-        if anchor is not None:  # have an anchor
-            if self.warn_double_anchors and anchor in self.anchors:
-                ws = (
-                    f'\nfound duplicate anchor {anchor!r}\n'
-                    f'first occurrence {self.anchors[anchor].start_mark}\n'
-                    f'second occurrence {event.start_mark}'
-                )
-                warnings.warn(ws, ReusedAnchorWarning, stacklevel=2)
-        self.resolver.descend_resolver(parent, index)
-        if self.parser.check_event(ScalarEvent):
-            node = self.compose_scalar_node(anchor)
-        elif self.parser.check_event(SequenceStartEvent):
-            node = self.compose_sequence_node(anchor)
-        elif self.parser.check_event(MappingStartEvent):
-            node = self.compose_mapping_node(anchor)
-        self.resolver.ascend_resolver()
-        self.depth -= 1
-        return node
+        """
+        compose the node that starts with the next parser event, as child of parent at
+        index. The collection nodes that are being composed are kept on a stack instead
+        of composing their children recursively, so the depth of the document is not
+        limited by the recursion limit. A subclass that overrides compose_sequence_node
+        or compose_mapping_node has these called for the respective collections, if it
+        overrides compose_node the children are composed recursively, so that its
+        compose_node is called for every node
+        """
+        parser = self.parser
+        resolver = self.resolver
+        max_depth = self.loader.max_depth
+        iterate = type(self).compose_node is Composer.compose_node
+        compose_sequence = (
+            iterate and type(self).compose_sequence_node is Composer.compose_sequence_node
+        )
+        compose_mapping = (
+            iterate and type(self).compose_mapping_node is Composer.compose_mapping_node
+        )
+        # [node, key] for each collection node being composed, key is the key node of
+        # the mapping entry for which the value is next, or None
+        stack: List[Any] = []
+        while True:
+            event = parser.peek_event()
+            node: Any = None
+            if isinstance(event, AliasEvent):
+                parser.get_event()
+                alias = event.anchor
+                if alias not in self.anchors:
+                    raise ComposerError(
+                        None, None, f'found undefined alias {alias!r}', event.start_mark,
+                    )
+                node = self.return_alias(self.anchors[alias])
+            else:
+                self.depth += 1
+                if max_depth and self.depth > max_depth:
+                    raise MaxDepthExceededError(
+                        None,
+                        None,
+                        f'maximum depth of data structure exceeded ({self.depth}), '
+                        'if necessary increase YAML().max_depth',
+                        event.start_mark,
+                    )
+                anchor = event.anchor
+                if anchor is not None:  # have an anchor
+                    if self.warn_double_anchors and anchor in self.anchors:
+                        ws = (
+                            f'\nfound duplicate anchor {anchor!r}\n'
+                            f'first occurrence {self.anchors[anchor].start_mark}\n'
+                            f'second occurrence {event.start_mark}'
+                        )
+                        warnings.warn(ws, ReusedAnchorWarning, stacklevel=2)
+                resolver.descend_resolver(parent, index)
+                if isinstance(event, ScalarEvent):
+                    node = self.compose_scalar_node(anchor)
+                elif isinstance(event, SequenceStartEvent):
+                    if compose_sequence:
+                        stack.append([self.compose_sequence_start(anchor), None])
+                    else:
+                        node = self.compose_sequence_node(anchor)
+                elif isinstance(event, MappingStartEvent):
+                    if compose_mapping:
+                        stack.append([self.compose_mapping_start(anchor), None])
+                    else:
+                        node = self.compose_mapping_node(anchor)
+                if node is not None:
+                    resolver.ascend_resolver()
+                    self.depth -= 1
+            # add the composed node to its parent, and end the collections that are done
+            while stack:
+                frame = stack[-1]
+                parent = frame[0]
+                if isinstance(parent, SequenceNode):
+                    if node is not None:
+                        parent.value.append(node)
+                    if not parser.check_event(SequenceEndEvent):
+                        index = len(parent.value)
+                        break
+                    self.compose_sequence_end(parent)
+                else:
+                    if node is not None:
+                        if frame[1] is None:
+                            frame[1] = node
+                        else:
+                            parent.value.append((frame[1], node))
+                            frame[1] = None
+                    if frame[1] is not None or not parser.check_event(MappingEndEvent):
+                        index = frame[1]
+                        break
+                    self.compose_mapping_end(parent)
+                stack.pop()
+                resolver.ascend_resolver()
+                self.depth -= 1
+                node = parent
+            else:
+                return node
 
     def compose_scalar_node(self, anchor: Any) -> Any:
         event = self.parser.get_event()
@@ -167,6 +228,15 @@ class Composer:
         return node
 
     def compose_sequence_node(self, anchor: Any) -> Any:
+        node = self.compose_sequence_start(anchor)
+        index = 0
+        while not self.parser.check_event(SequenceEndEvent):
+            node.value.append(self.compose_node(node, index))
+            index += 1
+        self.compose_sequence_end(node)
+        return node
+
+    def compose_sequence_start(self, anchor: Any) -> Any:
         start_event = self.parser.get_event()
         tag = start_event.ctag
         if tag is None or str(tag) == '!':
@@ -183,10 +253,9 @@ class Composer:
         )
         if anchor is not None:
             self.anchors[anchor] = node
-        index = 0
-        while not self.parser.check_event(SequenceEndEvent):
-            node.value.append(self.compose_node(node, index))
-            index += 1
+        return node
+
+    def compose_sequence_end(self, node: Any) -> None:
         end_event = self.parser.get_event()
         if node.flow_style is True and end_event.comment is not None:
             if node.comment is not None:
@@ -198,9 +267,23 @@ class Composer:
             node.comment = end_event.comment
         node.end_mark = end_event.end_mark
         self.check_end_doc_comment(end_event, node)
-        return node
 
     def compose_mapping_node(self, anchor: Any) -> Any:
+        node = self.compose_mapping_start(anchor)
+        while not self.parser.check_event(MappingEndEvent):
+            # key_event = self.parser.peek_event()
+            item_key = self.compose_node(node, None)
+            # if item_key in node.value:
+            #     raise ComposerError("while composing a mapping",
+            #             start_event.start_mark,
+            #             "found duplicate key", key_event.start_mark)
+            item_value = self.compose_node(node, item_key)
+            # node.value[item_key] = item_value
+            node.value.append((item_key, item_value))
+        self.compose_mapping_end(node)
+        return node
+
+    def compose_mapping_start(self, anchor: Any) -> Any:
         start_event = self.parser.get_event()
         tag = start_event.ctag
         if tag is None or str(tag) == '!':
@@ -217,22 +300,14 @@ class Composer:
         )
         if anchor is not None:
             self.anchors[anchor] = node
-        while not self.parser.check_event(MappingEndEvent):
-            # key_event = self.parser.peek_event()
-            item_key = self.compose_node(node, None)
-            # if item_key in node.value:
-            #     raise ComposerError("while composing a mapping",
-            #             start_event.start_mark,
-            #             "found duplicate key", key_event.start_mark)
-            item_value = self.compose_node(node, item_key)
-            # node.value[item_key] = item_value
-            node.value.append((item_key, item_value))
+        return node
+
+    def compose_mapping_end(self, node: Any) -> None:
         end_event = self.parser.get_event()
         if node.flow_style is True and end_event.comment is not None:
             node.comment = end_event.comment
         node.end_mark = end_event.end_mark
         self.check_end_doc_comment(end_event, node)
-        return node
 
     def check_end_doc_comment(self, end_event: Any, node: Any) -> None:
         if end_event.comment and end_event.comment[1]:
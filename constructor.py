@@ -4,6 +4,7 @@ from __future__ import annotations
 import datetime
 from datetime import timedelta as TimeDelta
 import binascii
+from itertools import chain
 import sys
 import types
 import warnings
@@ -14,6 +15,10 @@ from ruamel.yaml.error import (MarkedYAMLError, MarkedYAMLFutureWarning,
                                MantissaNoDotYAML1_1Warning)
 from ruamel.yaml.nodes import *                               # NOQA
 from ruamel.yaml.nodes import (SequenceNode, MappingNode, ScalarNode)
+from ruamel.yaml.events import (StreamEndEvent, MappingStartEvent, MappingEndEvent,
+                                SequenceStartEvent, SequenceEndEvent, AliasEvent,
+                                ScalarEvent)
+from ruamel.yaml.composer import ComposerError, MaxDepthExceededError
 from ruamel.yaml.compat import (builtins_module, # NOQA
                                 nprint, nprintf, version_tnf)
 from ruamel.yaml.compat import ordereddict
@@ -63,6 +68,12 @@ class BaseConstructor:
 
     yaml_constructors = {}  # type: Dict[Any, Any]
     yaml_multi_constructors = {}  # type: Dict[Any, Any]
+    dispatch_cache_size = 1000
+    # set per class by get_constructor_dispatch()
+    _constructor_dispatch: Dict[Any, Any]
+    # the number of levels of collection nodes that are constructed recursively when
+    # constructing deep, deeper nested collections are constructed first
+    recursive_levels = 50
 
     def __init__(self, preserve_quotes: Optional[bool] = None, loader: Any = None) -> None:
         self.loader = loader
@@ -77,6 +88,7 @@ class BaseConstructor:
         self.deep_construct = False
         self._preserve_quotes = preserve_quotes
         self.allow_duplicate_keys = version_tnf((0, 15, 1), (0, 16))
+        self.constructor_dispatch = self.get_constructor_dispatch()
 
     @property
     def composer(self) -> Any:
@@ -147,6 +159,8 @@ class BaseConstructor:
             #     None, None, 'found unconstructable recursive node', node.start_mark
             # )
         self.recursive_objects[node] = None
+        if deep and not old_deep and not isinstance(node, ScalarNode):
+            self.construct_nested(node)
         data = self.construct_non_recursive_object(node)
 
         self.constructed_objects[node] = data
@@ -155,11 +169,86 @@ class BaseConstructor:
             self.deep_construct = old_deep
         return data
 
+    def construct_nested(self, node: Any) -> None:
+        """
+        construct, deepest first, the collection nodes below node that have
+        recursive_levels levels of collection nodes below them, that are not yet
+        constructed, so that constructing node does not recurse deeper than that. The
+        nodes are found using a stack instead of recursion. If a node below node refers
+        to one of its parents nothing is constructed, as that would change which of the
+        nodes is constructed first
+        """
+        levels = self.recursive_levels
+        # for each visited node the number of levels of unconstructed collection nodes
+        heights: Dict[Any, int] = {}
+        nested: List[Any] = []
+        path = {node}
+        # [node, iterator over the child nodes, levels below node so far]
+        stack = [[node, self.child_nodes(node), 0]]
+        while stack:
+            frame = stack[-1]
+            for child in frame[1]:
+                if isinstance(child, ScalarNode):
+                    continue
+                if child in path:
+                    return
+                if child in heights:
+                    if frame[2] < heights[child]:
+                        frame[2] = heights[child]
+                elif child not in self.constructed_objects:
+                    if child not in self.recursive_objects:
+                        path.add(child)
+                        stack.append([child, self.child_nodes(child), 0])
+                        break
+            else:
+                stack.pop()
+                parent = frame[0]
+                path.discard(parent)
+                height = frame[2] + 1
+                if height >= levels and parent is not node:
+                    nested.append(parent)
+                    height = 0
+                heights[parent] = height
+                if stack and stack[-1][2] < height:
+                    stack[-1][2] = height
+        for child in nested:
+            self.construct_object(child, deep=True)
+
+    @staticmethod
+    def child_nodes(node: Any) -> Any:
+        if isinstance(node, MappingNode):
+            return chain.from_iterable(node.value)
+        return iter(node.value)
+
     def construct_non_recursive_object(self, node: Any, tag: Optional[str] = None) -> Any:
-        constructor: Any = None
-        tag_suffix = None
         if tag is None:
             tag = node.tag
+        try:
+            constructor, tag_suffix = self.constructor_dispatch[tag, node.__class__]
+        except KeyError:
+            constructor, tag_suffix = self.lookup_constructor(node, tag)
+        if tag_suffix is None:
+            data = constructor(self, node)
+        else:
+            data = constructor(self, tag_suffix, node)
+        if isinstance(data, types.GeneratorType):
+            generator = data
+            data = next(generator)
+            if self.deep_construct:
+                for _dummy in generator:
+                    pass
+            else:
+                self.state_generators.append(generator)
+        return data
+
+    def lookup_constructor(self, node: Any, tag: str) -> Any:
+        """
+        return the constructor for a node with tag, and the tag suffix to pass to it (None
+        for constructors that are not multi constructors). The result is cached per class
+        until a constructor is added.
+        """
+        constructor: Any = None
+        tag_suffix = None
         if tag in self.yaml_constructors:
             constructor = self.yaml_constructors[tag]
         else:
@@ -180,19 +269,33 @@ class BaseConstructor:
                     constructor = self.__class__.construct_sequence
                 elif isinstance(node, MappingNode):
                     constructor = self.__class__.construct_mapping
-        if tag_suffix is None:
-            data = constructor(self, node)
-        else:
-            data = constructor(self, tag_suffix, node)
-        if isinstance(data, types.GeneratorType):
-            generator = data
-            data = next(generator)
-            if self.deep_construct:
-                for _dummy in generator:
-                    pass
-            else:
-                self.state_generators.append(generator)
-        return data
+        if len(self.constructor_dispatch) < self.dispatch_cache_size:
+            self.constructor_dispatch[tag, node.__class__] = constructor, tag_suffix
+        return constructor, tag_suffix
+
+    @classmethod
+    def get_constructor_dispatch(cls) -> Dict[Any, Any]:
+        """the (tag, node class) -> (constructor, tag suffix) cache for this class"""
+        try:
+            return cls.__dict__['_constructor_dispatch']
+        except KeyError:
+            pass
+        res: Dict[Any, Any] = {}
+        cls._constructor_dispatch = res
+        return res
+
+    @classmethod
+    def clear_constructor_dispatch(cls) -> None:
+        """
+        clear the dispatch cache of cls and its subclasses, which might have inherited
+        the added constructor. The caches are cleared in place, as existing instances
+        refer to them.
+        """
+        todo = [cls]
+        while todo:
+            klass = todo.pop()
+            klass.__dict__.get('_constructor_dispatch', {}).clear()
+            todo.extend(klass.__subclasses__())
 
     def construct_scalar(self, node: Any) -> Any:
         if not isinstance(node, ScalarNode):
@@ -326,6 +429,7 @@ class BaseConstructor:
             cls.yaml_constructors = cls.yaml_constructors.copy()
         ret_val = cls.yaml_constructors.get(tag, None)
         cls.yaml_constructors[tag] = constructor
+        cls.clear_constructor_dispatch()
         return ret_val
 
     @classmethod
@@ -333,6 +437,7 @@ class BaseConstructor:
         if 'yaml_multi_constructors' not in cls.__dict__:
             cls.yaml_multi_constructors = cls.yaml_multi_constructors.copy()
         cls.yaml_multi_constructors[tag_prefix] = multi_constructor
+        cls.clear_constructor_dispatch()
 
     @classmethod
     def add_default_constructor(
@@ -647,6 +752,282 @@ class SafeConstructor(BaseConstructor):
             node.start_mark,
         )
 
+    # the scalar tags (after tag:yaml.org,2002:) of constructors that only use the node
+    # during the call, construct_direct() passes them a reused ScalarNode
+    direct_scalar_tags = ('null', 'bool', 'int', 'float', 'binary', 'timestamp')
+
+    def direct_constructors(self) -> Any:
+        """
+        return the constructors, by tag string, of the scalars that construct_direct()
+        can construct (None for str, which needs no construction) and whether it
+        can construct sequences resp. mappings. This requires the constructors, and
+        the methods these rely on, to be those of SafeConstructor.
+        """
+        tag_base = 'tag:yaml.org,2002:'
+        cls = self.__class__
+        constructors = self.yaml_constructors
+        scalars: Dict[Any, Any] = {}
+        if cls.construct_scalar is SafeConstructor.construct_scalar:
+            for name in self.direct_scalar_tags:
+                if name == 'float' and self.resolver.processing_version != (1, 2):
+                    continue  # the warning for a YAML 1.1 float keeps the node
+                constructor = constructors.get(tag_base + name)
+                if constructor is getattr(SafeConstructor, 'construct_yaml_' + name):
+                    scalars[tag_base + name] = constructor
+            if constructors.get(tag_base + 'str') is SafeConstructor.construct_yaml_str:
+                scalars[tag_base + 'str'] = None
+        seq = (
+            constructors.get(tag_base + 'seq') is SafeConstructor.construct_yaml_seq
+            and cls.construct_sequence is BaseConstructor.construct_sequence
+        )
+        mapping = (
+            constructors.get(tag_base + 'map') is SafeConstructor.construct_yaml_map
+            and cls.construct_mapping is SafeConstructor.construct_mapping
+        )
+        return scalars, seq, mapping
+
+    def get_single_data_direct(self) -> Any:
+        """
+        as get_single_data(), but construct the document using construct_direct()
+        """
+        parser = self.composer.parser
+        # Drop the STREAM-START event.
+        parser.get_event()
+        data = None
+        start_mark = None
+        if not parser.check_event(StreamEndEvent):
+            start_mark = parser.peek_event().start_mark
+            data = self.construct_document_direct()
+        if not parser.check_event(StreamEndEvent):
+            event = parser.get_event()
+            raise ComposerError(
+                'expected a single document in the stream',
+                start_mark,
+                'but found another document',
+                event.start_mark,
+            )
+        # Drop the STREAM-END event.
+        parser.get_event()
+        return data
+
+    def get_data_direct(self) -> Any:
+        # Construct and return the next document, using construct_direct()
+        if self.composer.check_node():
+            return self.construct_document_direct()
+
+    def construct_document_direct(self) -> Any:
+        composer = self.composer
+        composer.anchors = {}
+        # Drop the DOCUMENT-START event.
+        composer.parser.get_event()
+        if self.resolver.yaml_path_resolvers:
+            # these need the nodes of the parents
+            data = self.construct_object(composer.compose_node(None, None))
+        else:
+            data = self.construct_direct()
+        # Drop the DOCUMENT-END event.
+        composer.parser.get_event()
+        composer.anchors = {}
+        while bool(self.state_generators):
+            state_generators = self.state_generators
+            self.state_generators = []
+            for generator in state_generators:
+                for _dummy in generator:
+                    pass
+        self.constructed_objects = {}
+        self.recursive_objects = {}
+        self.deep_construct = False
+        return data
+
+    def construct_direct(self) -> Any:
+        """
+        construct the data of the node that starts with the next parser event.
+        Scalars, sequences and mappings without anchor, that have a tag with the
+        SafeConstructor constructor, are constructed from the events without composing
+        nodes, using a stack instead of recursion. Any other node, as well as the
+        value for a merge key, is composed and constructed as usual, so aliases refer
+        to composed nodes.
+        """
+        composer = self.composer
+        parser = composer.parser
+        resolver = self.resolver
+        max_depth = self.loader.max_depth if self.loader is not None else 0
+        scalars, direct_seq, direct_map = self.direct_constructors()
+        str_tag = 'tag:yaml.org,2002:str'
+        merge_tag = 'tag:yaml.org,2002:merge'
+        value_tag = 'tag:yaml.org,2002:value'
+        seq_tag = 'tag:yaml.org,2002:seq'
+        map_tag = 'tag:yaml.org,2002:map'
+        scalar_node = ScalarNode(Tag.intern(str_tag), None, None, None)
+        merge_key = object()  # as key event, for the value of a merge key
+        # sequence frame: [list, start event]
+        # mapping frame: [dict, start event, key, key event, duplicates, merges], the key
+        #     event is None when the next node is a key
+        stack: List[Any] = []
+        frame: Any = None
+        key_event: Any = False  # frame[3] of a mapping frame, False for a sequence frame
+        while True:
+            event = parser.peek_event()
+            event_cls = event.__class__
+            if event_cls is SequenceEndEvent or event_cls is MappingEndEvent:
+                parser.get_event()
+                if event_cls is MappingEndEvent:
+                    self.end_direct_mapping(frame)
+                value = frame[0]
+                event = frame[1]
+                stack.pop()
+                frame = stack[-1] if stack else None
+                key_event = False if frame is None or len(frame) == 2 else frame[3]
+            else:
+                if max_depth and len(stack) >= max_depth:
+                    raise MaxDepthExceededError(
+                        None,
+                        None,
+                        f'maximum depth of data structure exceeded ({len(stack) + 1}), '
+                        'if necessary increase YAML().max_depth',
+                        event.start_mark,
+                    )
+                node: Any = None
+                if event_cls is AliasEvent:
+                    parser.get_event()
+                    alias = event.anchor
+                    if alias not in composer.anchors:
+                        raise ComposerError(
+                            None, None, f'found undefined alias {alias!r}', event.start_mark,
+                        )
+                    node = composer.return_alias(composer.anchors[alias])
+                elif event.anchor is not None or key_event is merge_key:
+                    composer.depth = len(stack)
+                    node = composer.compose_node(None, None)
+                else:
+                    tag = event.ctag
+                    if tag is None or str(tag) == '!':
+                        if event_cls is ScalarEvent:
+                            tag = resolver.resolve(ScalarNode, event.value, event.implicit)
+                        elif event_cls is SequenceStartEvent:
+                            tag = resolver.resolve(SequenceNode, None, event.implicit)
+                        else:
+                            tag = resolver.resolve(MappingNode, None, event.implicit)
+                    tag_str = str(tag)
+                    if event_cls is ScalarEvent:
+                        if key_event is None and tag_str == merge_tag:
+                            parser.get_event()
+                            frame[2] = ScalarNode(
+                                tag, event.value, event.start_mark, event.end_mark,
+                            )
+                            frame[3] = key_event = merge_key
+                            continue
+                        if tag_str in scalars:
+                            parser.get_event()
+                            constructor = scalars[tag_str]
+                            if constructor is None:
+                                value = event.value
+                            else:
+                                scalar_node.value = event.value
+                                scalar_node.start_mark = event.start_mark
+                                scalar_node.end_mark = event.end_mark
+                                value = constructor(self, scalar_node)
+                        elif key_event is None and tag_str == value_tag and str_tag in scalars:
+                            # flatten_mapping() makes this a str key
+                            parser.get_event()
+                            value = event.value
+                        else:
+                            composer.depth = len(stack)
+                            node = composer.compose_node(None, None)
+                    elif event_cls is SequenceStartEvent and direct_seq and tag_str == seq_tag:
+                        parser.get_event()
+                        frame = [self.yaml_base_list_type(), event]
+                        stack.append(frame)
+                        key_event = False
+                        continue
+                    elif event_cls is MappingStartEvent and direct_map and tag_str == map_tag:
+                        parser.get_event()
+                        frame = [self.yaml_base_dict_type(), event, None, None, None, []]
+                        stack.append(frame)
+                        key_event = None
+                        continue
+                    else:
+                        composer.depth = len(stack)
+                        node = composer.compose_node(None, None)
+                if node is not None:
+                    if key_event is merge_key:
+                        frame[5].append((frame[2], node))
+                        frame[3] = key_event = None
+                        continue
+                    if key_event is None and node.tag == merge_tag:
+                        frame[2] = node
+                        frame[3] = key_event = merge_key
+                        continue
+                    if key_event is None and node.tag == value_tag:
+                        node.tag = str_tag  # as flatten_mapping() does
+                    value = self.construct_object(node, deep=key_event is None)
+                    event = node
+            # add the value to its parent
+            if frame is None:
+                return value
+            if key_event is False:
+                frame[0].append(value)
+            elif key_event is None:
+                # lists are not hashable, but tuples are
+                if value.__class__ is not str and not isinstance(value, Hashable):
+                    if isinstance(value, list):
+                        value = tuple(value)
+                    if not isinstance(value, Hashable):
+                        raise ConstructorError(
+                            'while constructing a mapping',
+                            frame[1].start_mark,
+                            'found unhashable key',
+                            event.start_mark,
+                        )
+                frame[2] = value
+                frame[3] = key_event = event
+            else:
+                key = frame[2]
+                data = frame[0]
+                if key in data:
+                    if frame[4] is None:
+                        frame[4] = []
+                    frame[4].append((key, value, key_event))
+                else:
+                    data[key] = value
+                frame[3] = key_event = None
+
+    def end_direct_mapping(self, frame: Any) -> None:
+        """
+        handle the duplicate keys and merge keys of a mapping constructed by
+        construct_direct(), resulting in the same dict as construct_mapping()
+        """
+        data, start_event, _, _, duplicates, merges = frame
+        if not merges:
+            for key, value, key_event in duplicates or []:
+                self.check_mapping_key(start_event, key_event, data, key, value)
+            return
+        node = MappingNode(
+            Tag.intern('tag:yaml.org,2002:map'), merges, start_event.start_mark, None,
+        )
+        self.flatten_mapping(node)
+        merged = self.yaml_base_dict_type()
+        for key_node, value_node in getattr(node, 'merge', None) or []:
+            key = self.construct_object(key_node, deep=True)
+            if not isinstance(key, Hashable):
+                if isinstance(key, list):
+                    key = tuple(key)
+            if not isinstance(key, Hashable):
+                raise ConstructorError(
+                    'while constructing a mapping',
+                    start_event.start_mark,
+                    'found unhashable key',
+                    key_node.start_mark,
+                )
+            merged[key] = self.construct_object(value_node)
+        # with merge keys there is no check for duplicates, and the last value is used
+        own = list(data.items())
+        data.clear()
+        data.update(merged)
+        data.update(own)
+        for key, value, _ in duplicates or []:
+            data[key] = value
+
 
 for tag in 'null bool int float binary timestamp omap pairs set str seq map'.split():
     SafeConstructor.add_default_constructor(tag)
@@ -927,6 +1308,10 @@ class RoundTripConstructor(SafeConstructor):
     as well as on the items
     """
 
+    # record the line and column of each key and value of a mapping, and of each item of
+    # a sequence, in .lc (the line and column of the collection itself are always kept)
+    key_line_col = True
+
     def comment(self, idx: Any) -> Any:
         assert self.loader.comment_handling is not None
         x = self.scanner.comments[idx]
@@ -1213,14 +1598,16 @@ class RoundTripConstructor(SafeConstructor):
 
             if not templated_id(node.anchor):
                 seqtyp.yaml_set_anchor(node.anchor)
+        key_line_col = self.key_line_col
         for idx, child in enumerate(node.value):
             if child.comment:
                 seqtyp._yaml_add_comment(child.comment, key=idx)
                 child.comment = None  # if moved to sequence remove from child
             ret_val.append(self.construct_object(child, deep=deep))
-            seqtyp._yaml_set_idx_line_col(
-                idx, [child.start_mark.line, child.start_mark.column],
-            )
+            if key_line_col:
+                seqtyp._yaml_set_idx_line_col(
+                    idx, [child.start_mark.line, child.start_mark.column],
+                )
         return ret_val
 
     def flatten_mapping(self, node: Any) -> Any:  # RTConstructor
@@ -1323,6 +1710,7 @@ class RoundTripConstructor(SafeConstructor):
             if not templated_id(node.anchor):
                 maptyp.yaml_set_anchor(node.anchor)
         last_key, last_value = None, self._sentinel
+        key_line_col = self.key_line_col
         for key_node, value_node in node.value:
             # keys can be list -> deep
             key = self.construct_object(key_node, deep=True)
@@ -1384,15 +1772,16 @@ class RoundTripConstructor(SafeConstructor):
                             maptyp.ca.set(key, C_VALUE_EOL, value_node.comment[1])
                         if value_node.comment[2]:
                             maptyp.ca.set(key, C_VALUE_POST, value_node.comment[2])
-                maptyp._yaml_set_kv_line_col(
-                    key,
-                    [
-                        key_node.start_mark.line,
-                        key_node.start_mark.column,
-                        value_node.start_mark.line,
-                        value_node.start_mark.column,
-                    ],
-                )
+                if key_line_col:
+                    maptyp._yaml_set_kv_line_col(
+                        key,
+                        [
+                            key_node.start_mark.line,
+                            key_node.start_mark.column,
+                            value_node.start_mark.line,
+                            value_node.start_mark.column,
+                        ],
+                    )
                 maptyp[key] = value
                 last_key, last_value = key, value  # could use indexing
         # do this last, or <<: before a key will prevent insertion in instances
@@ -8,7 +8,12 @@ from __future__ import annotations
 # sequence ::= SEQUENCE-START node* SEQUENCE-END
 # mapping ::= MAPPING-START (node node)* MAPPING-END
 
+import re
 import sys
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+
 from ruamel.yaml.error import YAMLError, YAMLStreamError
 from ruamel.yaml.events import *  # NOQA
 
@@ -19,7 +24,7 @@ from ruamel.yaml.compat import nprint, dbg, DBG_EVENT, \
 
 
 if False:  # MYPY
-    from typing import Any, Dict, List, Union, Text, Tuple, Optional  # NOQA
+    from typing import Any, Dict, List, Union, Text, Tuple, Optional, Deque  # NOQA
     from ruamel.yaml.compat import StreamType  # NOQA
 
 __all__ = ['Emitter', 'EmitterError']
@@ -117,6 +122,14 @@ class Emitter:
     flow_map_end = '}'
     flow_map_separator = ','
 
+    # the number of (short) scalars for which the result of analyze_scalar is kept,
+    # 0 for no caching
+    analyze_scalar_cache_size = 4096
+
+    # the number of characters collected before the output is written to the stream,
+    # can be set with YAML().write_buffer_size
+    write_buffer_size = 65536
+
     def __init__(
         self,
         stream: StreamType,
@@ -135,6 +148,9 @@ class Emitter:
         self.dumper = dumper
         if self.dumper is not None and getattr(self.dumper, '_emitter', None) is None:
             self.dumper._emitter = self
+        # the text written, but not yet to the stream, see write_text()
+        self._output: List[Text] = []
+        self._output_size = 0
         self.stream = stream
 
         # Encoding can be overriden by STREAM-START.
@@ -147,7 +163,7 @@ class Emitter:
         self.state: Any = self.expect_stream_start
 
         # Current event and the event queue.
-        self.events: List[Any] = []
+        self.events: Deque[Any] = deque()
         self.event: Any = None
 
         # The current indentation level and the stack of previous indents.
@@ -223,14 +239,26 @@ class Emitter:
 
         self.scalar_after_indicator = True  # write a scalar on the same line as `---`
 
+        # the key for the cached results of analyze_scalar besides the scalar,
+        # determined at the start of each document
+        self._analysis_settings: Any = None
+        if self.analyze_scalar_cache_size:
+            self._analyze_scalar_cached = lru_cache(maxsize=self.analyze_scalar_cache_size)(
+                self.analyze_scalar_settings,
+            )
+
         self.alt_null = 'null'
 
     @property
     def stream(self) -> Any:
         try:
-            return self._stream
+            stream = self._stream
         except AttributeError:
             raise YAMLStreamError('output stream needs to be specified')
+        # the stream is written to directly (e.g. by a subclass), the output so far
+        # has to go first
+        self.flush_output()
+        return stream
 
     @stream.setter
     def stream(self, val: Any) -> None:
@@ -238,6 +266,8 @@ class Emitter:
             return
         if not hasattr(val, 'write'):
             raise YAMLStreamError('stream argument needs to have a write() method')
+        if self._output and hasattr(self, '_stream'):
+            self.flush_output()
         self._stream = val
 
     @property
@@ -263,7 +293,7 @@ class Emitter:
             nprint(event)
         self.events.append(event)
         while not self.need_more_events():
-            self.event = self.events.pop(0)
+            self.event = self.events.popleft()
             self.state()
             self.event = None
 
@@ -284,7 +314,7 @@ class Emitter:
 
     def need_events(self, count: int) -> bool:
         level = 0
-        for event in self.events[1:]:
+        for event in islice(self.events, 1, None):
             if isinstance(event, (DocumentStartEvent, CollectionStartEvent)):
                 level += 1
             elif isinstance(event, (DocumentEndEvent, CollectionEndEvent)):
@@ -342,6 +372,7 @@ class Emitter:
 
     def expect_document_start(self, first: bool = False) -> None:
         if isinstance(self.event, DocumentStartEvent):
+            self._analysis_settings = None
             if (self.event.version or self.event.tags) and self.open_ended:
                 self.write_indicator('...', True)
                 self.write_indent()
@@ -711,7 +742,7 @@ class Emitter:
                 self.expect_node(mapping=True, simple_key=True)
                 # test on style for alias in !!set
                 if isinstance(self.event, AliasEvent) and not self.event.style == '?':
-                    self.stream.write(' ')
+                    self.write_text(' ')
             else:
                 self.write_indicator('?', True, indention=True)
                 self.states.append(self.expect_block_mapping_value)
@@ -871,13 +902,10 @@ class Emitter:
                 return ""
             if self.event.style == '-':
                 return ""
-        self.analysis.allow_block = True
+        # a requested block style is used even if the analysis doesn't allow it (the
+        # analysis can be shared, see analyze_scalar(), so it is not changed)
         if self.event.style and self.event.style in '|>':
-            if (
-                not self.flow_level
-                and not self.simple_key_context
-                and self.analysis.allow_block
-            ):
+            if not self.flow_level and not self.simple_key_context:
                 return self.event.style
         if not self.event.style and self.analysis.allow_double_quoted:
             if "'" in self.event.value or '\n' in self.event.value:
@@ -1038,6 +1066,46 @@ class Emitter:
         return anchor
 
     def analyze_scalar(self, scalar: Any) -> Any:
+        """
+        the ScalarAnalysis of scalar, the results for short scalars are cached, so the
+        returned analysis should not be altered
+        """
+        if self.analyze_scalar_cache_size and len(scalar) <= 128:
+            if self._analysis_settings is None:
+                self._analysis_settings = self.analysis_settings()
+            return self._analyze_scalar_cached(scalar, self._analysis_settings)
+        return self.analyze_scalar_uncached(scalar)
+
+    def analysis_settings(self) -> Tuple[Any, ...]:
+        """the settings that influence the analysis of a scalar"""
+        return (
+            self.serializer.use_version == (1, 1),
+            self.allow_unicode,
+            self.allow_space_break,
+            self.unicode_supplementary,
+        )
+
+    def analyze_scalar_settings(self, scalar: Any, settings: Any) -> Any:
+        # settings is only part of the key for the cached results
+        return self.analyze_scalar_uncached(scalar)
+
+    # scalars that can be plain (and have any other style) in all contexts and that are
+    # common, like identifiers and numbers: ASCII words, separated by single spaces,
+    # without indicators
+    _simple_scalar = re.compile(r'[-+.]?\w[-+./\w]*(?: [-+./\w]+)*', re.ASCII)
+
+    def analyze_scalar_uncached(self, scalar: Any) -> Any:
+        if self._simple_scalar.fullmatch(scalar) is not None:
+            return ScalarAnalysis(
+                scalar=scalar,
+                empty=False,
+                multiline=False,
+                allow_flow_plain=True,
+                allow_block_plain=True,
+                allow_single_quoted=True,
+                allow_double_quoted=True,
+                allow_block=True,
+            )
         # Empty scalar is a special case.
         if not scalar:
             return ScalarAnalysis(
@@ -1217,14 +1285,36 @@ class Emitter:
 
     # Writers.
 
+    def write_text(self, data: Text) -> None:
+        """
+        add data to the output, which is encoded and written to the stream in chunks of
+        about write_buffer_size characters, and on flush_stream()
+        """
+        self._output.append(data)
+        self._output_size += len(data)
+        if self._output_size >= self.write_buffer_size:
+            self.flush_output()
+
+    def flush_output(self) -> None:
+        """write the output collected by write_text() to the stream"""
+        if not self._output:
+            return
+        data: Any = "".join(self._output)
+        self._output = []
+        self._output_size = 0
+        if self.encoding:
+            data = data.encode(self.encoding)
+        self._stream.write(data)
+
     def flush_stream(self) -> None:
-        if hasattr(self.stream, 'flush'):
-            self.stream.flush()
+        self.flush_output()
+        if hasattr(self._stream, 'flush'):
+            self._stream.flush()
 
     def write_stream_start(self) -> None:
         # Write BOM if needed.
         if self.encoding and self.encoding.startswith('utf-16'):
-            self.stream.write('\uFEFF'.encode(self.encoding))
+            self.write_text('\uFEFF')
 
     def write_stream_end(self) -> None:
         self.flush_stream()
@@ -1244,9 +1334,7 @@ class Emitter:
         self.indention = self.indention and indention
         self.column += len(data)
         self.open_ended = False
-        if bool(self.encoding):
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
 
     def write_indent(self) -> None:
         indent = self.indent or 0
@@ -1263,9 +1351,7 @@ class Emitter:
             self.whitespace = True
             data = ' ' * (indent - self.column)
             self.column = indent
-            if self.encoding:
-                data = data.encode(self.encoding)  # type: ignore
-            self.stream.write(data)
+            self.write_text(data)
 
     def write_line_break(self, data: Any = None) -> None:
         if data is None:
@@ -1274,22 +1360,16 @@ class Emitter:
         self.indention = True
         self.line += 1
         self.column = 0
-        if bool(self.encoding):
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
 
     def write_version_directive(self, version_text: Any) -> None:
         data: Any = f'%YAML {version_text!s}'
-        if self.encoding:
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
         self.write_line_break()
 
     def write_tag_directive(self, handle_text: Any, prefix_text: Any) -> None:
         data: Any = f'%TAG {handle_text!s} {prefix_text!s}'
-        if self.encoding:
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
         self.write_line_break()
 
     # Scalar streams.
@@ -1321,9 +1401,7 @@ class Emitter:
                     else:
                         data = text[start:end]
                         self.column += len(data)
-                        if bool(self.encoding):
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                     start = end
             elif breaks:
                 if ch is None or ch not in '\n\x85\u2028\u2029':
@@ -1341,16 +1419,12 @@ class Emitter:
                     if start < end:
                         data = text[start:end]
                         self.column += len(data)
-                        if bool(self.encoding):
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                         start = end
             if ch == "'":
                 data = "''"
                 self.column += 2
-                if bool(self.encoding):
-                    data = data.encode(self.encoding)
-                self.stream.write(data)
+                self.write_text(data)
                 start = end + 1
             if ch is not None:
                 spaces = ch == ' '
@@ -1410,9 +1484,7 @@ class Emitter:
                 if start < end:
                     data = text[start:end]
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     start = end
                 if ch is not None:
                     if ch in self.ESCAPE_REPLACEMENTS:
@@ -1424,9 +1496,7 @@ class Emitter:
                     else:
                         data = '\\U%08X' % ord(ch)
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     start = end + 1
             if (
                 0 < end < len(text) - 1
@@ -1462,9 +1532,7 @@ class Emitter:
                 if start < end:
                     start = end
                 self.column += len(data)
-                if bool(self.encoding):
-                    data = data.encode(self.encoding)
-                self.stream.write(data)
+                self.write_text(data)
                 self.write_indent()
                 self.whitespace = False
                 self.indention = False
@@ -1475,9 +1543,7 @@ class Emitter:
                     # data = u'\\'    # <<< replaced with following line
                     data = '\\' if need_backslash else ''
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
             end += 1
         self.write_indicator('"', False)
 
@@ -1560,17 +1626,13 @@ class Emitter:
                     else:
                         data = text[start:end]
                         self.column += len(data)
-                        if bool(self.encoding):
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                     start = end
             else:
                 if ch is None or ch in ' \n\x85\u2028\u2029\a':
                     data = text[start:end]
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     if ch == '\a':
                         if end < (len(text) - 1) and not text[end + 2].isspace():
                             self.write_line_break()
@@ -1622,16 +1684,14 @@ class Emitter:
                     if ch is not None:
                         if self.root_context:
                             idnx = self.indent if self.indent is not None else 0
-                            self.stream.write(' ' * (_indent + idnx))
+                            self.write_text(' ' * (_indent + idnx))
                         else:
                             self.write_indent()
                     start = end
             else:
                 if ch is None or ch in '\n\x85\u2028\u2029':
                     data = text[start:end]
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     if ch is None:
                         self.write_line_break()
                     start = end
@@ -1652,9 +1712,7 @@ class Emitter:
         if not self.whitespace:
             data = ' '
             self.column += len(data)
-            if self.encoding:
-                data = data.encode(self.encoding)  # type: ignore
-            self.stream.write(data)
+            self.write_text(data)
         self.whitespace = False
         self.indention = False
         spaces = False
@@ -1675,9 +1733,7 @@ class Emitter:
                     else:
                         data = text[start:end]
                         self.column += len(data)
-                        if self.encoding:
-                            data = data.encode(self.encoding)  # type: ignore
-                        self.stream.write(data)
+                        self.write_text(data)
                     start = end
             elif breaks:
                 if ch not in '\n\x85\u2028\u2029':  # type: ignore
@@ -1703,13 +1759,7 @@ class Emitter:
                         # words longer than line length get a line of their own
                         self.write_indent()
                     self.column += len(data)
-                    if self.encoding:
-                        data = data.encode(self.encoding)  # type: ignore
-                    try:
-                        self.stream.write(data)
-                    except:  # NOQA
-                        sys.stdout.write(repr(data) + '\n')
-                        raise
+                    self.write_text(data)
                     start = end
             if ch is not None:
                 spaces = ch == ' '
@@ -1740,12 +1790,7 @@ class Emitter:
             if self.column and value.strip() and nr_spaces < 1 and value[0] != '\n':
                 nr_spaces = 1
             value = ' ' * nr_spaces + value
-            try:
-                if bool(self.encoding):
-                    value = value.encode(self.encoding)
-            except UnicodeDecodeError:
-                pass
-            self.stream.write(value)
+            self.write_text(value)
         except TypeError:
             raise
         if not pre:
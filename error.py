@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import warnings
+from bisect import bisect_left, bisect_right
 # import textwrap
 
 if False:  # MYPY
@@ -11,6 +12,8 @@ if False:  # MYPY
 __all__ = [
     'FileMark',
     'StringMark',
+    'LazyMark',
+    'LineIndex',
     'CommentMark',
     'YAMLError',
     'MarkedYAMLError',
@@ -106,6 +109,117 @@ class StringMark(StreamMark):
         return where
 
 
+class LineIndex:
+    """
+    the stream index of the first character of each line, and of each byte order mark
+    (these are not counted in the column), as collected by the Reader. Used for the
+    line and column of the Reader and shared by the LazyMarks of a stream.
+    text is the complete text of a string stream, for the snippet in error messages,
+    and None for a file-like stream.
+    """
+
+    __slots__ = (
+        'name', 'starts', 'boms', 'text', 'first_line', 'indexed', '_line', '_start', '_end',
+    )
+
+    def __init__(
+        self, name: Any, starts: Any, boms: Any, text: Any = None, first_line: int = 0,
+    ) -> None:
+        self.name = name
+        self.starts = starts
+        self.boms = boms
+        self.text = text
+        # the line number of starts[0]
+        self.first_line = first_line
+        # the stream index up to which the line starts are known
+        self.indexed = 0
+        # the line last looked up, and the stream index of its start and of the start of
+        # the next line
+        self._line = first_line
+        self._start = 0
+        self._end = -1
+
+    def line_of(self, index: int) -> int:
+        if self._start <= index < self._end:
+            return self._line
+        starts = self.starts
+        idx = bisect_right(starts, index) - 1
+        self._start = starts[idx]
+        self._end = starts[idx + 1] if idx + 1 < len(starts) else self.indexed
+        self._line = line = self.first_line + idx
+        return line
+
+    def column_of(self, index: int) -> int:
+        if not (self._start <= index < self._end):
+            self.line_of(index)
+        start = self._start
+        column = index - start
+        if self.boms:
+            column -= bisect_left(self.boms, index) - bisect_left(self.boms, start)
+        return column
+
+    def __deepcopy__(self, memo: Any) -> Any:
+        # only the reader adds to a LineIndex, no need to copy it for copied marks
+        return self
+
+
+class LazyMark:
+    """
+    a mark that only stores the index in the stream, the line and column are
+    determined, when first needed, from the LineIndex of the stream
+    """
+
+    __slots__ = 'lines', 'index', '_line', '_column'
+    _line: int
+    _column: int
+
+    def __init__(self, lines: LineIndex, index: int) -> None:
+        self.lines = lines
+        self.index = index
+
+    @property
+    def name(self) -> Any:
+        return self.lines.name
+
+    @property
+    def line(self) -> int:
+        try:
+            return self._line
+        except AttributeError:
+            self._line = res = self.lines.line_of(self.index)
+            return res
+
+    @line.setter
+    def line(self, val: int) -> None:
+        self._line = val
+
+    @property
+    def column(self) -> int:
+        try:
+            return self._column
+        except AttributeError:
+            self._column = res = self.lines.column_of(self.index)
+            return res
+
+    @column.setter
+    def column(self, val: int) -> None:
+        self._column = val
+
+    @property
+    def buffer(self) -> Any:
+        return self.lines.text
+
+    @property
+    def pointer(self) -> int:
+        return self.index
+
+    get_snippet = StringMark.get_snippet
+    __str__ = StringMark.__str__
+    __repr__ = StringMark.__repr__
+    __eq__ = StreamMark.__eq__
+    __ne__ = StreamMark.__ne__
+
+
 class CommentMark:
     __slots__ = ('column',)
 
@@ -214,7 +214,7 @@ class ScalarEvent(NodeEvent):
     @tag.setter
     def tag(self, val: Any) -> None:
         if isinstance(val, str):
-            val = Tag(suffix=val)
+            val = Tag.intern(val)
         self.ctag = val
 
     def compact_repr(self) -> str:
@@ -5,7 +5,15 @@ import sys
 import os
 import warnings
 import glob
+import re
+import codecs
+import mmap
+import threading
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from importlib import import_module
+from pathlib import Path
 
 
 import ruamel.yaml
@@ -32,14 +40,16 @@ from ruamel.yaml.constructor import (
     RoundTripConstructor,
 )
 from ruamel.yaml.loader import Loader as UnsafeLoader  # NOQA
-from ruamel.yaml.comments import CommentedMap, CommentedSeq, C_PRE
+from ruamel.yaml.comments import CommentedMap, CommentedSeq, C_PRE, comment_tokens
+from ruamel.yaml.comments import shift_comment_lines, shift_line_col
+from ruamel.yaml.comments import LineCol, merge_attrib
 from ruamel.yaml.docinfo import DocInfo, version, Version
+from ruamel.yaml.cache import LoadCache, configuration_key
 
-from typing import List, Set, Dict, Tuple, Union, Any, Callable, Optional, Text, Type  # NOQA
+from typing import List, Set, Dict, Tuple, Union, Any, Callable, Optional, Text, Type, Iterator  # NOQA
 if False:  # MYPY
     from ruamel.yaml.compat import StreamType, StreamTextType, VersionType  # NOQA
     from types import TracebackType
-    from pathlib import Path
 
 try:
     from _ruamel_yaml import CParser, CEmitter  # type: ignore
@@ -49,11 +59,112 @@ except:  # NOQA
 # import io
 
 
+def document_filter(skip: Any, select: Any) -> Any:
+    """
+    combine the skip and select arguments of YAML.load_all() into one function that is
+    called with the document index and DocumentStartEvent, and returns True if the
+    document should be skipped. Returns None if no documents are to be skipped.
+    """
+
+    def as_function(arg: Any) -> Any:
+        if arg is None or callable(arg):
+            return arg
+        indices = {arg} if isinstance(arg, int) else set(arg)
+        return lambda index, event: index in indices
+
+    skip_fun = as_function(skip)
+    select_fun = as_function(select)
+    if select_fun is None:
+        return skip_fun
+    if skip_fun is None:
+        return lambda index, event: not select_fun(index, event)
+    return lambda index, event: skip_fun(index, event) or not select_fun(index, event)
+
+
+# a document start or end marker, these can only occur at the start of a line
+# (not in a block scalar, nor a multi-line quoted or plain scalar)
+_document_marker = re.compile(r'^(?:---|\.\.\.)(?=[ \t\r\n]|\Z)', re.MULTILINE)
+# a directive, or a document start or end marker
+_directive_or_marker = re.compile(r'^(?:%|---|\.\.\.)', re.MULTILINE)
+# lines with only directives, comments or whitespace
+_directive_lines = re.compile(r'(?:(?:%[^\n]*|[ \t\r]*(?:#[^\n]*)?)(?:\n|\Z))*')
+
+
+def document_slices(text: str) -> List[int]:
+    """
+    the start positions of the slices of text that contain one document each (the
+    first can be empty). A slice ends before a document start marker, or after the
+    document end marker preceding it, and includes the directives and comments
+    between the two
+    """
+    res = [0]
+    end = 0  # the position after the last document end marker line
+    for m in _document_marker.finditer(text):
+        pos = m.start()
+        if text[pos] == '.':
+            end = text.find('\n', m.end()) + 1 or len(text)
+            continue
+        if _directive_lines.fullmatch(text, res[-1], pos):
+            continue
+        if end > res[-1] and _directive_lines.fullmatch(text, end, pos):
+            pos = end
+        res.append(pos)
+    return res
+
+
+def line_count(text: str, start: int, end: int) -> int:
+    """the number of line breaks in text[start:end], counted as the Reader does"""
+    return (
+        text.count('\n', start, end) + text.count('\r', start, end)
+        - text.count('\r\n', start, end)
+    )
+
+
+def load_document_slice(yaml: Any, text: str, line: int) -> List[Any]:
+    """load the documents in text, which starts at line in the original stream"""
+    if yaml.Parser is not CParser:
+        if yaml.Reader is None:
+            yaml.Reader = ruamel.yaml.reader.Reader
+        yaml.reader.start_at_line(line)
+    return list(yaml.load_all(text))
+
+
+class LoadResult:
+    """the outcome of loading one file with YAML.load_many()"""
+
+    def __init__(self, path: Any, data: Any = None, error: Any = None) -> None:
+        self.path = path
+        self.data = data
+        # the exception raised while loading the file, None if loading succeeded
+        self.error = error
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f'LoadResult({self.path!r}, error={self.error!r})'
+        return f'LoadResult({self.path!r}, data={self.data!r})'
+
+
+def load_path(yaml: Any, path: Any) -> Tuple[Any, Any]:
+    """
+    load path using a YAMLPool, or a clone of a YAML instance (which is left in an
+    undefined state by an error), returns the data and None, or None and the error
+    """
+    try:
+        if isinstance(yaml, YAML):
+            yaml = yaml.clone()
+        return yaml.load(path), None
+    except Exception as e:
+        return None, e
+
+
 # YAML is an acronym, i.e. spoken: rhymes with "camel". And thus a
 # subset of abbreviations, which should be all caps according to PEP8
 
 
 class YAML:
+    # the official plug-ins, shared by all instances, see official_plug_ins()
+    _official_plug_ins: Optional[List[Any]] = None
+
     def __init__(
         self: Any,
         *,
@@ -95,6 +206,22 @@ class YAML:
         self.default_flow_style: Any = None
         self.comment_handling = None
         self.max_depth = 0
+        # the number of bytes read from a file at a time (by the pure Python reader),
+        # None for the default of Reader.read_size
+        self.read_size: Optional[int] = None
+        # don't check the input for characters that are not allowed in YAML (by the
+        # pure Python reader), for trusted input
+        self.allow_non_printable = False
+        # files loaded from a path of at least this number of bytes are memory mapped,
+        # None to never memory map
+        self.mmap_threshold: Optional[int] = 16 * 1024 * 1024
+        # construct plain data directly from the parser events, without composing nodes
+        # (only with the pure Python parser and a SafeConstructor based constructor)
+        self.direct_construction = False
+        # a ruamel.yaml.cache.LoadCache, for load() and load_all() to get the data of
+        # text loaded before with the same configuration from (the cached data is
+        # unpickled, see the warning in ruamel.yaml.cache)
+        self.load_cache: Any = None
         typ_found = 1
         setup_rt = False
         if 'rt' in self.typ:
@@ -172,13 +299,22 @@ class YAML:
         self.sequence_dash_offset: int = 0
         self.compact_seq_seq = None
         self.compact_seq_map = None
+        # the number of characters collected by the emitter before writing to the
+        # stream, None for the default of Emitter.write_buffer_size
+        self.write_buffer_size: Union[int, None] = None
         self.sort_base_mapping_type_on_output = None  # default: sort
+        # dump objects that occur more than once in full each time, instead of using an
+        # anchor and aliases, this does not keep the dumped objects alive
+        self.no_aliases = False
 
         self.top_level_colon_align = None
         self.prefix_colon = None
         self._version: Optional[Any] = None
         self.preserve_quotes: Optional[bool] = None
         self.allow_duplicate_keys = False  # duplicate keys in map, set
+        # record the line and column of every key, value and item on round-trip load,
+        # setting this to False saves memory, .lc.line/.lc.col are still set
+        self.key_line_col = True
         self.encoding = 'utf-8'
         self.explicit_start: Union[bool, None] = None
         self.explicit_end: Union[bool, None] = None
@@ -220,45 +356,42 @@ class YAML:
 
     @property
     def parser(self) -> Any:
-        attr = '_' + sys._getframe().f_code.co_name
-        if not hasattr(self, attr):
-            if self.Parser is not CParser:
-                setattr(self, attr, self.Parser(loader=self))
-            else:
-                if getattr(self, '_stream', None) is None:
-                    # wait for the stream
-                    return None
-                else:
-                    # if not hasattr(self._stream, 'read') and hasattr(self._stream, 'open'):
-                    #     # pathlib.Path() instance
-                    #     setattr(self, attr, CParser(self._stream))
-                    # else:
-                    setattr(self, attr, CParser(self._stream))
-                    # self._parser = self._composer = self
-                    # nprint('scanner', self.loader.scanner)
-
-        return getattr(self, attr)
+        try:
+            return self._parser  # type: ignore
+        except AttributeError:
+            pass
+        if self.Parser is not CParser:
+            self._parser = self.Parser(loader=self)
+        elif getattr(self, '_stream', None) is None:
+            # wait for the stream
+            return None
+        else:
+            self._parser = CParser(self._stream)
+        return self._parser
 
     @property
     def composer(self) -> Any:
-        attr = '_' + sys._getframe().f_code.co_name
-        if not hasattr(self, attr):
-            setattr(self, attr, self.Composer(loader=self))
-        return getattr(self, attr)
+        try:
+            return self._composer  # type: ignore
+        except AttributeError:
+            self._composer = self.Composer(loader=self)
+            return self._composer
 
     @property
     def constructor(self) -> Any:
-        attr = '_' + sys._getframe().f_code.co_name
-        if not hasattr(self, attr):
-            if self.Constructor is None:
-                if 'full' in self.typ:
-                    raise YAMLError(
-                        "\nyou can only use yaml=YAML(typ='full') for dumping\n",  # NOQA
-                    )
-            cnst = self.Constructor(preserve_quotes=self.preserve_quotes, loader=self)  # type: ignore # NOQA
-            cnst.allow_duplicate_keys = self.allow_duplicate_keys
-            setattr(self, attr, cnst)
-        return getattr(self, attr)
+        try:
+            return self._constructor  # type: ignore
+        except AttributeError:
+            pass
+        if self.Constructor is None:
+            if 'full' in self.typ:
+                raise YAMLError(
+                    "\nyou can only use yaml=YAML(typ='full') for dumping\n",  # NOQA
+                )
+        cnst = self.Constructor(preserve_quotes=self.preserve_quotes, loader=self)  # type: ignore # NOQA
+        cnst.allow_duplicate_keys = self.allow_duplicate_keys
+        self._constructor = cnst
+        return cnst
 
     @property
     def resolver(self) -> Any:
@@ -272,70 +405,70 @@ class YAML:
 
     @property
     def emitter(self) -> Any:
-        attr = '_' + sys._getframe().f_code.co_name
-        if not hasattr(self, attr):
-            if self.Emitter is not CEmitter:
-                _emitter = self.Emitter(
-                    None,
-                    canonical=self.canonical,
-                    indent=self.old_indent,
-                    width=self.width,
-                    allow_unicode=self.allow_unicode,
-                    line_break=self.line_break,
-                    prefix_colon=self.prefix_colon,
-                    brace_single_entry_mapping_in_flow_sequence=self.brace_single_entry_mapping_in_flow_sequence,  # NOQA
-                    dumper=self,
-                )
-                setattr(self, attr, _emitter)
-                if self.map_indent is not None:
-                    _emitter.best_map_indent = self.map_indent
-                if self.sequence_indent is not None:
-                    _emitter.best_sequence_indent = self.sequence_indent
-                if self.sequence_dash_offset is not None:
-                    _emitter.sequence_dash_offset = self.sequence_dash_offset
-                    # _emitter.block_seq_indent = self.sequence_dash_offset
-                if self.compact_seq_seq is not None:
-                    _emitter.compact_seq_seq = self.compact_seq_seq
-                if self.compact_seq_map is not None:
-                    _emitter.compact_seq_map = self.compact_seq_map
-            else:
-                if getattr(self, '_stream', None) is None:
-                    # wait for the stream
-                    return None
-                return None
-        return getattr(self, attr)
+        try:
+            return self._emitter  # type: ignore
+        except AttributeError:
+            pass
+        if self.Emitter is CEmitter:
+            # wait for the stream
+            return None
+        _emitter = self.Emitter(
+            None,
+            canonical=self.canonical,
+            indent=self.old_indent,
+            width=self.width,
+            allow_unicode=self.allow_unicode,
+            line_break=self.line_break,
+            prefix_colon=self.prefix_colon,
+            brace_single_entry_mapping_in_flow_sequence=self.brace_single_entry_mapping_in_flow_sequence,  # NOQA
+            dumper=self,
+        )
+        self._emitter = _emitter
+        if self.map_indent is not None:
+            _emitter.best_map_indent = self.map_indent
+        if self.sequence_indent is not None:
+            _emitter.best_sequence_indent = self.sequence_indent
+        if self.sequence_dash_offset is not None:
+            _emitter.sequence_dash_offset = self.sequence_dash_offset
+            # _emitter.block_seq_indent = self.sequence_dash_offset
+        if self.compact_seq_seq is not None:
+            _emitter.compact_seq_seq = self.compact_seq_seq
+        if self.compact_seq_map is not None:
+            _emitter.compact_seq_map = self.compact_seq_map
+        if self.write_buffer_size is not None:
+            _emitter.write_buffer_size = self.write_buffer_size
+        return _emitter
 
     @property
     def serializer(self) -> Any:
-        attr = '_' + sys._getframe().f_code.co_name
-        if not hasattr(self, attr):
-            setattr(
-                self,
-                attr,
-                self.Serializer(
-                    encoding=self.encoding,
-                    explicit_start=self.explicit_start,
-                    explicit_end=self.explicit_end,
-                    version=self.version,
-                    tags=self.tags,
-                    dumper=self,
-                ),
+        try:
+            return self._serializer  # type: ignore
+        except AttributeError:
+            self._serializer = self.Serializer(
+                encoding=self.encoding,
+                explicit_start=self.explicit_start,
+                explicit_end=self.explicit_end,
+                version=self.version,
+                tags=self.tags,
+                dumper=self,
             )
-        return getattr(self, attr)
+            return self._serializer
 
     @property
     def representer(self) -> Any:
-        attr = '_' + sys._getframe().f_code.co_name
-        if not hasattr(self, attr):
-            repres = self.Representer(
-                default_style=self.default_style,
-                default_flow_style=self.default_flow_style,
-                dumper=self,
-            )
-            if self.sort_base_mapping_type_on_output is not None:
-                repres.sort_base_mapping_type_on_output = self.sort_base_mapping_type_on_output
-            setattr(self, attr, repres)
-        return getattr(self, attr)
+        try:
+            return self._representer  # type: ignore
+        except AttributeError:
+            pass
+        repres = self.Representer(
+            default_style=self.default_style,
+            default_flow_style=self.default_flow_style,
+            dumper=self,
+        )
+        if self.sort_base_mapping_type_on_output is not None:
+            repres.sort_base_mapping_type_on_output = self.sort_base_mapping_type_on_output
+        self._representer = repres
+        return repres
 
     def scan(self, stream: StreamTextType) -> Any:
         """
@@ -343,7 +476,7 @@ class YAML:
         """
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
-            with stream.open('rb') as fp:
+            with self.open_path(stream) as fp:
                 return self.scan(fp)
         self.doc_infos.append(DocInfo(requested_version=version(self.version)))
         self.tags = {}
@@ -365,7 +498,7 @@ class YAML:
         """
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
-            with stream.open('rb') as fp:
+            with self.open_path(stream) as fp:
                 return self.parse(fp)
         self.doc_infos.append(DocInfo(requested_version=version(self.version)))
         self.tags = {}
@@ -388,7 +521,7 @@ class YAML:
         """
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
-            with stream.open('rb') as fp:
+            with self.open_path(stream) as fp:
                 return self.compose(fp)
         self.doc_infos.append(DocInfo(requested_version=version(self.version)))
         self.tags = {}
@@ -445,13 +578,27 @@ class YAML:
         """
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
-            with stream.open('rb') as fp:
+            with self.open_path(stream) as fp:
                 return self.load(fp)
+        if self.load_cache is not None:
+            if hasattr(stream, 'read'):
+                stream = stream.read()
+            key = self.load_cache.key('load', stream, configuration_key(self))
+            try:
+                data, state = self.load_cache.get(key)
+            except KeyError:
+                pass
+            else:
+                self.set_load_state(state)
+                return data
         self.doc_infos.append(DocInfo(requested_version=version(self.version)))
         self.tags = {}
         constructor, parser = self.get_constructor_parser(stream)
         try:
-            return constructor.get_single_data()
+            if self.use_direct_construction(constructor, parser):
+                data = constructor.get_single_data_direct()
+            else:
+                data = constructor.get_single_data()
         finally:
             parser.dispose()
             for comp in ('reader', 'scanner'):
@@ -459,25 +606,70 @@ class YAML:
                     getattr(getattr(self, '_' + comp), f'reset_{comp}')()
                 except AttributeError:
                     pass
+        if self.load_cache is not None:
+            self.load_cache.put(key, (data, self.get_load_state()))
+        return data
 
-    def load_all(self, stream: Union[Path, StreamTextType]) -> Any:  # *, skip=None):
+    def load_all(
+        self, stream: Union[Path, StreamTextType], *, skip: Any = None, select: Any = None,
+    ) -> Any:
+        """
+        Load the documents in stream one at a time. Only the DocInfo of the current
+        document is kept in .doc_infos, and the state for a document is dropped before
+        the next document is loaded.
+        skip, select: a document index, a collection of indices, or a function called
+            with the index and the DocumentStartEvent of a document, to determine the
+            documents to skip resp. to load. Documents that are not loaded are parsed,
+            but not composed or constructed.
+        """
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
-            with stream.open('r') as fp:
-                for d in self.load_all(fp):
+            with self.open_path(stream, 'r') as fp:
+                for d in self.load_all(fp, skip=skip, select=select):
                     yield d
                 return
-        # if skip is None:
-        #     skip = []
-        # elif isinstance(skip, int):
-        #     skip = [skip]
+        documents: Optional[List[Any]] = None
+        if self.load_cache is not None and not (callable(skip) or callable(select)):
+            # a function can only be part of the key by its id(), which is not stable
+            if hasattr(stream, 'read'):
+                stream = stream.read()
+            key = self.load_cache.key(
+                'load_all', stream, configuration_key(self), skip, select,
+            )
+            try:
+                documents, state = self.load_cache.get(key)
+            except KeyError:
+                documents = []
+            else:
+                self.set_load_state(state)
+                yield from documents  # type: ignore
+                return
+        skip_document = document_filter(skip, select)
         self.doc_infos.append(DocInfo(requested_version=version(self.version)))
         self.tags = {}
         constructor, parser = self.get_constructor_parser(stream)
+        if self.use_direct_construction(constructor, parser):
+            get_data = constructor.get_data_direct
+        else:
+            get_data = constructor.get_data
+        pure = isinstance(parser, ruamel.yaml.parser.Parser)
         try:
+            index = 0
             while constructor.check_data():
-                yield constructor.get_data()
-                self.doc_infos.append(DocInfo(requested_version=version(self.version)))
+                if skip_document is not None and skip_document(index, parser.peek_event()):
+                    # drop the events of the document
+                    while not parser.check_event(DocumentEndEvent):
+                        parser.get_event()
+                    parser.get_event()
+                else:
+                    data = get_data()
+                    if documents is not None:
+                        documents.append(data)
+                    yield data
+                index += 1
+                self.doc_infos[-1] = DocInfo(requested_version=version(self.version))
+                if pure:
+                    self.reader.split_line_index()
         finally:
             parser.dispose()
             for comp in ('reader', 'scanner'):
@@ -485,6 +677,296 @@ class YAML:
                     getattr(getattr(self, '_' + comp), f'reset_{comp}')()
                 except AttributeError:
                     pass
+        if documents is not None:
+            self.load_cache.put(key, (documents, self.get_load_state()))
+
+    @contextmanager
+    def open_path(self, path: Any, mode: str = 'rb') -> Iterator[Any]:
+        """
+        open path (a pathlib.Path()) for loading, in mode 'rb' or 'r'. A file of at
+        least .mmap_threshold bytes is memory mapped, and read using a BufferStream,
+        so that the pages read don't stay resident
+        """
+        with path.open(mode) as fp:
+            try:
+                size = os.fstat(fp.fileno()).st_size
+            except (AttributeError, OSError, ValueError):  # e.g. not a regular file
+                size = -1
+            if self.mmap_threshold is None or size < max(self.mmap_threshold, 1):
+                yield fp
+                return
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield ruamel.yaml.reader.BufferStream(buffer, name=fp.name)
+
+    def get_load_state(self) -> Any:
+        """the state of loading kept in the instance, stored with the data cached"""
+        return self.doc_infos[-1], self.version, self.tags
+
+    def set_load_state(self, state: Any) -> None:
+        doc_info, self.version, self.tags = state
+        self.doc_infos.append(doc_info)
+
+    def load_all_parallel(
+        self, stream: Union[Path, StreamTextType], workers: Optional[int] = None,
+    ) -> Any:
+        """
+        Load the documents in stream using a pool of worker processes, yielding the
+        documents in order. The text is split on the document markers (at the start of
+        a line) into slices of several documents, which are loaded independently, so
+        anchors and %TAG directives cannot be used across documents (as in the
+        YAML specification). The worker processes get a copy of this instance, so
+        constructors added to the constructor class at runtime are only available if
+        the processes are started by forking.
+        workers: the number of processes, default the number of CPUs
+        """
+        data: Any
+        if not hasattr(stream, 'read') and hasattr(stream, 'open'):
+            # pathlib.Path() instance
+            with stream.open('rb') as fp:
+                data = fp.read()
+        elif hasattr(stream, 'read'):
+            data = stream.read()
+        else:
+            data = stream
+        text: str
+        if isinstance(data, bytes):
+            if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                text = data.decode('utf-16')
+            else:
+                text = data.decode('utf-8')
+        else:
+            text = data
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1:
+            yield from self.load_all(text)
+            return
+        starts = document_slices(text)
+        # combine the slices into a few times as many batches as there are workers
+        target = len(text) // (workers * 4) + 1
+        batches: List[Any] = []
+        line = 0
+        batch_start = 0
+        for pos in starts[1:] + [len(text)]:
+            if pos > batch_start and (pos - batch_start >= target or pos == len(text)):
+                batches.append((text[batch_start:pos], line))
+                line += line_count(text, batch_start, pos)
+                batch_start = pos
+        template = self.clone()
+        if len(batches) == 1:
+            yield from load_document_slice(template, *batches[0])
+            return
+        with ProcessPoolExecutor(workers) as executor:
+            for documents in executor.map(
+                load_document_slice,
+                [template] * len(batches),
+                *zip(*batches),
+            ):
+                yield from documents
+
+    def load_many(
+        self, paths: Any, workers: Optional[int] = None, *, cache: Any = None,
+    ) -> List[LoadResult]:
+        """
+        Load the (single document) files in paths concurrently, returning a LoadResult
+        for each path in the same order. An error in loading a file is stored in its
+        LoadResult and does not stop the loading of the other files.
+        The pure Python parser is run in worker processes (see load_all_parallel() for
+        the restrictions), the C based parser in threads.
+        workers: the number of processes/threads, default the number of CPUs
+        cache: a LoadCache or a directory for one. Files with the same path,
+            modification time and size as when they were last loaded, with the same
+            configuration, are not loaded again but the data is taken from the cache
+        """
+        results = [LoadResult(Path(path)) for path in paths]
+        if cache is not None and not isinstance(cache, LoadCache):
+            cache = LoadCache(cache)
+        keys: Dict[int, str] = {}
+        todo: List[int] = []
+        for idx, result in enumerate(results):
+            if cache is not None:
+                try:
+                    stat = result.path.stat()
+                except OSError as e:
+                    result.error = e
+                    continue
+                key = keys[idx] = cache.key(
+                    str(result.path.resolve()),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    configuration_key(self),
+                )
+                try:
+                    result.data = cache.get(key)
+                    continue
+                except KeyError:
+                    pass
+            todo.append(idx)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        template = self.clone()
+        todo_paths = [results[idx].path for idx in todo]
+        if workers == 1 or len(todo) <= 1:
+            loaded: Any = (load_path(template, path) for path in todo_paths)
+        elif self.Parser is CParser:
+            pool = YAMLPool(template, size=workers)
+            with ThreadPoolExecutor(workers) as executor:
+                loaded = list(executor.map(lambda path: load_path(pool, path), todo_paths))
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                loaded = list(
+                    executor.map(
+                        load_path,
+                        [template] * len(todo),
+                        todo_paths,
+                        chunksize=len(todo) // (workers * 4) + 1,
+                    ),
+                )
+        for idx, (data, error) in zip(todo, loaded):
+            result = results[idx]
+            result.data = data
+            result.error = error
+            if cache is not None and error is None:
+                cache.put(keys[idx], data)
+        return results
+
+    def load_edit(self, data: Any, text: str, start: int, end: int, replacement: str) -> Any:
+        """
+        Return the data for text with text[start:end] replaced by replacement, data being
+        the result of loading text with this (round-trip) instance.
+        If the edit is within the lines of one entry of a top level block mapping, only
+        the text of that entry and the next one is loaded (the comments after an entry
+        can be attached to the next key), and the resulting entries replace these two
+        in data, which is updated in place and returned. The line numbers of the
+        following entries are adjusted.
+        Otherwise, e.g. for an edit that changes the indentation of the first line of
+        an entry, or in text with directives, document markers or anchors, the new text
+        is loaded completely.
+        """
+        new_text = text[:start] + replacement + text[end:]
+        entries = self.edited_entries(data, text, start, end)
+        if entries is None:
+            return self.load(new_text)
+        index, count, line, entries_start, entries_end = entries
+        entries_text = text[entries_start:start] + replacement + text[end:entries_end]
+        if entries_text and (
+            entries_text[0] in ' \t#\n' or not entries_text.endswith('\n')
+            or '&' in entries_text
+        ):
+            # the first line is not (only) a top level key, or it could end up in the
+            # following entries
+            return self.load(new_text)
+        yaml = self.clone()
+        yaml.Reader = ruamel.yaml.reader.Reader
+        yaml.reader.start_at_line(line)
+        try:
+            loaded = yaml.load(entries_text)
+        except YAMLError:
+            return self.load(new_text)
+        if loaded is None:
+            loaded = CommentedMap()
+        keys = list(data)
+        old_keys = keys[index : index + count]
+        if not isinstance(loaded, CommentedMap) or any(
+            key in data and key not in old_keys for key in loaded
+        ):
+            return self.load(new_text)
+        if len(loaded) < count or (index + count < len(keys) and loaded.ca.end):
+            # an entry was merged with, or turned into a comment attached to, what
+            # follows
+            return self.load(new_text)
+        if len(loaded) and loaded[next(reversed(loaded))] is None:
+            # the position of the empty value depends on what follows it, also for the
+            # last entry where the comments at the end of the document follow it
+            return self.load(new_text)
+        if any(
+            token.start_mark.line < line
+            for token in comment_tokens(data.ca.items.get(old_keys[0]))
+        ):
+            # comments from before the first line that are attached to the first key
+            return self.load(new_text)
+        for key in old_keys:
+            del data[key]
+            data.ca.items.pop(key, None)
+            data.lc.data.pop(key, None)
+        for key, value in loaded.items():
+            data[key] = value
+            if key in loaded.ca.items:
+                data.ca.items[key] = loaded.ca.items[key]
+            data.lc.data[key] = loaded.lc.data[key]
+        if index + count == len(keys):
+            data.ca.end = loaded.ca.end
+            if data.ca.comment is None:
+                # the comments at the end are only dumped if this is set
+                data.ca.comment = loaded.ca.comment
+            else:
+                # dumping appends the comments at the end to this, and dumps those
+                data.ca.comment[2:] = (loaded.ca.comment or [])[2:]
+        delta = replacement.count('\n') - text.count('\n', start, end)
+        seen: Set[int] = set()
+        for key in keys[index + count :]:
+            data.move_to_end(key)
+            if delta:
+                key_line_col = data.lc.data[key]
+                key_line_col[0] += delta
+                key_line_col[2] += delta
+                shift_comment_lines(data.ca.items.get(key), delta, seen)
+                shift_line_col(data[key], delta, seen)
+        return data
+
+    def edited_entries(self, data: Any, text: str, start: int, end: int) -> Any:
+        """
+        the index of the entry of the top level mapping data that contains
+        text[start:end], the number of entries to load again (that entry and the next
+        one, if any), their first line and their start and end in text. None if
+        there is no such entry, or it cannot be determined
+        """
+        if (
+            not isinstance(data, CommentedMap)
+            or getattr(data, LineCol.attrib, None) is None
+            or data.lc.data is None
+            or len(data.lc.data) != len(data)
+            or getattr(data, merge_attrib, None)
+            or '\r' in text
+            or _directive_or_marker.search(text)
+        ):
+            return None
+        line_cols = [data.lc.data[key] for key in data]
+        lines = [line_col[0] for line_col in line_cols]
+        if any(line_col[1] != 0 for line_col in line_cols) or lines != sorted(lines):
+            return None
+        line = text.count('\n', 0, start)
+        index = bisect_right(lines, line) - 1
+        if index < 0:
+            return None
+        # the start of the line of start, then go back to the first line of the entry
+        entries_start = text.rfind('\n', 0, start) + 1
+        for _ in range(line - lines[index]):
+            entries_start = text.rfind('\n', 0, entries_start - 1) + 1
+        # the end of the entry, and of the next one
+        ends = []
+        pos = start - 1
+        current = line
+        for next_line in lines[index + 1 : index + 3]:
+            for _ in range(next_line - current):
+                pos = text.index('\n', pos + 1)
+            ends.append(pos + 1)
+            current = next_line
+        ends.extend([len(text)] * (2 - len(ends)))
+        count = min(2, len(lines) - index)
+        entries_end = ends[1]
+        # the comments at the end of the next entry can be attached to the key after it,
+        # so these cannot be changed
+        if end > ends[0] or '&' in text[entries_start:entries_end]:
+            return None
+        return index, count, lines[index], entries_start, entries_end
+
+    def use_direct_construction(self, constructor: Any, parser: Any) -> bool:
+        return (
+            self.direct_construction
+            and isinstance(constructor, ruamel.yaml.constructor.SafeConstructor)
+            and isinstance(parser, ruamel.yaml.parser.Parser)
+        )
 
     def get_constructor_parser(self, stream: StreamTextType) -> Any:
         """
@@ -533,12 +1015,14 @@ class YAML:
                         selfx._parser = selfx._composer = selfx
                         self.Constructor.__init__(selfx, loader=selfx)
                         selfx.allow_duplicate_keys = self.allow_duplicate_keys
+                        selfx.key_line_col = self.key_line_col
                         rslvr.__init__(selfx, version=version, loadumper=selfx)
 
                 self._stream = stream
                 loader = XLoader(stream)
                 self._scanner = loader
                 return loader, loader
+        self.constructor.key_line_col = self.key_line_col
         return self.constructor, self.parser
 
     def emit(self, events: Any, stream: Any) -> None:
@@ -668,6 +1152,7 @@ class YAML:
             self.emitter.top_level_colon_align = tlca
             if self.scalar_after_indicator is not None:
                 self.emitter.scalar_after_indicator = self.scalar_after_indicator
+            self.representer.no_aliases = self.no_aliases
             return self.serializer, self.representer, self.emitter
         if self.Serializer is not None:
             # cannot set serializer with CEmitter
@@ -676,6 +1161,7 @@ class YAML:
             self.emitter.top_level_colon_align = tlca
             if self.scalar_after_indicator is not None:
                 self.emitter.scalar_after_indicator = self.scalar_after_indicator
+            self.representer.no_aliases = self.no_aliases
             return self.serializer, self.representer, self.emitter
         # C routines
 
@@ -743,6 +1229,7 @@ class YAML:
             tags=self.tags,
         )
         self._emitter = self._serializer = dumper
+        dumper.no_aliases = self.no_aliases
         return dumper, dumper, dumper
 
     # basic types
@@ -765,15 +1252,65 @@ class YAML:
         no plug-ins will be found. If any are packaged, you know which file that are
         and you can explicitly provide it during instantiation:
             yaml = ruamel.yaml.YAML(plug_ins=['ruamel/yaml/jinja2/__plug_in__'])
+        The search is done once per process, use YAML.refresh_plug_ins() to search again
+        (e.g. after installing a plug-in).
         """
-        try:
-            bd = os.path.dirname(__file__)
-        except NameError:
-            return []
-        gpbd = os.path.dirname(os.path.dirname(bd))
-        res = [x.replace(gpbd, "")[1:-3] for x in glob.glob(bd + '/*/__plug_in__.py')]
+        if YAML._official_plug_ins is None:
+            try:
+                bd = os.path.dirname(__file__)
+            except NameError:
+                YAML._official_plug_ins = []
+            else:
+                gpbd = os.path.dirname(os.path.dirname(bd))
+                YAML._official_plug_ins = [
+                    x.replace(gpbd, "")[1:-3] for x in glob.glob(bd + '/*/__plug_in__.py')
+                ]
+        return list(YAML._official_plug_ins)
+
+    @staticmethod
+    def refresh_plug_ins() -> None:
+        """forget the official plug-ins found, the next YAML() searches for them again"""
+        YAML._official_plug_ins = None
+
+    # attributes that clone() does not copy: the components and the state of loading
+    # and dumping
+    clone_skip = frozenset(
+        (
+            '_reader', '_scanner', '_parser', '_composer', '_constructor', '_resolver',
+            '_emitter', '_serializer', '_representer', '_stream', '_output',
+            '_context_manager', '_tags', 'doc_infos',
+        ),
+    )
+
+    def clone(self) -> Any:
+        """
+        return a new instance with the configuration of this one: the attribute
+        values are shared, except for the typ and plug_ins lists. The components
+        (reader, parser, emitter, etc.) are not copied, the clone creates its own
+        when first needed.
+        This is much cheaper than YAML() followed by configuring the instance, so a
+        configured instance can be used as template for short-lived instances.
+        """
+        res = self.__class__.__new__(self.__class__)
+        attrs = res.__dict__
+        attrs.update(self.__dict__)
+        for key in self.clone_skip.intersection(attrs):
+            del attrs[key]
+        res.typ = self.typ[:]
+        res.plug_ins = self.plug_ins[:]
+        res._output = None
+        res._context_manager = None
+        res._tags = None
+        res.doc_infos = []
         return res
 
+    def pool(self, size: int = 8) -> Any:
+        """
+        return a YAMLPool with the configuration of this instance, for loading and
+        dumping from multiple threads
+        """
+        return YAMLPool(self, size=size)
+
     def register_class(self, cls: Any) -> Any:
         """
         register a class for dumping/loading
@@ -984,6 +1521,94 @@ class YAMLContextManager:
     #             pass
 
 
+class YAMLPool:
+    """
+    A YAML instance keeps the state of loading/dumping in its components and cannot be
+    used from multiple threads at the same time. The pool hands out instances, cloned
+    from the YAML instance it is created with, for the exclusive use of one load() or
+    dump() call, or of a with pool.instance() block.
+    Instances are created when needed, up to size, after that a call waits until an
+    instance is returned to the pool. The components of an instance are reused, their
+    state being reset at the end of loading/dumping, and the state kept in the instance
+    (doc_infos, tags and version) is reset when it is returned to the pool. An instance
+    on which loading or dumping raised an exception is dropped instead.
+    """
+
+    def __init__(self, yaml: Any, size: int = 8) -> None:
+        if size < 1:
+            raise ValueError(f'pool size should be at least 1, got {size!r}')
+        self._template = yaml.clone()
+        self.size = size
+        self._idle: List[Any] = []
+        self._count = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> Any:
+        """get an instance for exclusive use, waits if size instances are in use"""
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._condition.wait()
+        try:
+            return self._template.clone()
+        except Exception:
+            self.discard(None)
+            raise
+
+    def release(self, yaml: Any) -> None:
+        """return an acquired instance to the pool"""
+        self.reset(yaml)
+        with self._condition:
+            self._idle.append(yaml)
+            self._condition.notify()
+
+    def reset(self, yaml: Any) -> None:
+        """
+        drop the state that loading and dumping keep in the instance, the DocInfo of
+        every document loaded, the tags and the version of the last document
+        """
+        yaml.doc_infos = []
+        yaml._tags = None
+        yaml._version = self._template._version
+
+    def discard(self, yaml: Any) -> None:
+        """drop an acquired instance, e.g. when it is in an unknown state"""
+        with self._condition:
+            self._count -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def instance(self) -> Any:
+        yaml = self.acquire()
+        try:
+            yield yaml
+        except BaseException:
+            self.discard(yaml)
+            raise
+        self.release(yaml)
+
+    def load(self, stream: Union[Path, StreamTextType]) -> Any:
+        with self.instance() as yaml:
+            return yaml.load(stream)
+
+    def load_all(self, stream: Union[Path, StreamTextType], **kw: Any) -> Any:
+        """load all documents, returned as a list as the instance is in use until done"""
+        with self.instance() as yaml:
+            return list(yaml.load_all(stream, **kw))
+
+    def dump(self, data: Any, stream: Any = None, *, transform: Any = None) -> Any:
+        with self.instance() as yaml:
+            return yaml.dump(data, stream, transform=transform)
+
+    def dump_all(self, documents: Any, stream: Any, *, transform: Any = None) -> Any:
+        with self.instance() as yaml:
+            return yaml.dump_all(documents, stream, transform=transform)
+
+
 def yaml_object(yml: Any) -> Any:
     """ decorator for classes that needs to dump/load objects
     The tag for such objects is taken from the class attribute yaml_tag (or the
@@ -21,7 +21,12 @@ class Node:
         anchor: Any = None,
     ) -> None:
         # you can still get a string from the serializer
-        self.ctag = tag if isinstance(tag, Tag) else Tag(suffix=tag)
+        if isinstance(tag, Tag):
+            self.ctag = tag
+        elif tag is None:
+            self.ctag = Tag(suffix=None)
+        else:
+            self.ctag = Tag.intern(tag)
         self.value = value
         self.start_mark = start_mark
         self.end_mark = end_mark
@@ -35,7 +40,7 @@ class Node:
     @tag.setter
     def tag(self, val: Any) -> None:
         if isinstance(val, str):
-            val = Tag(suffix=val)
+            val = Tag.intern(val)
         self.ctag = val
 
     def __repr__(self) -> Any:
@@ -87,9 +92,13 @@ class ScalarNode(Node):
       ' -> single quoted
       | -> literal style
       > -> folding style
+
+    resolved is the tag the plain value is known to resolve to, set by representers
+    that produce values of a fixed form, so the serializer does not have to match it
+    against the implicit resolvers
     """
 
-    __slots__ = ('style',)
+    __slots__ = 'style', 'resolved'
     id = 'scalar'
 
     def __init__(
@@ -104,6 +113,7 @@ class ScalarNode(Node):
     ) -> None:
         Node.__init__(self, tag, value, start_mark, end_mark, comment=comment, anchor=anchor)
         self.style = style
+        self.resolved: Any = None
 
 
 class CollectionNode(Node):
@@ -410,6 +410,7 @@ class Parser:
                     f'found undefined tag handle {tag.handle!r}',
                     tag_mark,
                 )
+            tag = Tag.intern(tag)
         if start_mark is None:
             start_mark = end_mark = self.scanner.peek_token().start_mark
         event = None
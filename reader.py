@@ -6,9 +6,10 @@ from __future__ import annotations
 #
 # We define two classes here.
 #
-#   Mark(source, line, column)
+#   LazyMark(line_index, index)
 # It's just a record and its only use is producing nice error messages.
-# Parser does not use it for any other purposes.
+# Parser does not use it for any other purposes. The line and column are
+# determined from the index only when needed.
 #
 #   Reader(source, data)
 # Reader determines the encoding of `data` and converts it to unicode.
@@ -19,17 +20,24 @@ from __future__ import annotations
 #   reader.index - the number of the current character.
 #   reader.line, stream.column - the line and the column of the current
 #      character.
+#
+# The reader never walks the consumed characters one by one. Moving forward
+# only changes an integer offset, the line and column are derived, when
+# asked for, from a table with the offsets at which lines start (filled once
+# for every chunk of decoded data) using bisect.
 
 import codecs
+import mmap
+from array import array
 
-from ruamel.yaml.error import YAMLError, FileMark, StringMark, YAMLStreamError
+from ruamel.yaml.error import YAMLError, LazyMark, LineIndex, YAMLStreamError
 from ruamel.yaml.util import RegExp
 
 if False:  # MYPY
     from typing import Any, Dict, Optional, List, Union, Text, Tuple, Optional  # NOQA
 # from ruamel.yaml.compat import StreamTextType  # NOQA
 
-__all__ = ['Reader', 'ReaderError']
+__all__ = ['Reader', 'ReaderError', 'BufferStream']
 
 
 class ReaderError(YAMLError):
@@ -56,6 +64,41 @@ class ReaderError(YAMLError):
             )
 
 
+class BufferStream:
+    """
+    A file-like object reading the bytes of a memoryview, bytearray or mmap.mmap one
+    window at a time, so that the Reader doesn't need a copy of all of them. For a
+    memory map the pages read are released, keeping the resident memory low
+    for large files.
+    """
+
+    # the read size used by the Reader, unless set on the YAML instance
+    read_size = 1 << 20
+
+    def __init__(self, buffer: Any, name: Text = '<buffer>') -> None:
+        if isinstance(buffer, memoryview) and buffer.format != 'B':
+            buffer = buffer.cast('B')
+        self.buffer = buffer
+        self.name = name
+        self.pos = 0
+        # up to where the pages of a memory map have been released
+        self._released = 0
+
+    def read(self, size: int = -1) -> bytes:
+        start = self.pos
+        end = len(self.buffer) if size < 0 else min(start + size, len(self.buffer))
+        res = bytes(self.buffer[start:end])
+        self.pos = end
+        if isinstance(self.buffer, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'):
+            release = end - end % mmap.PAGESIZE
+            if release > self._released:
+                self.buffer.madvise(
+                    mmap.MADV_DONTNEED, self._released, release - self._released,
+                )
+                self._released = release
+        return res
+
+
 class Reader:
     # Reader:
     # - determines the data encoding and converts it to a unicode string,
@@ -64,11 +107,25 @@ class Reader:
 
     # Reader accepts
     #  - a `bytes` object,
+    #  - a `memoryview`, `bytearray` or `mmap.mmap` object (read using BufferStream),
     #  - a `str` object,
     #  - a file-like object with its `read` method returning `str`,
     #  - a file-like object with its `read` method returning `unicode`.
 
-    # Yeah, it's ugly and slow.
+    # The decoded text is kept in .buffer, .pointer is the position in that
+    # buffer and ._offset the index of the first character of the buffer
+    # in the stream (only non-zero when reading from a file-like object, as
+    # consumed text is discarded on refilling the buffer).
+
+    # line breaks that increment the line number, a '\r' directly followed
+    # by '\n' is counted as part of the '\n' line break
+    _line_break = RegExp('\n|\r(?!\n)')
+
+    # the number of bytes (characters for a text stream) read from a file-like
+    # object at a time, at least as much as is not yet consumed of .buffer is read,
+    # so that a long token doesn't make refilling the buffer quadratic. Can be set
+    # with YAML().read_size, e.g. to 1 MiB for large files on a network file system
+    read_size = 4096
 
     def __init__(self, stream: Any, loader: Any = None) -> None:
         self.loader = loader
@@ -85,10 +142,75 @@ class Reader:
         self.pointer = 0
         self.raw_buffer: Any = None
         self.raw_decode = None
+        # incremental decoder for the bytes read, None for text
+        self._decoder: Any = None
+        self._read_size: Optional[int] = None
+        # check for characters that are not allowed, unless the loader allows them
+        self._check = True
         self.encoding: Optional[Text] = None
-        self.index = 0
-        self.line = 0
-        self.column = 0
+        self._offset = 0
+        # the start of each line and the byte order marks, also used by the marks
+        self.line_index = LineIndex(None, array('q', [0]), array('q'))
+        # position in .buffer up to which the line starts have been collected
+        self._indexed = 0
+
+    @property
+    def index(self) -> int:
+        return self._offset + self.pointer
+
+    @property
+    def line(self) -> int:
+        return self.line_index.line_of(self._offset + self.pointer)
+
+    @property
+    def column(self) -> int:
+        return self.line_index.column_of(self._offset + self.pointer)
+
+    def start_at_line(self, line: int) -> None:
+        """
+        number the lines of the stream, to be set after this, starting at line instead
+        of 0, for a stream that is part of a larger one
+        """
+        self.line_index = LineIndex(None, array('q', [0]), array('q'), first_line=line)
+
+    def split_line_index(self) -> None:
+        """
+        continue with a new LineIndex, starting at the current line. The marks created
+        so far keep the current LineIndex, and once these are gone so are its line
+        starts. Used between documents, so that loading a long stream of documents
+        doesn't need memory for the line starts of all of them. Not done for string
+        streams, as their text is in memory anyway.
+        """
+        if self._stream is None:
+            return
+        old = self.line_index
+        index = self._offset + self.pointer
+        pos = old.line_of(index) - old.first_line
+        new = LineIndex(old.name, old.starts[pos:], array('q'), first_line=old._line)
+        new.boms.extend(bom for bom in old.boms if bom >= new.starts[0])
+        new.indexed = old.indexed
+        self.line_index = new
+
+    def _index_lines(self) -> None:
+        """collect the line starts (and BOMs) for the not yet indexed part of .buffer"""
+        buffer = self.buffer
+        end = len(buffer)
+        if end and buffer[-1] == '\r':
+            end -= 1  # the next chunk might start with '\n'
+        offset = self._offset
+        line_index = self.line_index
+        line_index.starts.extend(
+            offset + m.end() for m in self._line_break.finditer(buffer, self._indexed, end)
+        )
+        pos = buffer.find('\uFEFF', self._indexed, end)
+        while pos >= 0:
+            line_index.boms.append(offset + pos)
+            pos = buffer.find('\uFEFF', pos + 1, end)
+        self._indexed = end
+        line_index.indexed = offset + end
+        if self._stream is None:
+            # a string stream is decoded completely, and its buffer is never trimmed
+            line_index.text = buffer
 
     @property
     def stream(self) -> Any:
@@ -102,12 +224,23 @@ class Reader:
         if val is None:
             return
         self._stream = None
+        if isinstance(val, (memoryview, bytearray, mmap.mmap)):
+            val = BufferStream(val)
+        # the read size set for the loader, or suited to the stream
+        self._read_size = getattr(self.loader, 'read_size', None) or getattr(
+            val, 'read_size', None,
+        )
+        self._check = not getattr(self.loader, 'allow_non_printable', False)
         if isinstance(val, str):
             self.name = '<unicode string>'
-            self.check_printable(val)
+            self.line_index.name = self.name
+            if self._check:
+                self.check_printable(val)
             self.buffer = val + '\0'
+            self._index_lines()
         elif isinstance(val, bytes):
             self.name = '<byte string>'
+            self.line_index.name = self.name
             self.raw_buffer = val
             self.determine_encoding()
         else:
@@ -115,6 +248,7 @@ class Reader:
                 raise YAMLStreamError('stream argument needs to have a read() method')
             self._stream = val
             self.name = getattr(self.stream, 'name', '<file>')
+            self.line_index.name = self.name
             self.eof = False
             self.raw_buffer = None
             self.determine_encoding()
@@ -132,42 +266,17 @@ class Reader:
         return self.buffer[self.pointer : self.pointer + length]
 
     def forward_1_1(self, length: int = 1) -> None:
-        if self.pointer + length + 1 >= len(self.buffer):
-            self.update(length + 1)
-        while length != 0:
-            ch = self.buffer[self.pointer]
-            self.pointer += 1
-            self.index += 1
-            if ch in '\n\x85\u2028\u2029' or (
-                ch == '\r' and self.buffer[self.pointer] != '\n'
-            ):
-                self.line += 1
-                self.column = 0
-            elif ch != '\uFEFF':
-                self.column += 1
-            length -= 1
+        # kept for backwards compatibility, line breaks are determined when the
+        # buffer is filled, and no longer while moving forward
+        self.forward(length)
 
     def forward(self, length: int = 1) -> None:
         if self.pointer + length + 1 >= len(self.buffer):
             self.update(length + 1)
-        while length != 0:
-            ch = self.buffer[self.pointer]
-            self.pointer += 1
-            self.index += 1
-            if ch == '\n' or (ch == '\r' and self.buffer[self.pointer] != '\n'):
-                self.line += 1
-                self.column = 0
-            elif ch != '\uFEFF':
-                self.column += 1
-            length -= 1
+        self.pointer += length
 
     def get_mark(self) -> Any:
-        if self.stream is None:
-            return StringMark(
-                self.name, self.index, self.line, self.column, self.buffer, self.pointer,
-            )
-        else:
-            return FileMark(self.name, self.index, self.line, self.column)
+        return LazyMark(self.line_index, self._offset + self.pointer)
 
     def determine_encoding(self) -> None:
         while not self.eof and (self.raw_buffer is None or len(self.raw_buffer) < 2):
@@ -182,6 +291,7 @@ class Reader:
             else:
                 self.raw_decode = codecs.utf_8_decode  # type: ignore
                 self.encoding = 'utf-8'
+            self._decoder = codecs.getincrementaldecoder(self.encoding)('strict')
         self.update(1)
 
     NON_PRINTABLE = RegExp(
@@ -199,6 +309,35 @@ class Reader:
         non_printable = non_printables[:1]
         return ascii_bytes.index(non_printable), non_printable.decode('ascii')
 
+    # the bytes that can be part of the UTF-8 encoding of an allowed character, i.e.
+    # all but the ASCII control characters, to check raw bytes using translate()
+    _printable_utf8 = bytes(
+        byte
+        for byte in range(256)
+        if byte in b'\x09\x0A\x0D' or 0x20 <= byte <= 0x7E or byte >= 0x80
+    )
+    # the not allowed multi-byte characters: the C1 control characters except NEL and
+    # U+FFFE/U+FFFF (surrogates are rejected by the decoder)
+    _non_printable_c1 = RegExp(b'\xC2[\x80-\x84\x86-\x9F]')
+    _non_printable_ff = RegExp(b'\xEF\xBF[\xBE\xBF]')
+
+    @classmethod
+    def is_printable_utf8(cls, data: bytes) -> bool:
+        """
+        check UTF-8 encoded data for characters that are not allowed without decoding
+        it: a table lookup per byte for the ASCII control characters, and (only
+        if their lead byte occurs) a search for the few multi-byte characters
+        """
+        if data.translate(None, cls._printable_utf8):
+            return False
+        if data.isascii():
+            return True
+        if b'\xC2' in data and cls._non_printable_c1.search(data):
+            return False
+        if b'\xEF' in data and cls._non_printable_ff.search(data):
+            return False
+        return True
+
     @classmethod
     def _get_non_printable_regex(cls, data: Text) -> Optional[Tuple[int, Text]]:
         match = cls.NON_PRINTABLE.search(data)
@@ -213,11 +352,12 @@ class Reader:
         except UnicodeEncodeError:
             return cls._get_non_printable_regex(data)
 
-    def check_printable(self, data: Any) -> None:
+    def check_printable(self, data: Any, offset: int = 0) -> None:
+        """offset: the position of data after the end of .buffer"""
         non_printable_match = self._get_non_printable(data)
         if non_printable_match is not None:
             start, character = non_printable_match
-            position = self.index + (len(self.buffer) - self.pointer) + start
+            position = self._offset + len(self.buffer) + offset + start
             raise ReaderError(
                 self.name,
                 position,
@@ -229,37 +369,62 @@ class Reader:
     def update(self, length: int) -> None:
         if self.raw_buffer is None:
             return
-        self.buffer = self.buffer[self.pointer :]
-        self.pointer = 0
-        while len(self.buffer) < length:
+        if self.pointer:
+            self.buffer = self.buffer[self.pointer :]
+            self._offset += self.pointer
+            self._indexed -= self.pointer
+            self.pointer = 0
+        # the decoded chunks are joined once, consumed text is never copied again
+        chunks = [self.buffer]
+        size = len(self.buffer)
+        while size < length:
             if not self.eof:
-                self.update_raw()
-            if self.raw_decode is not None:
-                try:
-                    data, converted = self.raw_decode(self.raw_buffer, 'strict', self.eof)
-                except UnicodeDecodeError as exc:
-                    character = self.raw_buffer[exc.start]
-                    if self.stream is not None:
-                        position = self.stream_pointer - len(self.raw_buffer) + exc.start
-                    elif self.stream is not None:
-                        position = self.stream_pointer - len(self.raw_buffer) + exc.start
-                    else:
-                        position = exc.start
-                    raise ReaderError(self.name, position, character, exc.encoding, exc.reason)
-            else:
-                data = self.raw_buffer
-                converted = len(data)
-            self.check_printable(data)
-            self.buffer += data
-            self.raw_buffer = self.raw_buffer[converted:]
+                self.update_raw(max(self._read_size or self.read_size, size))
+            data = self.decode_raw(size - len(self.buffer))
+            chunks.append(data)
+            size += len(data)
             if self.eof:
-                self.buffer += '\0'
+                chunks.append('\0')
                 self.raw_buffer = None
                 break
+        if len(chunks) > 1:
+            self.buffer = "".join(chunks)
+        self._index_lines()
+
+    def decode_raw(self, offset: int = 0) -> Text:
+        """
+        decode .raw_buffer, bytes that are part of an incomplete character are kept.
+        The characters are checked to be allowed, for UTF-8 on the raw bytes.
+        offset: the position of the decoded text after the end of .buffer
+        """
+        raw = self.raw_buffer
+        self.raw_buffer = raw[:0]
+        if self._decoder is None:
+            data = raw
+        else:
+            pending = self._decoder.getstate()[0]
+            try:
+                data = self._decoder.decode(raw, self.eof)
+            except UnicodeDecodeError as exc:
+                raw = pending + raw
+                position = exc.start
+                if self._stream is not None:
+                    position += self.stream_pointer - len(raw)
+                raise ReaderError(
+                    self.name, position, raw[exc.start], exc.encoding, exc.reason,
+                )
+            if self._check and self.encoding == 'utf-8':
+                # including the bytes of a character split over two reads
+                if self.is_printable_utf8(pending + raw):
+                    return data  # type: ignore
+        if self._check:
+            # determines the position of the offending character
+            self.check_printable(data, offset)
+        return data  # type: ignore
 
     def update_raw(self, size: Optional[int] = None) -> None:
         if size is None:
-            size = 4096
+            size = self._read_size or self.read_size
         data = self.stream.read(size)
         if self.raw_buffer is None:
             self.raw_buffer = data
@@ -37,7 +37,7 @@ import copyreg
 import base64
 
 if False:  # MYPY
-    from typing import Dict, List, Any, Union, Text, Optional  # NOQA
+    from typing import Dict, List, Any, Union, Text, Optional, Set  # NOQA
 
 # fmt: off
 __all__ = ['BaseRepresenter', 'SafeRepresenter', 'Representer',
@@ -49,10 +49,34 @@ class RepresenterError(YAMLError):
     pass
 
 
+# for each representer class, whether the methods that make nodes are those of this module
+_own_node_methods: Dict[Any, bool] = {}
+
+
+def own_node_methods(cls: Any) -> bool:
+    """
+    whether all represent_* methods of cls are defined in this module, otherwise nodes
+    can be made, and used more than once, in a way unknown to represent_data
+    """
+    try:
+        return _own_node_methods[cls]
+    except KeyError:
+        pass
+    res = _own_node_methods[cls] = all(
+        getattr(getattr(cls, name), '__module__', __name__) == __name__
+        for name in dir(cls)
+        if name.startswith('represent')
+    )
+    return res
+
+
 class BaseRepresenter:
 
     yaml_representers: Dict[Any, Any] = {}
     yaml_multi_representers: Dict[Any, Any] = {}
+    # the number of levels of lists and dicts that are represented recursively, deeper
+    # nested ones are represented first
+    recursive_levels = 50
 
     def __init__(
         self: Any,
@@ -69,6 +93,18 @@ class BaseRepresenter:
         self.object_keeper: List[Any] = []
         self.alias_key: Optional[int] = None
         self.sort_base_mapping_type_on_output = True
+        # when True every reference to an object gets its own node, and the represented
+        # objects are not kept in represented_objects and object_keeper
+        self.no_aliases = False
+        # whether a node was returned for more than one reference, has an anchor that is
+        # always dumped, or was made by a representer from outside this module (for which
+        # sharing is not known, also with no_aliases), so the serializer has to find the
+        # nodes to anchor
+        self.need_anchors = False
+        # the keys in represented_objects of the nodes made by represent_nested, that
+        # were not yet returned by represent_data
+        self.nested_keys: Set[int] = set()
+        self.document_data: Any = None
 
     @property
     def serializer(self) -> Any:
@@ -80,14 +116,93 @@ class BaseRepresenter:
             return self  # cyaml
 
     def represent(self, data: Any) -> None:
+        self.document_data = data
+        self.represent_nested(data)
         node = self.represent_data(data)
-        self.serializer.serialize(node)
+        serializer = self.serializer
+        if not self.need_anchors and own_node_methods(type(self)):
+            serializer.find_anchors = False
+        serializer.serialize(node)
         self.represented_objects = {}
         self.object_keeper = []
         self.alias_key = None
+        self.need_anchors = False
+        self.nested_keys = set()
+        self.document_data = None
+
+    def represent_nested(self, data: Any) -> None:
+        """
+        represent, deepest first, the lists and dicts in data that have recursive_levels
+        levels of lists and dicts below them, so that representing data does not recurse
+        deeper than that, as the nodes of those are taken from represented_objects. The
+        values are found using a stack instead of recursion. If a value refers to one of
+        the values it is in, nothing is represented, as the representation of recursive
+        data depends on which value is represented first, or if no_aliases is set an
+        error is raised as such data cannot be represented
+        """
+        levels = self.recursive_levels
+        if not isinstance(data, (list, dict)):
+            return
+        # for each visited value (by id) the number of levels of unrepresented values
+        heights: Dict[int, int] = {}
+        nested: List[Any] = []
+        path = {id(data)}
+        # [value, iterator over the values in it, levels below value so far]
+        stack = [[data, self.nested_values(data), 0]]
+        while stack:
+            frame = stack[-1]
+            for value in frame[1]:
+                if not isinstance(value, (list, dict)):
+                    continue
+                key = id(value)
+                if key in path:
+                    if self.no_aliases:
+                        raise RepresenterError(
+                            f'recursive data cannot be represented with no_aliases: {data!r}',
+                        )
+                    return
+                if key in heights:
+                    if frame[2] < heights[key]:
+                        frame[2] = heights[key]
+                else:
+                    path.add(key)
+                    stack.append([value, self.nested_values(value), 0])
+                    break
+            else:
+                stack.pop()
+                value = frame[0]
+                path.discard(id(value))
+                height = frame[2] + 1
+                if (
+                    height >= levels
+                    and value is not data
+                    and (self.no_aliases or not self.ignore_aliases(value))
+                ):
+                    nested.append(value)
+                    height = 0
+                heights[id(value)] = height
+                if stack and stack[-1][2] < height:
+                    stack[-1][2] = height
+        for value in nested:
+            node = self.represent_data(value)
+            if self.no_aliases:
+                self.represented_objects[id(value)] = node
+            elif id(value) not in self.represented_objects:
+                continue
+            self.nested_keys.add(id(value))
+
+    @staticmethod
+    def nested_values(data: Any) -> Any:
+        if isinstance(data, dict):
+            return iter(data.values())
+        return iter(data)
 
     def represent_data(self, data: Any) -> Any:
-        if self.ignore_aliases(data):
+        if self.no_aliases:
+            self.alias_key = None
+            if self.nested_keys and id(data) in self.nested_keys:
+                return self.represented_objects[id(data)]
+        elif self.ignore_aliases(data):
             self.alias_key = None
         else:
             self.alias_key = id(data)
@@ -97,26 +212,40 @@ class BaseRepresenter:
                 # if node is None:
                 #     raise RepresenterError(
                 #          f"recursive objects are not allowed: {data!r}")
+                if self.alias_key in self.nested_keys:
+                    self.nested_keys.discard(self.alias_key)
+                else:
+                    self.need_anchors = True
                 return node
             # self.represented_objects[alias_key] = None
             self.object_keeper.append(data)
         data_types = type(data).__mro__
+        representer: Any = None
         if data_types[0] in self.yaml_representers:
-            node = self.yaml_representers[data_types[0]](self, data)
+            representer = self.yaml_representers[data_types[0]]
         else:
             for data_type in data_types:
                 if data_type in self.yaml_multi_representers:
-                    node = self.yaml_multi_representers[data_type](self, data)
+                    representer = self.yaml_multi_representers[data_type]
                     break
             else:
                 if None in self.yaml_multi_representers:
-                    node = self.yaml_multi_representers[None](self, data)
+                    representer = self.yaml_multi_representers[None]
                 elif None in self.yaml_representers:
-                    node = self.yaml_representers[None](self, data)
-                else:
-                    node = ScalarNode(None, str(data))
+                    representer = self.yaml_representers[None]
+        if representer is None:
+            node = ScalarNode(None, str(data))
+        else:
+            if getattr(representer, '__module__', None) != __name__:
+                # a representer from elsewhere can use a node it makes more than once,
+                # or make a node that refers to itself, without going through here
+                self.need_anchors = True
+            node = representer(self, data)
         # if alias_key is not None:
         #     self.represented_objects[alias_key] = node
+        if node.anchor is not None and not self.no_aliases:
+            if getattr(node.anchor, 'always_dump', False):
+                self.need_anchors = True
         return node
 
     def represent_key(self, data: Any) -> Any:
@@ -151,7 +280,7 @@ class BaseRepresenter:
             if comment:
                 comment = [None, [comment]]
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = ScalarNode(tag, value, style=style, comment=comment, anchor=anchor)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -162,7 +291,7 @@ class BaseRepresenter:
     ) -> SequenceNode:
         value: List[Any] = []
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = SequenceNode(tag, value, flow_style=flow_style)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -182,7 +311,7 @@ class BaseRepresenter:
     def represent_omap(self, tag: Any, omap: Any, flow_style: Any = None) -> SequenceNode:
         value: List[Any] = []
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = SequenceNode(tag, value, flow_style=flow_style)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -204,7 +333,7 @@ class BaseRepresenter:
     def represent_mapping(self, tag: Any, mapping: Any, flow_style: Any = None) -> MappingNode:
         value: List[Any] = []
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = MappingNode(tag, value, flow_style=flow_style)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -247,7 +376,9 @@ class SafeRepresenter(BaseRepresenter):
         return False
 
     def represent_none(self, data: Any) -> ScalarNode:
-        return self.represent_scalar('tag:yaml.org,2002:null', 'null')
+        node = self.represent_scalar('tag:yaml.org,2002:null', 'null')
+        node.resolved = node.ctag
+        return node
 
     def represent_str(self, data: Any) -> Any:
         return self.represent_scalar('tag:yaml.org,2002:str', data)
@@ -268,10 +399,16 @@ class SafeRepresenter(BaseRepresenter):
                 value = 'true'
             else:
                 value = 'false'
-        return self.represent_scalar('tag:yaml.org,2002:bool', value, anchor=anchor)
+        node = self.represent_scalar('tag:yaml.org,2002:bool', value, anchor=anchor)
+        if value in ('true', 'false'):
+            node.resolved = node.ctag
+        return node
 
     def represent_int(self, data: Any) -> ScalarNode:
-        return self.represent_scalar('tag:yaml.org,2002:int', str(data))
+        node = self.represent_scalar('tag:yaml.org,2002:int', str(data))
+        if type(data) is int:
+            node.resolved = node.ctag
+        return node
 
     inf_value = 1e300
     while repr(inf_value) != repr(inf_value * inf_value):
@@ -514,10 +651,18 @@ class RoundTripRepresenter(SafeRepresenter):
         return SafeRepresenter.ignore_aliases(self, data)
 
     def represent_none(self, data: Any) -> ScalarNode:
-        if len(self.represented_objects) == 0 and not self.serializer.use_explicit_start:
+        if self.no_aliases:
+            # represented_objects is not filled
+            first = self.document_data is None
+        else:
+            first = len(self.represented_objects) == 0
+        if first and not self.serializer.use_explicit_start:
             # this will be open ended (although it is not yet)
-            return self.represent_scalar('tag:yaml.org,2002:null', 'null')
-        return self.represent_scalar('tag:yaml.org,2002:null', "")
+            node = self.represent_scalar('tag:yaml.org,2002:null', 'null')
+        else:
+            node = self.represent_scalar('tag:yaml.org,2002:null', "")
+        node.resolved = node.ctag
+        return node
 
     def represent_literal_scalarstring(self, data: Any) -> ScalarNode:
         tag = None
@@ -717,7 +862,7 @@ class RoundTripRepresenter(SafeRepresenter):
         except AttributeError:
             anchor = None
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = SequenceNode(tag, value, flow_style=flow_style, anchor=anchor)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -794,7 +939,7 @@ class RoundTripRepresenter(SafeRepresenter):
         except AttributeError:
             anchor = None
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = MappingNode(tag, value, flow_style=flow_style, anchor=anchor)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -877,7 +1022,7 @@ class RoundTripRepresenter(SafeRepresenter):
                 # arg.flow_style = True
                 arg = self.represent_data(merge_value.sequence)  # type: ignore
             value.insert(
-                merge_pos, (ScalarNode(Tag(suffix='tag:yaml.org,2002:merge'), '<<'), arg),
+                merge_pos, (ScalarNode(Tag.intern('tag:yaml.org,2002:merge'), '<<'), arg),
             )
         return node
 
@@ -892,7 +1037,7 @@ class RoundTripRepresenter(SafeRepresenter):
         except AttributeError:
             anchor = None
         if isinstance(tag, str):
-            tag = Tag(suffix=tag)
+            tag = Tag.intern(tag)
         node = SequenceNode(tag, value, flow_style=flow_style, anchor=anchor)
         if self.alias_key is not None:
             self.represented_objects[self.alias_key] = node
@@ -948,7 +1093,7 @@ class RoundTripRepresenter(SafeRepresenter):
 
     def represent_set(self, setting: Any) -> MappingNode:
         flow_style = False
-        tag = Tag(suffix='tag:yaml.org,2002:set')
+        tag = Tag.intern('tag:yaml.org,2002:set')
         # return self.represent_mapping(tag, value)
         value: List[Any] = []
         flow_style = setting.fa.flow_style(flow_style)
@@ -1004,30 +1149,30 @@ class RoundTripRepresenter(SafeRepresenter):
         try:
             _ = data.tag
         except AttributeError:
-            tag = Tag(suffix='tag:yaml.org,2002:map')
+            tag = Tag.intern('tag:yaml.org,2002:map')
         else:
             if data.tag.trval:
                 if data.tag.startswith('!!'):
-                    tag = Tag(suffix='tag:yaml.org,2002:' + data.tag.trval[2:])
+                    tag = Tag.intern('tag:yaml.org,2002:' + data.tag.trval[2:])
                 else:
                     tag = data.tag
             else:
-                tag = Tag(suffix='tag:yaml.org,2002:map')
+                tag = Tag.intern('tag:yaml.org,2002:map')
         return self.represent_mapping(tag, data)
 
     def represent_list(self, data: Any) -> SequenceNode:
         try:
             _ = data.tag
         except AttributeError:
-            tag = Tag(suffix='tag:yaml.org,2002:seq')
+            tag = Tag.intern('tag:yaml.org,2002:seq')
         else:
             if data.tag.trval:
                 if data.tag.startswith('!!'):
-                    tag = Tag(suffix='tag:yaml.org,2002:' + data.tag.trval[2:])
+                    tag = Tag.intern('tag:yaml.org,2002:' + data.tag.trval[2:])
                 else:
                     tag = data.tag
             else:
-                tag = Tag(suffix='tag:yaml.org,2002:seq')
+                tag = Tag.intern('tag:yaml.org,2002:seq')
         return self.represent_sequence(tag, data)
 
     def represent_datetime(self, data: Any) -> ScalarNode:
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 if False:  # MYPY
-    from typing import Any, Dict, List, Union, Text, Optional  # NOQA
+    from typing import Any, Dict, List, Union, Text, Optional, Tuple, Callable  # NOQA
     from ruamel.yaml.compat import VersionType  # NOQA
 
 from ruamel.yaml.tag import Tag
@@ -98,16 +99,100 @@ implicit_resolvers = [
 ]
 # fmt: on
 
+# the matchers for the implicit_resolvers by (resolver class, version), shared by the
+# resolver instances that have no implicit resolvers of their own added
+shared_implicit_matchers: Dict[Any, Any] = {}
+
 
 class ResolverError(YAMLError):
     pass
 
 
+_inline_flags = (
+    (re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'),
+)
+
+
+def implicit_matcher(resolvers: List[Tuple[Any, Any]]) -> Callable[[Text], Any]:
+    """
+    return a function that for a scalar value returns the Tag of the first of the
+    (tag, regexp) resolvers that matches, or None if none matches.
+    If possible the regexps are combined into one, with a named group per resolver,
+    so the value is matched only once.
+    """
+    resolver_tags = [Tag.intern(tag) for tag, regexp in resolvers]
+    try:
+        alternatives = []
+        for idx, (_tag, regexp) in enumerate(resolvers):
+            flags = regexp.flags & ~re.UNICODE
+            # numbered backreferences would no longer be correct in a combined regexp
+            if regexp.groups or regexp.groupindex or not isinstance(regexp.pattern, str):
+                raise ValueError
+            inline = ''
+            for flag, letter in _inline_flags:
+                if flags & flag:
+                    inline += letter
+                    flags &= ~flag
+            if flags:
+                raise ValueError
+            pattern = regexp.pattern
+            if 'x' in inline:
+                # the newline ends a comment on the last line of a verbose pattern
+                pattern += '\n'
+            if inline:
+                pattern = f'(?{inline}:{pattern})'
+            alternatives.append(f'(?P<r{idx}>{pattern})')
+        combined = re.compile('|'.join(alternatives))
+    except (AttributeError, ValueError, re.error):
+        matches = [(tag, regexp.match) for tag, (_, regexp) in zip(resolver_tags, resolvers)]
+
+        def match_each(value: Text) -> Any:
+            for tag, match in matches:
+                if match(value):
+                    return tag
+            return None
+
+        return match_each
+
+    group_tag = {f'r{idx}': tag for idx, tag in enumerate(resolver_tags)}
+    match = combined.match
+
+    def match_combined(value: Text) -> Any:
+        m = match(value)
+        if m is None:
+            return None
+        # every alternative is a named group without groups of its own
+        return group_tag[m.lastgroup]  # type: ignore
+
+    return match_combined
+
+
+def match_implicit(matchers: Any, value: Text) -> Any:
+    """
+    the tag for value from matchers, as returned by VersionedResolver.implicit_matchers()
+    """
+    by_first, default = matchers
+    matcher = by_first.get(value[0] if value else "", default)
+    if matcher is None:
+        return None
+    return matcher(value)
+
+
+@lru_cache(maxsize=4096)
+def resolve_shared_implicit(key: Any, value: Text) -> Any:
+    """
+    the tag for value from the shared_implicit_matchers for key, (resolver class,
+    version), the results are shared by all resolvers without implicit resolvers of
+    their own
+    """
+    return match_implicit(shared_implicit_matchers[key], value)
+
+
 class BaseResolver:
 
-    DEFAULT_SCALAR_TAG = Tag(suffix='tag:yaml.org,2002:str')
-    DEFAULT_SEQUENCE_TAG = Tag(suffix='tag:yaml.org,2002:seq')
-    DEFAULT_MAPPING_TAG = Tag(suffix='tag:yaml.org,2002:map')
+    DEFAULT_SCALAR_TAG = Tag.intern('tag:yaml.org,2002:str')
+    DEFAULT_SEQUENCE_TAG = Tag.intern('tag:yaml.org,2002:seq')
+    DEFAULT_MAPPING_TAG = Tag.intern('tag:yaml.org,2002:map')
 
     yaml_implicit_resolvers: Dict[Any, Any] = {}
     yaml_path_resolvers: Dict[Any, Any] = {}
@@ -139,6 +224,7 @@ class BaseResolver:
             first = [None]
         for ch in first:
             cls.yaml_implicit_resolvers.setdefault(ch, []).append((tag, regexp))
+        resolve_shared_implicit.cache_clear()
 
     @classmethod
     def add_implicit_resolver(cls, tag: Any, regexp: Any, first: Any) -> None:
@@ -152,6 +238,9 @@ class BaseResolver:
         for ch in first:
             cls.yaml_implicit_resolvers.setdefault(ch, []).append((tag, regexp))
         implicit_resolvers.append(([(1, 2), (1, 1)], tag, regexp, first))
+        shared_implicit_matchers.clear()
+        # the cached results are for the matchers without the added resolver
+        resolve_shared_implicit.cache_clear()
 
     # @classmethod
     # def add_implicit_resolver(cls, tag, regexp, first):
@@ -268,17 +357,17 @@ class BaseResolver:
                 resolvers = self.yaml_implicit_resolvers.get("", [])
             else:
                 resolvers = self.yaml_implicit_resolvers.get(value[0], [])
-            resolvers += self.yaml_implicit_resolvers.get(None, [])
+            resolvers = resolvers + self.yaml_implicit_resolvers.get(None, [])
             for tag, regexp in resolvers:
                 if regexp.match(value):
-                    return Tag(suffix=tag)
+                    return Tag.intern(tag)
             implicit = implicit[1]
         if bool(self.yaml_path_resolvers):
             exact_paths = self.resolver_exact_paths[-1]
             if kind in exact_paths:
-                return Tag(suffix=exact_paths[kind])
+                return Tag.intern(exact_paths[kind])
             if None in exact_paths:
-                return Tag(suffix=exact_paths[None])
+                return Tag.intern(exact_paths[None])
         if kind is ScalarNode:
             return self.DEFAULT_SCALAR_TAG
         elif kind is SequenceNode:
@@ -316,15 +405,27 @@ class VersionedResolver(BaseResolver):
         BaseResolver.__init__(self, loader)
         self._loader_version = self.get_loader_version(version)
         self._version_implicit_resolver: Dict[Any, Any] = {}
+        self._version_implicit_matchers: Dict[Any, Any] = {}
+
+    # resolvers that have no implicit resolvers of their own share the results of
+    # resolve_implicit in the cache of resolve_shared_implicit, which holds 4096
+    # (version, value) combinations. This only switches that cache on (non-zero) or
+    # off (0), its size is the same for all resolvers
+    resolve_cache_size = 4096
 
     def add_version_implicit_resolver(
         self, version: VersionType, tag: Any, regexp: Any, first: Any,
     ) -> None:
         if first is None:
             first = [None]
+        if version not in self._version_implicit_resolver:
+            if self._version_implicit_matchers.pop(version, None) is not None:
+                # the shared matchers were in use, start from the default resolvers
+                self.versioned_resolver_for(version)
         impl_resolver = self._version_implicit_resolver.setdefault(version, {})
         for ch in first:
             impl_resolver.setdefault(ch, []).append((tag, regexp))
+        self._version_implicit_matchers.pop(version, None)
 
     def get_loader_version(self, version: Optional[VersionType]) -> Any:
         if version is None or isinstance(version, tuple):
@@ -340,7 +441,9 @@ class VersionedResolver(BaseResolver):
         """
         select the resolver based on the version we are parsing
         """
-        version = self.processing_version
+        return self.versioned_resolver_for(self.processing_version)
+
+    def versioned_resolver_for(self, version: Any) -> Any:
         if isinstance(version, str):
             version = tuple(map(int, version.split('.')))
         if version not in self._version_implicit_resolver:
@@ -349,23 +452,63 @@ class VersionedResolver(BaseResolver):
                     self.add_version_implicit_resolver(version, x[1], x[2], x[3])
         return self._version_implicit_resolver[version]
 
+    def implicit_matchers(self, version: Any) -> Any:
+        """
+        the matchers, by first character of the value, for the implicit resolvers of
+        version, and the matcher for values with a first character not in that dict
+        """
+        try:
+            return self._version_implicit_matchers[version]
+        except KeyError:
+            pass
+        if version not in self._version_implicit_resolver:
+            key = (self.__class__, version)
+            if key not in shared_implicit_matchers:
+                self.versioned_resolver_for(version)
+                shared_implicit_matchers[key] = self.implicit_matchers(version)
+            res = self._version_implicit_matchers[version] = shared_implicit_matchers[key]
+            return res
+        resolvers = self.versioned_resolver_for(version)
+        any_first = resolvers.get(None, [])
+        matchers = {
+            ch: implicit_matcher(ch_resolvers + any_first)
+            for ch, ch_resolvers in resolvers.items()
+            if ch is not None
+        }
+        res = self._version_implicit_matchers[version] = (
+            matchers,
+            implicit_matcher(any_first) if any_first else None,
+        )
+        return res
+
+    def resolve_implicit(self, version: Any, value: Text) -> Any:
+        """
+        the tag for the plain scalar value based on the implicit resolvers for
+        version, None if none matches. The results are cached for the resolvers
+        that share their implicit resolvers, and the returned Tags are shared, so
+        they should not be altered.
+        """
+        if version is not None and not isinstance(version, tuple):
+            version = self.get_loader_version(version)
+        matchers = self.implicit_matchers(version)
+        if self.resolve_cache_size:
+            key = (self.__class__, version)
+            if shared_implicit_matchers.get(key) is matchers:
+                return resolve_shared_implicit(key, value)
+        return match_implicit(matchers, value)
+
     def resolve(self, kind: Any, value: Any, implicit: Any) -> Any:
         if kind is ScalarNode and implicit[0]:
-            if value == "":
-                resolvers = self.versioned_resolver.get("", [])
-            else:
-                resolvers = self.versioned_resolver.get(value[0], [])
-            resolvers += self.versioned_resolver.get(None, [])
-            for tag, regexp in resolvers:
-                if regexp.match(value):
-                    return Tag(suffix=tag)
+            tag = self.resolve_implicit(self.processing_version, value)
+            if tag is not None:
+                return tag
             implicit = implicit[1]
         if bool(self.yaml_path_resolvers):
             exact_paths = self.resolver_exact_paths[-1]
             if kind in exact_paths:
-                return Tag(suffix=exact_paths[kind])
+                return Tag.intern(exact_paths[kind])
             if None in exact_paths:
-                return Tag(suffix=exact_paths[None])
+                return Tag.intern(exact_paths[None])
         if kind is ScalarNode:
             return self.DEFAULT_SCALAR_TAG
         elif kind is SequenceNode:
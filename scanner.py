@@ -29,13 +29,16 @@ from __future__ import annotations
 # Read comments in the Scanner code for more details.
 #
 
+import re
+from collections import deque
+
 from ruamel.yaml.error import MarkedYAMLError
 import ruamel.yaml.tokens as tokens
 from ruamel.yaml.docinfo import Version  # NOQA
 from ruamel.yaml.compat import check_anchorname_char, _debug, nprint, nprintf  # NOQA
 
 if False:  # MYPY
-    from typing import Any, Dict, Optional, List, Union, Text, Tuple  # NOQA
+    from typing import Any, Dict, Optional, List, Union, Text, Tuple, Deque  # NOQA
 
 __all__ = ['Scanner', 'RoundTripScanner', 'ScannerError']
 
@@ -44,6 +47,15 @@ _THE_END = '\n\0\r\x85\u2028\u2029'
 _THE_END_SPACE_TAB = ' \n\0\t\r\x85\u2028\u2029'
 _SPACE_TAB = ' \t'
 
+# Runs of characters that can be part of a plain scalar without further checks,
+# matched directly on the reader buffer to skip most of the per character
+# loop in scan_plain. A ':' is only included when followed by a non-space, in
+# the flow context '?' is left to that loop, as it depends on the YAML version.
+# These are compiled on import (and not using RegExp) as they are used for
+# every plain scalar.
+_PLAIN_BLOCK = re.compile('(?:[^ \n\0\t\r\x85\u2028\u2029:]+|:(?=[^ \n\0\t\r\x85\u2028\u2029]))*')  # NOQA
+_PLAIN_FLOW = re.compile('(?:[^ \n\0\t\r\x85\u2028\u2029:,?\\[\\]{}]+|:(?=[^ \n\0\t\r\x85\u2028\u2029]))*')  # NOQA
+
 
 if _debug != 0:
     def xprintf(*args: Any, **kw: Any) -> Any:
@@ -85,6 +97,77 @@ class Scanner:
             self.loader._scanner = self
         self.reset_scanner()
         self.first_time = False
+        self.fetch_dispatch, self.fetch_dispatch_default = self.get_fetch_dispatch()
+
+    # First character dispatch for fetch_more_tokens(): for each character that
+    # can start a token other than a plain scalar, the (check, fetch) method names
+    # to try in order, where a check of None always succeeds. A plain scalar is
+    # tried after these, checking with check_plain() only for those characters
+    # that are not always the start of a plain scalar.
+    fetch_dispatch_table: Dict[Text, Tuple[Tuple[Optional[Text], Text], ...]] = {
+        '\0': ((None, 'fetch_stream_end'),),
+        '%': (('check_directive', 'fetch_directive'),),
+        '-': (
+            ('check_document_start', 'fetch_document_start'),
+            ('check_block_entry', 'fetch_block_entry'),
+        ),
+        '.': (('check_document_end', 'fetch_document_end'),),
+        '[': ((None, 'fetch_flow_sequence_start'),),
+        '{': ((None, 'fetch_flow_mapping_start'),),
+        ']': ((None, 'fetch_flow_sequence_end'),),
+        '}': ((None, 'fetch_flow_mapping_end'),),
+        ',': ((None, 'fetch_flow_entry'),),
+        '?': (('check_key', 'fetch_key'),),
+        ':': (('check_value', 'fetch_value'),),
+        '*': ((None, 'fetch_alias'),),
+        '&': ((None, 'fetch_anchor'),),
+        '!': ((None, 'fetch_tag'),),
+        '|': (('check_block_scalar', 'fetch_literal'),),
+        '>': (('check_block_scalar', 'fetch_folded'),),
+        "'": ((None, 'fetch_single'),),
+        '"': ((None, 'fetch_double'),),
+    }
+    plain_indicators = '\0 \t\r\n\x85\u2028\u2029-?:,[]{}#&*!|>\'"%@`'
+
+    @classmethod
+    def get_fetch_dispatch(cls) -> Any:
+        """
+        return the dispatch dict, and default for characters not in it, with the
+        functions as found on this class (i.e. including any overrides in a subclass),
+        cached per class and built again if any of these functions changed on the class
+        since. The dispatch is taken when a scanner is created, setting a fetch_*/check_*
+        method on an existing scanner instance, or on its class after that, has no effect
+        on that scanner
+        """
+        names = {'check_plain', 'fetch_plain'}
+        for ch_entries in cls.fetch_dispatch_table.values():
+            for check, fetch in ch_entries:
+                names.add(fetch)
+                if check is not None:
+                    names.add(check)
+        methods = {name: getattr(cls, name) for name in names}
+        cached = cls.__dict__.get('_fetch_dispatch')
+        if cached is not None and cached[0] == methods:
+            return cached[1]
+        plain_check = None
+        if methods['check_plain'] is not Scanner.check_plain:
+            plain_check = methods['check_plain']
+        plain_fetch = methods['fetch_plain']
+        dispatch = {}
+        for ch in set(cls.fetch_dispatch_table) | set(cls.plain_indicators):
+            entries = [
+                (None if check is None else methods[check], methods[fetch])
+                for check, fetch in cls.fetch_dispatch_table.get(ch, ())
+            ]
+            if ch != '\0':
+                if ch in cls.plain_indicators:
+                    entries.append((methods['check_plain'], plain_fetch))
+                else:
+                    entries.append((plain_check, plain_fetch))
+            dispatch[ch] = tuple(entries)
+        res = dispatch, ((plain_check, plain_fetch),)
+        cls._fetch_dispatch = methods, res  # type: ignore
+        return res
 
     @property
     def flow_level(self) -> int:
@@ -98,8 +181,8 @@ class Scanner:
         # for each unclosed flow context. If empty list that means block context
         self.flow_context: List[Text] = []
 
-        # List of processed tokens that are not yet emitted.
-        self.tokens: List[Any] = []
+        # Queue of processed tokens that are not yet emitted.
+        self.tokens: Deque[Any] = deque()
 
         # Add the STREAM-START token.
         self.fetch_stream_start()
@@ -189,7 +272,7 @@ class Scanner:
             self.fetch_more_tokens()
         if len(self.tokens) > 0:
             self.tokens_taken += 1
-            return self.tokens.pop(0)
+            return self.tokens.popleft()
 
     # Private methods.
 
@@ -220,94 +303,12 @@ class Scanner:
         # and decrease the current indentation level.
         self.unwind_indent(self.reader.column)
 
-        # Peek the next character.
+        # Peek the next character, and try the fetch methods for it in order
+        # (TODO: support for BOM within a stream)
         ch = self.reader.peek()
-
-        # Is it the end of stream?
-        if ch == '\0':
-            return self.fetch_stream_end()
-
-        # Is it a directive?
-        if ch == '%' and self.check_directive():
-            return self.fetch_directive()
-
-        # Is it the document start?
-        if ch == '-' and self.check_document_start():
-            return self.fetch_document_start()
-
-        # Is it the document end?
-        if ch == '.' and self.check_document_end():
-            return self.fetch_document_end()
-
-        # TODO: support for BOM within a stream.
-        # if ch == '\uFEFF':
-        #     return self.fetch_bom()    <-- issue BOMToken
-
-        # Note: the order of the following checks is NOT significant.
-
-        # Is it the flow sequence start indicator?
-        if ch == '[':
-            return self.fetch_flow_sequence_start()
-
-        # Is it the flow mapping start indicator?
-        if ch == '{':
-            return self.fetch_flow_mapping_start()
-
-        # Is it the flow sequence end indicator?
-        if ch == ']':
-            return self.fetch_flow_sequence_end()
-
-        # Is it the flow mapping end indicator?
-        if ch == '}':
-            return self.fetch_flow_mapping_end()
-
-        # Is it the flow entry indicator?
-        if ch == ',':
-            return self.fetch_flow_entry()
-
-        # Is it the block entry indicator?
-        if ch == '-' and self.check_block_entry():
-            return self.fetch_block_entry()
-
-        # Is it the key indicator?
-        if ch == '?' and self.check_key():
-            return self.fetch_key()
-
-        # Is it the value indicator?
-        if ch == ':' and self.check_value():
-            return self.fetch_value()
-
-        # Is it an alias?
-        if ch == '*':
-            return self.fetch_alias()
-
-        # Is it an anchor?
-        if ch == '&':
-            return self.fetch_anchor()
-
-        # Is it a tag?
-        if ch == '!':
-            return self.fetch_tag()
-
-        # Is it a literal scalar?
-        if ch == '|' and not self.flow_level:
-            return self.fetch_literal()
-
-        # Is it a folded scalar?
-        if ch == '>' and not self.flow_level:
-            return self.fetch_folded()
-
-        # Is it a single quoted scalar?
-        if ch == "'":
-            return self.fetch_single()
-
-        # Is it a double quoted scalar?
-        if ch == '"':
-            return self.fetch_double()
-
-        # It must be a plain scalar then.
-        if self.check_plain():
-            return self.fetch_plain()
+        for check, fetch in self.fetch_dispatch.get(ch, self.fetch_dispatch_default):
+            if check is None or check(self):
+                return fetch(self)
 
         # No? It's an error. Let's produce a nice error message.
         raise ScannerError(
@@ -766,6 +767,10 @@ class Scanner:
         # VALUE(block context): ':' (' '|'\n')
         return self.reader.peek(1) in _THE_END_SPACE_TAB
 
+    def check_block_scalar(self) -> Any:
+        # LITERAL/FOLDED(block context only): '|' or '>'
+        return not self.flow_level
+
     def check_plain(self) -> Any:
         # A plain scalar may start with any non-space character except:
         #   '-', '?', ':', ',', '[', ']', '{', '}',
@@ -1494,21 +1499,28 @@ class Scanner:
         #   plain scalars in the flow context cannot contain ',', ': '  and '?'.
         # We also keep track of the `allow_simple_key` flag here.
         # Indentation rules are loosed for the flow context.
-        srp = self.reader.peek
-        srf = self.reader.forward
+        reader = self.reader
+        srp = reader.peek
+        srf = reader.forward
         chunks: List[Any] = []
-        start_mark = self.reader.get_mark()
+        start_mark = reader.get_mark()
         end_mark = start_mark
         indent = self.indent + 1
+        plain_match = _PLAIN_FLOW.match if self.flow_level else _PLAIN_BLOCK.match
         # We allow zero indentation for scalars, but then we need to check for
         # document separators at the beginning of the line.
         # if indent == 0:
         #     indent = 1
         spaces: List[Any] = []
         while True:
-            length = 0
             if srp() == '#':
                 break
+            # the loop below continues from where the fast match on the buffer stops,
+            # and refills the buffer if the match runs up to its end, the patterns match
+            # the empty string, so there always is a match
+            match = plain_match(reader.buffer, reader.pointer)
+            assert match is not None
+            length = match.end() - reader.pointer
             while True:
                 ch = srp(length)
                 if False and ch == ':' and srp(length + 1) == ',':
@@ -1758,7 +1770,7 @@ class RoundTripScanner(Scanner):
         if not self.tokens:
             return comments
         if isinstance(self.tokens[0], tokens.CommentToken):
-            comment = self.tokens.pop(0)
+            comment = self.tokens.popleft()
             self.tokens_taken += 1
             comments.append(comment)
         while self.need_more_tokens():
@@ -1767,7 +1779,7 @@ class RoundTripScanner(Scanner):
                 return comments
             if isinstance(self.tokens[0], tokens.CommentToken):
                 self.tokens_taken += 1
-                comment = self.tokens.pop(0)
+                comment = self.tokens.popleft()
                 # nprint('dropping2', comment)
                 comments.append(comment)
         if len(comments) >= 1:
@@ -1798,11 +1810,13 @@ class RoundTripScanner(Scanner):
                 and self.tokens[0].end_mark.line == self.tokens[1].start_mark.line
             ):
                 self.tokens_taken += 1
-                c = self.tokens.pop(1)
+                c = self.tokens[1]
+                del self.tokens[1]
                 self.fetch_more_tokens()
                 while len(self.tokens) > 1 and isinstance(self.tokens[1], tokens.CommentToken):
                     self.tokens_taken += 1
-                    c1 = self.tokens.pop(1)
+                    c1 = self.tokens[1]
+                    del self.tokens[1]
                     c.value = c.value + (' ' * c1.start_mark.column) + c1.value
                     self.fetch_more_tokens()
                 self.tokens[0].add_post_comment(c)
@@ -1813,7 +1827,8 @@ class RoundTripScanner(Scanner):
                 and self.tokens[0].end_mark.line != self.tokens[1].start_mark.line
             ):
                 self.tokens_taken += 1
-                c = self.tokens.pop(1)
+                c = self.tokens[1]
+                del self.tokens[1]
                 c.value = (
                     '\n' * (c.start_mark.line - self.tokens[0].end_mark.line)
                     + (' ' * c.start_mark.column)
@@ -1823,11 +1838,12 @@ class RoundTripScanner(Scanner):
                 self.fetch_more_tokens()
                 while len(self.tokens) > 1 and isinstance(self.tokens[1], tokens.CommentToken):
                     self.tokens_taken += 1
-                    c1 = self.tokens.pop(1)
+                    c1 = self.tokens[1]
+                    del self.tokens[1]
                     c.value = c.value + (' ' * c1.start_mark.column) + c1.value
                     self.fetch_more_tokens()
             self.tokens_taken += 1
-            return self.tokens.pop(0)
+            return self.tokens.popleft()
         return None
 
     def fetch_comment(self, comment: Any) -> None:
@@ -2229,7 +2245,7 @@ class RoundTripScannerSC(Scanner):  # RoundTripScanner Split Comments
             else:
                 self.comments.assign_pre(self.tokens[0])  # type: ignore
             self.tokens_taken += 1
-            return self.tokens.pop(0)
+            return self.tokens.popleft()
 
     def need_more_tokens(self) -> bool:
         if self.comments is None:
@@ -1,6 +1,8 @@
 
 from __future__ import annotations
 
+import itertools
+
 from ruamel.yaml.error import YAMLError
 from ruamel.yaml.compat import nprint, DBG_NODE, dbg, nprintf  # NOQA
 from ruamel.yaml.util import RegExp
@@ -20,7 +22,7 @@ from ruamel.yaml.events import (
 from ruamel.yaml.nodes import MappingNode, ScalarNode, SequenceNode
 
 if False:  # MYPY
-    from typing import Any, Dict, Union, Text, Optional  # NOQA
+    from typing import Any, Dict, List, Union, Text, Optional  # NOQA
     from ruamel.yaml.compat import VersionType  # NOQA
 
 __all__ = ['Serializer', 'SerializerError']
@@ -62,6 +64,12 @@ class Serializer:
         self.last_anchor_id = 0
         self.closed: Optional[bool] = None
         self._templated_id = None
+        # for each tag hinted by ScalarNode.resolved, whether the implicit resolvers
+        # confirmed the hint for the first such node of the document
+        self.resolved_tags: Dict[Any, bool] = {}
+        # set to False by the representer for a document in which no node is used more
+        # than once and no node has an anchor to dump, so anchor_node can be skipped
+        self.find_anchors = True
 
     @property
     def emitter(self) -> Any:
@@ -107,32 +115,38 @@ class Serializer:
                 explicit=self.use_explicit_start, version=self.use_version, tags=self.use_tags,
             ),
         )
-        self.anchor_node(node)
+        if self.find_anchors:
+            self.anchor_node(node)
         self.serialize_node(node, None, None)
         self.emitter.emit(DocumentEndEvent(explicit=self.use_explicit_end))
         self.serialized_nodes = {}
         self.anchors = {}
         self.last_anchor_id = 0
+        self.resolved_tags = {}
+        self.find_anchors = True
 
     def anchor_node(self, node: Any) -> None:
-        if node in self.anchors:
-            if self.anchors[node] is None:
-                self.anchors[node] = self.generate_anchor(node)
-        else:
-            anchor = None
-            try:
-                if node.anchor.always_dump:
-                    anchor = node.anchor.value
-            except:  # NOQA
-                pass
-            self.anchors[node] = anchor
-            if isinstance(node, SequenceNode):
-                for item in node.value:
-                    self.anchor_node(item)
-            elif isinstance(node, MappingNode):
-                for key, value in node.value:
-                    self.anchor_node(key)
-                    self.anchor_node(value)
+        # the nodes are visited in the same order as when recursing, using a stack
+        todo = [node]
+        while todo:
+            node = todo.pop()
+            if node in self.anchors:
+                if self.anchors[node] is None:
+                    self.anchors[node] = self.generate_anchor(node)
+            else:
+                anchor = None
+                try:
+                    if node.anchor.always_dump:
+                        anchor = node.anchor.value
+                except:  # NOQA
+                    pass
+                self.anchors[node] = anchor
+                if isinstance(node, SequenceNode):
+                    todo.extend(reversed(node.value))
+                elif isinstance(node, MappingNode):
+                    for key, value in reversed(node.value):
+                        todo.append(value)
+                        todo.append(key)
 
     def generate_anchor(self, node: Any) -> Any:
         try:
@@ -145,88 +159,146 @@ class Serializer:
         return anchor
 
     def serialize_node(self, node: Any, parent: Any, index: Any) -> None:
-        alias = self.anchors[node]
-        if node in self.serialized_nodes:
-            node_style = getattr(node, 'style', None)
-            if node_style != '?':
-                node_style = None
-            self.emitter.emit(AliasEvent(alias, style=node_style))
-        else:
-            self.serialized_nodes[node] = True
-            self.resolver.descend_resolver(parent, index)
-            if isinstance(node, ScalarNode):
-                # here check if the node.tag equals the one that would result from parsing
-                # if not equal quoting is necessary for strings
-                detected_tag = self.resolver.resolve(ScalarNode, node.value, (True, False))
-                default_tag = self.resolver.resolve(ScalarNode, node.value, (False, True))
-                implicit = (
-                    (node.ctag == detected_tag),
-                    (node.ctag == default_tag),
-                    node.tag.startswith('tag:yaml.org,2002:'),  # type: ignore
-                )
-                self.emitter.emit(
-                    ScalarEvent(
-                        alias,
-                        node.ctag,
-                        implicit,
-                        node.value,
-                        style=node.style,
-                        comment=node.comment,
-                    ),
-                )
-            elif isinstance(node, SequenceNode):
-                implicit = node.ctag == self.resolver.resolve(SequenceNode, node.value, True)
-                comment = node.comment
-                end_comment = None
-                seq_comment = None
-                if node.flow_style is True:
-                    if comment:  # eol comment on flow style sequence
-                        seq_comment = comment[0]
-                        # comment[0] = None
-                if comment and len(comment) > 2:
-                    end_comment = comment[2]
-                else:
+        """
+        emit the events for node, as child of parent at index. The collection nodes that
+        are being serialized are kept on a stack instead of serializing their children
+        recursively, so the depth of the document is not limited by the recursion limit.
+        If a subclass overrides serialize_node the children are serialized recursively,
+        so that its serialize_node is called for every node
+        """
+        iterate = type(self).serialize_node is Serializer.serialize_node
+        resolver = self.resolver
+        emit = self.emitter.emit
+        find_anchors = self.find_anchors
+        alias = None
+        # [iterator over the (child node, index) of a collection node, its end event]
+        stack: List[Any] = []
+        while True:
+            if find_anchors and node in self.serialized_nodes:
+                node_style = getattr(node, 'style', None)
+                if node_style != '?':
+                    node_style = None
+                emit(AliasEvent(self.anchors[node], style=node_style))
+            else:
+                if find_anchors:
+                    alias = self.anchors[node]
+                    self.serialized_nodes[node] = True
+                resolver.descend_resolver(parent, index)
+                if isinstance(node, ScalarNode):
+                    # here check if the node.tag equals the one that would result from
+                    # parsing if not equal quoting is necessary for strings
+                    detected_tag = self.detect_tag(resolver, node)
+                    if resolver.yaml_path_resolvers:
+                        default_tag = resolver.resolve(ScalarNode, node.value, (False, True))
+                    else:
+                        default_tag = resolver.DEFAULT_SCALAR_TAG
+                    implicit = (
+                        (node.ctag == detected_tag),
+                        (node.ctag == default_tag),
+                        node.tag.startswith('tag:yaml.org,2002:'),  # type: ignore
+                    )
+                    emit(
+                        ScalarEvent(
+                            alias,
+                            node.ctag,
+                            implicit,
+                            node.value,
+                            style=node.style,
+                            comment=node.comment,
+                        ),
+                    )
+                    resolver.ascend_resolver()
+                elif isinstance(node, SequenceNode):
+                    implicit = node.ctag == resolver.resolve(SequenceNode, node.value, True)
+                    comment = node.comment
                     end_comment = None
-                self.emitter.emit(
-                    SequenceStartEvent(
-                        alias,
-                        node.ctag,
-                        implicit,
-                        flow_style=node.flow_style,
-                        comment=node.comment,
-                    ),
-                )
-                index = 0
-                for item in node.value:
-                    self.serialize_node(item, node, index)
-                    index += 1
-                self.emitter.emit(SequenceEndEvent(comment=[seq_comment, end_comment]))
-            elif isinstance(node, MappingNode):
-                implicit = node.ctag == self.resolver.resolve(MappingNode, node.value, True)
-                comment = node.comment
-                end_comment = None
-                map_comment = None
-                if node.flow_style is True:
-                    if comment:  # eol comment on flow style sequence
-                        map_comment = comment[0]
-                        # comment[0] = None
-                if comment and len(comment) > 2:
-                    end_comment = comment[2]
-                self.emitter.emit(
-                    MappingStartEvent(
-                        alias,
-                        node.ctag,
-                        implicit,
-                        flow_style=node.flow_style,
-                        comment=node.comment,
-                        nr_items=len(node.value),
-                    ),
-                )
-                for key, value in node.value:
-                    self.serialize_node(key, node, None)
-                    self.serialize_node(value, node, key)
-                self.emitter.emit(MappingEndEvent(comment=[map_comment, end_comment]))
-            self.resolver.ascend_resolver()
+                    seq_comment = None
+                    if node.flow_style is True:
+                        if comment:  # eol comment on flow style sequence
+                            seq_comment = comment[0]
+                            # comment[0] = None
+                    if comment and len(comment) > 2:
+                        end_comment = comment[2]
+                    else:
+                        end_comment = None
+                    emit(
+                        SequenceStartEvent(
+                            alias,
+                            node.ctag,
+                            implicit,
+                            flow_style=node.flow_style,
+                            comment=node.comment,
+                        ),
+                    )
+                    stack.append(
+                        (
+                            zip(node.value, itertools.count(), itertools.repeat(node)),
+                            SequenceEndEvent(comment=[seq_comment, end_comment]),
+                        ),
+                    )
+                elif isinstance(node, MappingNode):
+                    implicit = node.ctag == resolver.resolve(MappingNode, node.value, True)
+                    comment = node.comment
+                    end_comment = None
+                    map_comment = None
+                    if node.flow_style is True:
+                        if comment:  # eol comment on flow style sequence
+                            map_comment = comment[0]
+                            # comment[0] = None
+                    if comment and len(comment) > 2:
+                        end_comment = comment[2]
+                    emit(
+                        MappingStartEvent(
+                            alias,
+                            node.ctag,
+                            implicit,
+                            flow_style=node.flow_style,
+                            comment=node.comment,
+                            nr_items=len(node.value),
+                        ),
+                    )
+                    stack.append(
+                        (
+                            self.mapping_children(node),
+                            MappingEndEvent(comment=[map_comment, end_comment]),
+                        ),
+                    )
+            while stack:
+                child = next(stack[-1][0], None)
+                if child is not None:
+                    if iterate:
+                        node, index, parent = child
+                        break
+                    self.serialize_node(child[0], child[2], child[1])
+                    continue
+                emit(stack.pop()[1])
+                resolver.ascend_resolver()
+            else:
+                return
+
+    @staticmethod
+    def mapping_children(node: Any) -> Any:
+        for key, value in node.value:
+            yield key, None, node
+            yield value, key, node
+
+    def detect_tag(self, resolver: Any, node: Any) -> Any:
+        """
+        the tag the value of the scalar node resolves to as a plain scalar. A tag hinted
+        by the representer in node.resolved is checked against the resolver once per
+        document, and then used without matching the value
+        """
+        resolved = getattr(node, 'resolved', None)
+        if resolved is None:
+            return resolver.resolve(ScalarNode, node.value, (True, False))
+        try:
+            if self.resolved_tags[resolved]:
+                return resolved
+        except KeyError:
+            pass
+        detected_tag = resolver.resolve(ScalarNode, node.value, (True, False))
+        self.resolved_tags.setdefault(resolved, detected_tag == resolved)
+        return detected_tag
 
 
 def templated_id(s: Text) -> Any:
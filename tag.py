@@ -20,28 +20,79 @@ tag_attrib = '_yaml_tag'
 class Tag:
     """store original tag information for roundtripping"""
 
+    __slots__ = (
+        'handle', 'suffix', 'handles', '_transform_type', '_trval', '_uri_decoded_suffix',
+        '_hash_id',
+    )
+
+    _trval: Optional[str]
+    _uri_decoded_suffix: Optional[str]
+    _hash_id: int
+
     attrib = tag_attrib
 
+    # shared instances, by tag string (for tags without handle) or by handle, suffix,
+    # prefix of the handle and transform type, see Tag.intern()
+    _registry: Dict[Any, Tag] = {}
+    registry_size = 10000
+
     def __init__(self, handle: Any = None, suffix: Any = None, handles: Any = None) -> None:
         self.handle = handle
         self.suffix = suffix
         self.handles = handles
         self._transform_type: Optional[bool] = None
+        if handle is None:
+            # no handle, so no transform to select
+            self._trval: Optional[str] = self.uri_decoded_suffix
+
+    @classmethod
+    def intern(cls, tag: Union[str, Tag]) -> Tag:
+        """
+        return the shared Tag instance for tag, which is either a tag string or a Tag
+        (for which the transform has been selected if it has a handle). The instance
+        is registered on first use (as long as the registry is not full).
+        Shared instances should not be altered.
+        """
+        if isinstance(tag, str):
+            key: Any = tag
+        elif tag.handle is None:
+            key = tag.suffix
+        else:
+            prefix = None if tag.handles is None else tag.handles.get(tag.handle)
+            key = (tag.handle, tag.suffix, prefix, tag._transform_type)
+        registry = cls._registry
+        try:
+            return registry[key]
+        except KeyError:
+            pass
+        if isinstance(tag, str):
+            tag = cls(suffix=tag)
+        else:
+            tag.trval  # NOQA, fix the value before the handles can change
+        if len(registry) < cls.registry_size:
+            registry[key] = tag
+        return tag
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.trval!r})'
 
     def __str__(self) -> str:
-        return f'{self.trval}'
+        try:
+            trval = self._trval
+        except AttributeError:
+            trval = self.trval
+        return 'None' if trval is None else trval
 
     def __hash__(self) -> int:
         try:
-            return self._hash_id  # type: ignore
+            return self._hash_id
         except AttributeError:
             self._hash_id = res = hash((self.handle, self.suffix))
             return res
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
         # other should not be a string, but the serializer sometimes provides these
         if isinstance(other, str):
             return self.trval == other
@@ -59,7 +110,7 @@ class Tag:
         except AttributeError:
             pass
         if self.handle is None:
-            self._trval: Optional[str] = self.uri_decoded_suffix
+            self._trval = self.uri_decoded_suffix
             return self._trval
         assert self._transform_type is not None
         if not self._transform_type:
@@ -96,8 +147,11 @@ class Tag:
         except AttributeError:
             pass
         if self.suffix is None:
-            self._uri_decoded_suffix: Optional[str] = None
+            self._uri_decoded_suffix = None
             return None
+        if '%' not in self.suffix:
+            self._uri_decoded_suffix = self.suffix
+            return self.suffix
         res = ''
         # don't have to check for scanner errors here
         idx = 0
@@ -124,3 +178,11 @@ class Tag:
         if self.handle is None:
             return False
         return self.handle not in self.handles
+
+
+for _suffix in (
+    'null', 'bool', 'int', 'float', 'binary', 'timestamp', 'omap', 'pairs', 'set', 'str',
+    'seq', 'map', 'merge', 'value', 'yaml',
+):
+    Tag.intern('tag:yaml.org,2002:' + _suffix)
+del _suffix
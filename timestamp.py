@@ -20,6 +20,11 @@ class TimeStamp(datetime.datetime):
     def __new__(cls, *args: Any, **kw: Any) -> Any:  # datetime is immutable
         return datetime.datetime.__new__(cls, *args, **kw)
 
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # datetime does not include the instance dict, needed for pickling ._yaml
+        reduced: Any = datetime.datetime.__reduce__(self)
+        return reduced + (self.__dict__,)
+
     def __deepcopy__(self, memo: Any) -> Any:
         ts = TimeStamp(self.year, self.month, self.day, self.hour, self.minute, self.second)
         ts._yaml = copy.deepcopy(self._yaml)